@@ -0,0 +1,106 @@
+"""
+Memory use of BufferManager over a long capture session.
+
+Feeds a simulated session (one base64 frame every ``--interval`` seconds of
+session time, flushed every ``--window`` minutes) through BufferManager
+with and without byte budgets. The flush callback reads the key frames the
+Screen observer would send, like the real batch path. No real time passes:
+the session is replayed as fast as the buffer takes it. For every simulated
+hour it reports traced Python memory (current and peak), bytes held in
+memory by the buffers and the spill file's size on disk.
+
+Usage:
+    python benchmarks/buffer_memory.py --hours 8 --frame-kb 300
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gum.buffer_manager import BufferManager  # noqa: E402
+from gum.key_frames import KeyFrameConfig  # noqa: E402
+
+
+def _frame(i: int, nbytes: int) -> str:
+    # distinct strings, so nothing is shared between frames
+    return (f"{i:012d}" * (nbytes // 12 + 1))[:nbytes]
+
+
+async def _scenario(budget_mb, args) -> list:
+    workdir = tempfile.mkdtemp(prefix="gum-bench-")
+    budget = None if budget_mb is None else int(budget_mb * 1024 * 1024)
+    manager = BufferManager(
+        buffer_minutes=24 * 60,  # flushed explicitly every --window minutes of session time
+        max_buffer_size=10 ** 9,
+        flush_on_activity=False,
+        max_buffer_bytes=budget,
+        max_total_bytes=budget,
+        spill_dir=workdir,
+        key_frames=KeyFrameConfig(max_frames=8),
+    )
+    sent = []
+
+    async def on_flush(monitor_idx, frames):
+        # what Screen._process_batch does with a window's key frames
+        sent.append(sum(len(f.image_data()) for f in frames))
+
+    manager.set_flush_callback(on_flush)
+    frames_per_hour = int(3600 / args.interval)
+    frames_per_window = max(1, int(args.window * 60 / args.interval))
+    nbytes = args.frame_kb * 1024
+    rows = []
+    tracemalloc.start()
+    try:
+        for i in range(1, int(args.hours * frames_per_hour) + 1):
+            await manager.add_frame(
+                _frame(i, nbytes), "click", monitor_idx=1 + i % args.monitors,
+                metadata={"phash": 0},  # one static screen: the frames are not real JPEGs
+            )
+            if i % frames_per_window == 0:
+                await manager.flush_all_buffers()
+            if i % frames_per_hour == 0:
+                current, peak = tracemalloc.get_traced_memory()
+                status = manager.get_buffer_status()
+                rows.append({
+                    "hour": i // frames_per_hour,
+                    "current_mb": current / 2 ** 20,
+                    "peak_mb": peak / 2 ** 20,
+                    "resident_mb": status["resident_bytes"] / 2 ** 20,
+                    "disk_mb": status["spill"]["disk_bytes"] / 2 ** 20,
+                    "spilled": status["spill"]["spilled_frames"],
+                })
+                tracemalloc.reset_peak()
+        await manager.cleanup()
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, default=8)
+    parser.add_argument("--interval", type=float, default=2.0, help="session seconds between frames")
+    parser.add_argument("--window", type=float, default=5.0, help="session minutes per flush")
+    parser.add_argument("--frame-kb", type=int, default=300, help="base64 frame size")
+    parser.add_argument("--monitors", type=int, default=2)
+    parser.add_argument("--budget-mb", type=float, default=16.0, help="per-monitor and global budget")
+    args = parser.parse_args()
+
+    for label, budget in (("unbounded", None), (f"{args.budget_mb:g} MB budget", args.budget_mb)):
+        print(label)
+        print(f"{'hour':>5} {'traced MB':>10} {'peak MB':>8} {'resident MB':>12} {'disk MB':>8} {'spilled':>8}")
+        for r in await _scenario(budget, args):
+            print(f"{r['hour']:>5} {r['current_mb']:>10.1f} {r['peak_mb']:>8.1f} {r['resident_mb']:>12.1f} "
+                  f"{r['disk_mb']:>8.1f} {r['spilled']:>8}")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
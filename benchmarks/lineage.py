@@ -0,0 +1,127 @@
+"""
+Revision lineage queries: per-level walks vs. recursive CTEs.
+
+Builds ``--chains`` revision chains of ``--depth`` propositions each (every
+revision the single child of the previous one, as ``_handle_similar`` writes
+them) and times three lookups both ways:
+
+- ancestry of the newest revision (walk ``proposition_parent`` one level per
+  query vs. :func:`gum.db_utils.get_proposition_ancestry`)
+- latest descendant of the oldest revision (walk down one level per query vs.
+  :func:`gum.db_utils.get_latest_descendant`)
+- revision group members (:func:`gum.db_utils.get_revision_group`)
+
+Usage:
+    python benchmarks/lineage.py --depth 1000 --chains 20 --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from gum.db_utils import (  # noqa: E402
+    get_latest_descendant,
+    get_proposition_ancestry,
+    get_revision_group,
+)
+from gum.models import Proposition, init_db, proposition_parent  # noqa: E402
+
+
+async def _seed(Session, chains: int, depth: int):
+    """Insert the chains; returns ``(root_id, leaf_id, group)`` per chain."""
+    out = []
+    async with Session() as s:
+        async with s.begin():
+            for c in range(chains):
+                group = f"chain-{c}"
+                result = await s.execute(
+                    insert(Proposition).returning(Proposition.id),
+                    [{"text": f"revision {v} of chain {c}", "reasoning": "benchmark",
+                      "revision_group": group, "version": v + 1} for v in range(depth)],
+                )
+                ids = sorted(result.scalars().all())
+                await s.execute(insert(proposition_parent), [
+                    {"child_id": child, "parent_id": parent}
+                    for parent, child in zip(ids, ids[1:])
+                ])
+                out.append((ids[0], ids[-1], group))
+    return out
+
+
+async def _walk(session, start_id: int, up: bool) -> int:
+    """Follow single edges one query per level; returns the last id reached."""
+    near, far = (
+        (proposition_parent.c.child_id, proposition_parent.c.parent_id) if up
+        else (proposition_parent.c.parent_id, proposition_parent.c.child_id)
+    )
+    current, frontier = start_id, [start_id]
+    while frontier:
+        rows = (await session.execute(select(far).where(near.in_(frontier)))).scalars().all()
+        frontier = list(rows)
+        if rows:
+            current = rows[-1]
+    return current
+
+
+async def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=1000, help="revisions per chain")
+    parser.add_argument("--chains", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gum-bench-")
+    try:
+        engine, Session = await init_db("bench.db", workdir, read_pool_size=0)
+        chains = await _seed(Session, args.chains, args.depth)
+        root, leaf, group = chains[len(chains) // 2]
+
+        async with Session() as s:
+            assert await _walk(s, leaf, up=True) == root
+            assert (await get_latest_descendant(s, root)).id == leaf
+            assert len(await get_proposition_ancestry(s, leaf)) == args.depth - 1
+
+            rows = [
+                ("ancestry of newest",
+                 await _time(lambda: _walk(s, leaf, up=True), args.repeat),
+                 await _time(lambda: get_proposition_ancestry(s, leaf), args.repeat)),
+                ("latest of oldest",
+                 await _time(lambda: _walk(s, root, up=False), args.repeat),
+                 await _time(lambda: get_latest_descendant(s, root), args.repeat)),
+                ("revision group",
+                 float("nan"),
+                 await _time(lambda: get_revision_group(s, group), args.repeat)),
+            ]
+        await engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.chains} chains x {args.depth} revisions, median of {args.repeat}")
+    print(f"{'lookup':>20} {'per-level ms':>13} {'CTE ms':>8} {'speedup':>8}")
+    for name, walk_ms, cte_ms in rows:
+        if walk_ms != walk_ms:  # no per-level equivalent
+            print(f"{name:>20} {'-':>13} {cte_ms:>8.2f} {'-':>8}")
+        else:
+            print(f"{name:>20} {walk_ms:>13.2f} {cte_ms:>8.2f} {walk_ms / cte_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
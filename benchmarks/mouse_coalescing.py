@@ -0,0 +1,118 @@
+"""
+Event-loop load of pointer input, per-event submission vs coalescing.
+
+A thread stands in for the pynput listener and reports a mouse sweep at
+``--hz`` moves per second, with a click every second. In "per-event" mode
+each callback submits a coroutine with ``run_coroutine_threadsafe``, as the
+Screen observer used to; in "coalesced" mode the callbacks go through
+:class:`~gum.observers.input_coalescer.MouseCoalescer`. The handler stands
+in for the observer's event handling with ``--handler-us`` of CPU work.
+Each mode reports loop wakeups per second, handler calls, the listener
+thread's time per callback and the loop's scheduling lag, measured by a
+10 ms heartbeat.
+
+Usage:
+    python benchmarks/mouse_coalescing.py --seconds 3 --hz 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gum.observers.input_coalescer import MouseCoalescer  # noqa: E402
+
+
+def _busy(us: float) -> None:
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+async def _scenario(mode: str, args) -> dict:
+    loop = asyncio.get_running_loop()
+    handled = {"move": 0, "click": 0}
+
+    async def handle(x, y, typ):
+        _busy(args.handler_us)
+        handled[typ] += 1
+
+    if mode == "coalesced":
+        coalescer = MouseCoalescer(
+            loop, lambda x, y, typ: loop.create_task(handle(x, y, typ)),
+            lambda x, y: 1, rate_hz=args.rate,
+        )
+        on_move, on_click = coalescer.move, coalescer.click
+    else:
+        coalescer = None
+        wakeups = [0]
+
+        def on_move(x, y):
+            wakeups[0] += 1
+            asyncio.run_coroutine_threadsafe(handle(x, y, "move"), loop)
+
+        def on_click(x, y):
+            wakeups[0] += 1
+            asyncio.run_coroutine_threadsafe(handle(x, y, "click"), loop)
+
+    callback_s = []
+
+    def listener():
+        period = 1.0 / args.hz
+        start = time.perf_counter()
+        for i in range(int(args.seconds * args.hz)):
+            t = time.perf_counter()
+            on_move(float(i % 1920), 500.0)
+            if i % args.hz == 0:
+                on_click(10.0, 10.0)
+            callback_s.append(time.perf_counter() - t)
+            delay = start + (i + 1) * period - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    lags = []
+    thread = threading.Thread(target=listener)
+    thread.start()
+    while thread.is_alive():
+        t = loop.time()
+        await asyncio.sleep(0.01)
+        lags.append(loop.time() - t - 0.01)
+    await asyncio.sleep(0.2)
+
+    if coalescer is not None:
+        total_wakeups = coalescer.get_stats()["loop_wakeups"]
+        coalescer.close()
+    else:
+        total_wakeups = wakeups[0]
+    return {
+        "mode": mode,
+        "wakeups_per_s": round(total_wakeups / args.seconds),
+        "moves": handled["move"],
+        "clicks": handled["click"],
+        "callback_us": round(statistics.mean(callback_s) * 1e6, 1),
+        "lag_p99_ms": round(sorted(lags)[int(len(lags) * 0.99)] * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--hz", type=int, default=500, help="pointer moves per second")
+    parser.add_argument("--rate", type=float, default=20.0, help="coalesced delivery rate")
+    parser.add_argument("--handler-us", type=float, default=200.0, help="CPU work per handled event")
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'wakeups/s':>10} {'moves':>7} {'clicks':>7} {'callback us':>12} {'lag p99 ms':>11}")
+    for mode in ("per-event", "coalesced"):
+        r = await _scenario(mode, args)
+        print(f"{r['mode']:>10} {r['wakeups_per_s']:>10} {r['moves']:>7} {r['clicks']:>7} "
+              f"{r['callback_us']:>12} {r['lag_p99_ms']:>11}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
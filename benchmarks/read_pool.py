@@ -0,0 +1,143 @@
+"""
+Read latency under full-speed ingestion, with and without the read-only pool.
+
+Seeds a fresh database, then runs ingestion (observations + proposition links
+through the group-commit writer, as fast as it will go) while concurrent
+readers issue the queries behind ``/query`` and ``/propositions/by-hour``.
+Each scenario reports read p50/p95/p99 and the achieved write rate.
+
+Usage:
+    python benchmarks/read_pool.py --readers 8 --duration 10 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from gum.db_utils import search_propositions_bm25  # noqa: E402
+from gum.models import Observation, Proposition, init_db, observation_proposition  # noqa: E402
+from gum.services.db_writer import DatabaseWriter  # noqa: E402
+
+WORDS = (
+    "budget spreadsheet email draft slack meeting calendar code review pull request "
+    "figma design notes paper deadline python test deploy invoice report chart"
+).split()
+
+
+def _sentence(rng: random.Random, n: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _seed(Session, rows: int, rng: random.Random):
+    async with Session() as s:
+        async with s.begin():
+            for i in range(rows // 10):
+                s.add(Proposition(text=_sentence(rng), reasoning=_sentence(rng),
+                                  confidence=rng.randint(1, 10), revision_group=f"g{i}"))
+            for _ in range(rows):
+                s.add(Observation(observer_name="Screen", content=_sentence(rng, 40),
+                                  content_type="input_text"))
+
+
+async def _scenario(pool_size: int, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="gum-bench-")
+    try:
+        rng = random.Random(0)
+        engine, Session = await init_db("bench.db", workdir, read_pool_size=pool_size)
+        await _seed(Session, args.seed_rows, rng)
+        writer = DatabaseWriter(engine)
+        await writer.start()
+
+        stop = asyncio.Event()
+        latencies: list[float] = []
+        writes = 0
+
+        async def ingest():
+            nonlocal writes
+            n_props = args.seed_rows // 10
+
+            async def _write(session):
+                obs = Observation(observer_name="Screen", content=_sentence(rng, 40),
+                                  content_type="input_text")
+                session.add(obs)
+                await session.flush()
+                await session.execute(insert(observation_proposition).values(
+                    observation_id=obs.id, proposition_id=rng.randint(1, n_props)))
+
+            while not stop.is_set():
+                await writer.submit(_write, label="bench")
+                writes += 1
+
+        async def read(reader_id: int):
+            r = random.Random(reader_id)
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                async with Session() as s:
+                    if r.random() < 0.5:
+                        await search_propositions_bm25(
+                            s, " ".join(r.sample(WORDS, 3)), limit=5, include_observations=True,
+                            enable_mmr=False)
+                    else:
+                        hour = func.strftime("%H", Proposition.created_at)
+                        await s.execute(select(hour, func.count()).group_by(hour))
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        tasks = [asyncio.create_task(ingest()) for _ in range(args.writers)]
+        tasks += [asyncio.create_task(read(i)) for i in range(args.readers)]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        await writer.stop()
+
+        read_engine = Session.kw["info"]["read_engine"]
+        if read_engine is not None:
+            await read_engine.dispose()
+        await engine.dispose()
+
+        latencies.sort()
+        return {
+            "pool_size": pool_size,
+            "reads": len(latencies),
+            "read_p50_ms": round(_percentile(latencies, 0.50), 2),
+            "read_p95_ms": round(_percentile(latencies, 0.95), 2),
+            "read_p99_ms": round(_percentile(latencies, 0.99), 2),
+            "writes_per_s": round(writes / args.duration, 1),
+            "mean_group_size": writer.get_stats()["group_size"]["mean"],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed-rows", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=16, help="concurrent ingestion tasks")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'pool':>5} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'writes/s':>9} {'group':>6}")
+    for pool_size in (0, args.pool_size):
+        r = await _scenario(pool_size, args)
+        print(f"{r['pool_size']:>5} {r['reads']:>7} {r['read_p50_ms']:>8} {r['read_p95_ms']:>8} "
+              f"{r['read_p99_ms']:>8} {r['writes_per_s']:>9} {r['mean_group_size']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
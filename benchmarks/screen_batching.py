@@ -0,0 +1,164 @@
+"""
+Vision cost and latency of the Screen observer, per-event vs batch mode.
+
+Replays the same synthetic interaction trace (windows opening, panes
+changing, idle clicks) through the observer's analysis path with a stub
+vision client. The stub sleeps ``--base-ms`` plus ``--per-image-ms`` per
+image and counts input tokens with the OpenAI high-detail tiling rule, so
+the run needs no API key and costs nothing. Each mode reports requests,
+images, upload size, estimated input tokens, Updates emitted and latency.
+
+Usage:
+    python benchmarks/screen_batching.py --events 40 --window 10
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from gum.observers.screen import Screen  # noqa: E402
+
+ANSWER = "The user is viewing a code editor and a browser window with documentation text on screen."
+
+
+def _image_tokens(width: int, height: int) -> int:
+    """Input tokens of a high-detail image (fit 2048x2048, short side 768, 512px tiles)."""
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+class StubVision:
+    """Stands in for ``client.chat.completions``; records what each request carried."""
+
+    def __init__(self, base_ms: float, per_image_ms: float):
+        self.base = base_ms / 1000
+        self.per_image = per_image_ms / 1000
+        self.requests = self.images = self.upload_bytes = self.tokens = 0
+
+    async def create(self, model, messages, response_format):
+        urls = [c["image_url"]["url"] for c in messages[0]["content"] if c["type"] == "image_url"]
+        self.requests += 1
+        self.images += len(urls)
+        for url in urls:
+            payload = url.split(",", 1)[1]
+            self.upload_bytes += len(payload)
+            size = Image.open(io.BytesIO(base64.b64decode(payload))).size
+            self.tokens += _image_tokens(*size)
+        await asyncio.sleep(self.base + self.per_image * len(urls))
+        if response_format["type"] == "json_object":
+            text = json.dumps({"transcription": ANSWER, "summary": ANSWER})
+        else:
+            text = ANSWER
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _trace(events: int, width: int, height: int, seed: int):
+    """Yield (before, after) BGRA frames: mostly local changes, some full switches, some no-ops."""
+    rng = np.random.default_rng(seed)
+    screen = np.full((height, width, 4), 230, np.uint8)
+    screen[::24, :, :3] = 60  # text-like rows
+    for _ in range(events):
+        before = screen.copy()
+        kind = rng.random()
+        if kind < 0.6:  # a dialog or pane changes
+            w, h = int(rng.integers(width // 8, width // 3)), int(rng.integers(height // 8, height // 3))
+            x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+            screen[y:y + h, x:x + w, :3] = rng.integers(0, 255, 3, dtype=np.uint8)
+        elif kind < 0.8:  # application switch
+            screen[:, :, :3] = rng.integers(0, 255, 3, dtype=np.uint8)
+            screen[::24, :, :3] = 60
+        # else: click that changes nothing
+        yield before, screen.copy()
+
+
+def _frame(pixels: np.ndarray):
+    return SimpleNamespace(raw=pixels.tobytes(), width=pixels.shape[1], height=pixels.shape[0])
+
+
+async def _scenario(mode: str, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="gum-bench-")
+    try:
+        batch = mode == "batch"
+        screen = Screen(
+            screenshots_dir=workdir,
+            save_screenshots=False,
+            api_key="bench",
+            vision_mode=args.vision_mode,
+            buffer_minutes=60 if batch else None,  # flushed explicitly every --window events
+            batch_max_frames=args.batch_frames,
+        )
+        screen._task.cancel()  # no live capture: the trace is replayed below
+        stub = StubVision(args.base_ms, args.per_image_ms)
+        screen.client = SimpleNamespace(chat=SimpleNamespace(completions=stub))
+
+        start = time.perf_counter()
+        for i, (before, after) in enumerate(_trace(args.events, args.width, args.height, args.seed), 1):
+            ev = {"type": "click", "mon": 1, "before": _frame(before), "time": time.monotonic()}
+            flush_time = time.monotonic()
+            encoded = await screen._encode_interaction(ev, _frame(after))
+            if encoded is not None:
+                await screen._analyse_interaction(ev, encoded, flush_time)
+            if batch and i % args.window == 0:
+                await screen._buffer.flush_all_buffers()
+        if batch:
+            await screen._buffer.cleanup()
+        elapsed = time.perf_counter() - start
+
+        stats = screen.get_stats()
+        latency = [s["processing_ms"] for s in stats["latency"].values() if s["processing_ms"]]
+        return {
+            "mode": mode,
+            "requests": stub.requests,
+            "images": stub.images,
+            "upload_mb": round(stub.upload_bytes / 1e6, 2),
+            "tokens": stub.tokens,
+            "updates": screen.update_queue.qsize(),
+            "wall_s": round(elapsed, 1),
+            "p50_ms": latency[0]["p50"] if latency else float("nan"),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=40)
+    parser.add_argument("--window", type=int, default=10, help="events per batch flush")
+    parser.add_argument("--batch-frames", type=int, default=8)
+    parser.add_argument("--width", type=int, default=2560)
+    parser.add_argument("--height", type=int, default=1440)
+    parser.add_argument("--vision-mode", default="combined", help="per-event request mode")
+    parser.add_argument("--base-ms", type=float, default=800.0, help="stub latency per request")
+    parser.add_argument("--per-image-ms", type=float, default=150.0, help="stub latency per image")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'requests':>9} {'images':>7} {'upload MB':>10} {'tokens':>8} "
+          f"{'updates':>8} {'wall s':>7} {'p50 ms':>8}")
+    for mode in ("per-event", "batch"):
+        r = await _scenario(mode, args)
+        print(f"{r['mode']:>10} {r['requests']:>9} {r['images']:>7} {r['upload_mb']:>10} {r['tokens']:>8} "
+              f"{r['updates']:>8} {r['wall_s']:>7} {r['p50_ms']:>8}")
+    print("p50 ms is processing time per request; in batch mode each interaction additionally "
+          "waits up to the buffer window before it is analysed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
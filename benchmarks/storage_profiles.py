@@ -0,0 +1,116 @@
+"""
+Ingest rate and FTS query latency for each storage profile.
+
+For every (profile, size) pair a fresh database is created with ``init_db``,
+filled with synthetic screen observations in committed batches (FTS triggers
+included), checkpointed, and then queried with random multi-term MATCH
+queries. Reported per run: rows/s, final database size, and FTS p50/p95/p99.
+
+Usage:
+    python benchmarks/storage_profiles.py --sizes 10000 100000 1000000
+    python benchmarks/storage_profiles.py --profiles balanced throughput --sizes 10000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from gum.config.storage_config import STORAGE_PROFILES  # noqa: E402
+from gum.models import Observation, init_db  # noqa: E402
+
+VOCAB_SIZE = 5000
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(VOCAB_SIZE)]
+
+
+def _document(rng: random.Random, vocab: list[str]) -> str:
+    # zipf-ish term distribution so common and rare terms both exist
+    return " ".join(vocab[min(int(rng.paretovariate(1.2)) - 1, VOCAB_SIZE - 1)] for _ in range(60))
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(profile: str, rows: int, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="gum-bench-", dir=args.workdir)
+    rng = random.Random(42)
+    vocab = _vocabulary(rng)
+    try:
+        engine, _ = await init_db("bench.db", workdir, read_pool_size=0, storage_profile=profile)
+        db_path = os.path.join(workdir, "bench.db")
+
+        stmt = insert(Observation)
+        start = time.perf_counter()
+        async with engine.connect() as conn:
+            for offset in range(0, rows, args.batch):
+                n = min(args.batch, rows - offset)
+                params = [
+                    {"observer_name": "Screen", "content": _document(rng, vocab),
+                     "content_type": "input_text"}
+                    for _ in range(n)
+                ]
+                await conn.exec_driver_sql("BEGIN")
+                await conn.execute(stmt, params)
+                await conn.exec_driver_sql("COMMIT")
+            ingest_s = time.perf_counter() - start
+            await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+            latencies = []
+            for _ in range(args.queries):
+                q = " OR ".join(rng.sample(vocab[:500], 2)) + " " + rng.choice(vocab[:50])
+                t0 = time.perf_counter()
+                await conn.execute(
+                    text("SELECT rowid, bm25(observations_fts) AS s FROM observations_fts "
+                         "WHERE observations_fts MATCH :q ORDER BY s LIMIT 20"),
+                    {"q": q},
+                )
+                latencies.append((time.perf_counter() - t0) * 1000)
+        await engine.dispose()
+
+        latencies.sort()
+        return {
+            "profile": profile,
+            "rows": rows,
+            "rows_per_s": round(rows / ingest_s),
+            "db_mb": round(os.path.getsize(db_path) / 1e6, 1),
+            "fts_p50_ms": round(_percentile(latencies, 0.50), 2),
+            "fts_p95_ms": round(_percentile(latencies, 0.95), 2),
+            "fts_p99_ms": round(_percentile(latencies, 0.99), 2),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", nargs="+", default=list(STORAGE_PROFILES),
+                        choices=list(STORAGE_PROFILES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument("--batch", type=int, default=500, help="rows per committed transaction")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--workdir", default=None, help="directory for scratch databases")
+    args = parser.parse_args()
+
+    print(f"{'profile':>10} {'rows':>9} {'rows/s':>8} {'db MB':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for rows in args.sizes:
+        for profile in args.profiles:
+            r = await _run(profile, rows, args)
+            print(f"{r['profile']:>10} {r['rows']:>9} {r['rows_per_s']:>8} {r['db_mb']:>7} "
+                  f"{r['fts_p50_ms']:>7} {r['fts_p95_ms']:>7} {r['fts_p99_ms']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
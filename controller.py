@@ -17,17 +17,18 @@ import time
 import uuid
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
 from datetime import datetime, timezone, timedelta
 from dateutil import parser as date_parser
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Union, AsyncIterator
+from typing import Any, Dict, List, Optional, Union, AsyncIterator
 from asyncio import Semaphore
 import pytz
 import json
 
 import uvicorn
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status, Request
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 try:
@@ -51,6 +52,11 @@ from gum.schemas import (
     SpecificInsight
 )
 from gum.observers import Observer
+from gum.services.instance_pool import GumInstancePool, user_database_name, user_key
+from gum.services.observation_archive import ObservationArchiver
+from gum.services.observation_rollup import ObservationRollup
+from gum.services.proposition_gc import PropositionGC
+from gum.services.content_compression import ContentCompressor
 from unified_ai_client import UnifiedAIClient
 
 # Gumbo (intelligent suggestions) imports with graceful fallback
@@ -113,8 +119,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global GUM instance
-gum_instance: Optional[gum] = None
+# Per-user GUM instances (see get_gum_pool)
+gum_pool: Optional[GumInstancePool] = None
+
+# Instances leased by the current request (or task, outside requests), released once it is done
+_request_leases: ContextVar[Optional[Dict[str, Any]]] = ContextVar("gum_request_leases", default=None)
 
 # Global unified AI client
 ai_client: Optional[UnifiedAIClient] = None
@@ -260,31 +269,125 @@ def serialize_datetime(dt: datetime) -> str:
     return dt.isoformat()
 
 
+def _resolve_user_name(user_name: Optional[str] = None) -> str:
+    """Fall back to DEFAULT_USER_NAME for requests without a user."""
+    return user_name or os.getenv("DEFAULT_USER_NAME", "APIUser")
+
+
+def _create_gum_instance(user_name: str) -> gum:
+    """Build (but don't connect) the GUM instance for one user.
+
+    Each user gets their own SQLite file, or their own schema when
+    GUM_DATABASE_URL points at PostgreSQL. The default user keeps gum.db.
+    """
+    # Initialize GUM - it will automatically use the unified client
+    is_default = user_name == _resolve_user_name()
+    return gum(
+        user_name=user_name,
+        model="gpt-4o",  # Model name used for logging/identification only
+        data_directory="~/.cache/gum",
+        db_name=user_database_name(user_name, _resolve_user_name()),
+        db_schema=None if is_default else f"gum_{user_key(user_name)}",
+        verbosity=logging.INFO
+    )
+
+
+def get_gum_pool() -> GumInstancePool:
+    """Return the per-user instance pool, creating it on first use."""
+    global gum_pool
+    if gum_pool is None:
+        gum_pool = GumInstancePool(_create_gum_instance)
+    return gum_pool
+
+
+def gum_lease(user_name: Optional[str] = None):
+    """Lease a user's GUM instance outside a request (e.g. in background jobs)."""
+    return get_gum_pool().lease(_resolve_user_name(user_name))
+
+
 async def ensure_gum_instance(user_name: Optional[str] = None) -> gum:
-    """Ensure GUM instance is initialized and connected."""
-    global gum_instance
-    
-    default_user = os.getenv("DEFAULT_USER_NAME", "APIUser")
-    user_name = user_name or default_user
-    
-    if gum_instance is None or gum_instance.user_name != user_name:
-        logger.info(f"Initializing GUM instance for user: {user_name}")
-        
-        # Initialize GUM - it will automatically use the unified client
-        logger.info("Initializing GUM with unified AI client")
-        
-        gum_instance = gum(
-            user_name=user_name,
-            model="gpt-4o",  # Model name used for logging/identification only
-            data_directory="~/.cache/gum",
-            verbosity=logging.INFO
+    """Return the user's pooled GUM instance, connecting it on first use.
+
+    Inside a request the instance is leased until the response has been
+    sent, which applies the per-user concurrency limit and keeps the
+    instance from being evicted while the request uses it.
+
+    Outside a request (startup hooks, websockets, background tasks) the
+    lease is held until the calling task finishes.
+    """
+    user_name = _resolve_user_name(user_name)
+    pool = get_gum_pool()
+    leases = _request_leases.get()
+    if leases is None:
+        leases = _task_leases()
+    elif user_name in leases:
+        return await pool.get(user_name)
+    lease = pool.lease(user_name)
+    gum_inst = await lease.__aenter__()
+    leases[user_name] = lease
+    return gum_inst
+
+
+def _task_leases() -> Dict[str, Any]:
+    """Lease scope of the current task, released when the task is done."""
+    leases: Dict[str, Any] = {}
+    _request_leases.set(leases)
+    asyncio.current_task().add_done_callback(
+        lambda _: asyncio.ensure_future(_release_leases(leases))
+    )
+    return leases
+
+
+async def _release_leases(leases: Dict[str, Any]) -> None:
+    while leases:
+        _, lease = leases.popitem()
+        await lease.__aexit__(None, None, None)
+
+
+async def _body_then_release(body_iterator, leases: Dict[str, Any]):
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        await _release_leases(leases)
+
+
+def _require_embedded(gum_inst: gum, feature: str) -> None:
+    """Reject file-level SQLite features on client/server storage backends."""
+    if gum_inst.backend is not None and not gum_inst.backend.embedded:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{feature} requires the SQLite storage backend (using {gum_inst.backend.name})"
         )
-        
-        await gum_instance.connect_db()
-        logger.info("GUM instance connected to database")
-        logger.info("GUM configured with unified AI client for hybrid text/vision processing")
-    
-    return gum_instance
+
+
+def get_archiver(gum_inst: gum) -> ObservationArchiver:
+    """Return the instance's archiver, creating an on-demand one if archiving is not scheduled."""
+    _require_embedded(gum_inst, "Observation archiving")
+    if gum_inst.archive is None:
+        gum_inst.archive = ObservationArchiver(gum_inst.db_path)
+    return gum_inst.archive
+
+
+def get_rollup(gum_inst: gum) -> ObservationRollup:
+    """Return the instance's rollup job, creating an on-demand one if rollup is not scheduled."""
+    _require_embedded(gum_inst, "Observation rollup")
+    if gum_inst.rollup is None:
+        gum_inst.rollup = ObservationRollup(gum_inst.db_path, screenshots_dir=gum_inst.screenshots_dir)
+    return gum_inst.rollup
+
+
+def get_proposition_gc(gum_inst: gum) -> PropositionGC:
+    """Return the instance's proposition collector, creating an on-demand one if GC is not scheduled."""
+    if gum_inst.proposition_gc is None:
+        gum_inst.proposition_gc = PropositionGC(gum_inst.Session, gum_inst.writer)
+    return gum_inst.proposition_gc
+
+
+def get_content_compressor(gum_inst: gum) -> ContentCompressor:
+    """Return a content compressor for the instance's database."""
+    _require_embedded(gum_inst, "Content compression")
+    return ContentCompressor(gum_inst.Session, gum_inst.writer)
 
 
 def validate_image(file_content: bytes) -> bool:
@@ -624,6 +727,25 @@ async def rate_limit_middleware(request: Request, call_next):
         logger.error(f"Error in rate limit middleware: {e}")
         raise
 
+# Lease per-user GUM instances for the lifetime of each request
+@app.middleware("http")
+async def gum_lease_middleware(request: Request, call_next):
+    """Release the GUM instances a request leased once its response body is sent"""
+    leases: Dict[str, Any] = {}
+    token = _request_leases.set(leases)
+    try:
+        response = await call_next(request)
+    except BaseException:
+        await _release_leases(leases)
+        raise
+    finally:
+        _request_leases.reset(token)
+
+    if leases:
+        # streamed responses keep using the instance until the body is done
+        response.body_iterator = _body_then_release(response.body_iterator, leases)
+    return response
+
 # Add rate limit monitoring endpoint
 @app.get("/admin/rate-limits", response_model=dict)
 async def get_rate_limit_stats():
@@ -668,6 +790,314 @@ async def reset_rate_limits(endpoint: Optional[str] = None):
             detail="Error resetting rate limits"
         )
 
+# FTS index maintenance monitoring endpoint
+@app.get("/admin/fts-maintenance", response_model=dict)
+async def get_fts_maintenance_stats(user_name: Optional[str] = None):
+    """Get FTS5 segment counts and maintenance statistics"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        if gum_inst.fts_maintenance is None:
+            return {"enabled": False, "timestamp": serialize_datetime(datetime.now(timezone.utc))}
+
+        return {
+            "enabled": True,
+            **(await gum_inst.fts_maintenance.get_stats()),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting FTS maintenance stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving FTS maintenance statistics"
+        )
+
+# Run FTS index maintenance immediately (admin only)
+@app.post("/admin/fts-maintenance/run", response_model=dict)
+async def run_fts_maintenance(user_name: Optional[str] = None, force: bool = False, rebuild_prefix: bool = False):
+    """Run an FTS5 maintenance pass now and report before/after MATCH latency"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        if gum_inst.fts_maintenance is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="FTS maintenance is disabled for this GUM instance"
+            )
+
+        rebuilt = []
+        if rebuild_prefix:
+            for table in gum_inst.fts_maintenance.tables:
+                if await gum_inst.fts_maintenance.rebuild_with_prefix(table):
+                    rebuilt.append(table)
+
+        reports = await gum_inst.fts_maintenance.run_once(force=force)
+        logger.info(f"FTS maintenance run completed: {reports}")
+        return {
+            "reports": reports,
+            "rebuilt_with_prefix": rebuilt,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running FTS maintenance: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error running FTS maintenance"
+        )
+
+# Database writer (group commit) endpoints
+@app.get("/admin/db-writer", response_model=dict)
+async def get_db_writer_stats(user_name: Optional[str] = None):
+    """Get group-commit batch sizes, write latency and throughput"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            **gum_inst.writer.get_stats(),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting database writer stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving database writer statistics"
+        )
+
+@app.get("/admin/storage", response_model=dict)
+async def get_storage_stats(user_name: Optional[str] = None):
+    """Get the storage backend, active storage profile and background WAL checkpoint statistics"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        profile = gum_inst.storage_profile
+        return {
+            "backend": gum_inst.backend.name,
+            "profile": profile.name,
+            "pragmas": profile.connection_pragmas(),
+            "page_size": profile.page_size,
+            "checkpointer": gum_inst.checkpointer.get_stats() if gum_inst.checkpointer else None,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting storage stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving storage statistics"
+        )
+
+@app.get("/admin/storage/compression", response_model=dict)
+async def get_compression_stats(user_name: Optional[str] = None):
+    """Get the observation content compression ratio, backlog and dictionaries"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            **(await get_content_compressor(gum_inst).get_stats()),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting compression stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving compression statistics"
+        )
+
+@app.post("/admin/storage/compression/run", response_model=dict)
+async def run_compression(
+    user_name: Optional[str] = None,
+    train_dictionary: bool = False,
+    batch_size: int = 500,
+    max_batches: int = 20,
+):
+    """Compress uncompressed observations, optionally training a new dictionary first"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        compressor = get_content_compressor(gum_inst)
+        dictionary = await compressor.train() if train_dictionary else None
+        report = await compressor.run(batch_size, max_batches, recompress=train_dictionary)
+        return {
+            **report,
+            "trained_dictionary": dictionary,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error compressing observations: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error compressing observations: {str(e)}"
+        )
+
+# Observer statistics endpoint
+@app.get("/admin/observers", response_model=dict)
+async def get_observer_stats(user_name: Optional[str] = None):
+    """Get capture and vision-call counters of the instance's observers"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            "observers": [obs.get_stats() for obs in gum_inst.observers],
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting observer stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving observer statistics"
+        )
+
+# Per-user GUM instance pool endpoint
+@app.get("/admin/gum-pool", response_model=dict)
+async def get_gum_pool_stats():
+    """Get pooled per-user GUM instances, hit rate, evictions and per-user load"""
+    try:
+        return {
+            **get_gum_pool().get_stats(),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting GUM pool stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving GUM pool statistics"
+        )
+
+# Observation archive (cold tier) endpoints
+@app.get("/admin/archive", response_model=dict)
+async def get_archive_stats(user_name: Optional[str] = None):
+    """Get hot database and monthly archive sizes"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            **(await get_archiver(gum_inst).get_stats()),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting archive stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving archive statistics"
+        )
+
+@app.post("/admin/archive/run", response_model=dict)
+async def run_archive(user_name: Optional[str] = None, older_than_days: Optional[int] = None):
+    """Move observations older than the configured age into monthly archives"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        report = await get_archiver(gum_inst).archive(older_than_days)
+        return {
+            **report,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error archiving observations: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error archiving observations: {str(e)}"
+        )
+
+# Observation rollup (retention compaction) endpoints
+@app.get("/admin/rollup", response_model=dict)
+async def get_rollup_stats(user_name: Optional[str] = None):
+    """Get rollup observation counts and the last compaction report"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            **(await get_rollup(gum_inst).get_stats()),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting rollup stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving rollup statistics"
+        )
+
+@app.post("/admin/rollup/run", response_model=dict)
+async def run_rollup(user_name: Optional[str] = None, older_than_days: Optional[int] = None):
+    """Roll up old observations per proposition and apply the retention policy"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        report = await get_rollup(gum_inst).run(older_than_days)
+        return {
+            **report,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error rolling up observations: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error rolling up observations: {str(e)}"
+        )
+
+# Proposition garbage collection endpoints
+@app.get("/admin/proposition-gc", response_model=dict)
+async def get_proposition_gc_stats(user_name: Optional[str] = None):
+    """Get cold proposition counts, candidate pool size and the last sweep report"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        return {
+            **(await get_proposition_gc(gum_inst).get_stats()),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting proposition GC stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving proposition GC statistics"
+        )
+
+@app.post("/admin/proposition-gc/run", response_model=dict)
+async def run_proposition_gc(user_name: Optional[str] = None, batch_size: Optional[int] = None):
+    """Score the next batch of leaf propositions and archive the stale ones"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        report = await get_proposition_gc(gum_inst).run(batch_size)
+        return {
+            **report,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running proposition GC: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running proposition GC: {str(e)}"
+        )
+
+@app.post("/admin/proposition-gc/restore", response_model=dict)
+async def restore_propositions(proposition_ids: List[int], user_name: Optional[str] = None):
+    """Move archived propositions back into retrieval"""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        result = await get_proposition_gc(gum_inst).restore(proposition_ids)
+        return {
+            **result,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error restoring propositions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error restoring propositions: {str(e)}"
+        )
+
 # === API Endpoints ===
 
 @app.get("/health", response_model=HealthResponse)
@@ -705,42 +1135,43 @@ async def cleanup_database(user_name: Optional[str] = None):
         # Get GUM instance
         gum_inst = await ensure_gum_instance(user_name)
         
-        observations_deleted = 0
-        propositions_deleted = 0
-        junction_records_deleted = 0
+        from gum.models import Observation, Proposition, observation_proposition, proposition_parent
+        from sqlalchemy import delete, text
         
-        # Clean up database
-        async with gum_inst._session() as session:
-            from gum.models import Observation, Proposition, observation_proposition, proposition_parent
-            from sqlalchemy import delete, text
-            
+        # Clean up database (one write intent, committed by the database writer)
+        async def _delete_all(session):
             # Delete in proper order to avoid foreign key constraints
             
             # First, delete all junction table entries
             junction_obs_result = await session.execute(delete(observation_proposition))
             junction_prop_result = await session.execute(delete(proposition_parent))
-            junction_records_deleted = junction_obs_result.rowcount + junction_prop_result.rowcount
             
             # Then delete all observations
             obs_result = await session.execute(delete(Observation))
-            observations_deleted = obs_result.rowcount
             
             # Then delete all propositions
             prop_result = await session.execute(delete(Proposition))
-            propositions_deleted = prop_result.rowcount
             
-            # Clear the FTS tables as well
-            await session.execute(text("DELETE FROM propositions_fts"))
-            await session.execute(text("DELETE FROM observations_fts"))
+            # Clear the full-text index as well
+            await gum_inst.backend.clear_search_index(session)
             
-            # Commit the transaction
-            await session.commit()
+            return (
+                obs_result.rowcount,
+                prop_result.rowcount,
+                junction_obs_result.rowcount + junction_prop_result.rowcount
+            )
+        
+        observations_deleted, propositions_deleted, junction_records_deleted = \
+            await gum_inst.writer.submit(_delete_all, label="controller.cleanup")
         
-        # Run VACUUM outside of the session/transaction context
+        # Run VACUUM outside of any transaction (SQLite only; PostgreSQL autovacuums)
         try:
-            async with gum_inst._session() as vacuum_session:
-                await vacuum_session.execute(text("VACUUM"))
-                await vacuum_session.commit()
+            if gum_inst.backend.embedded:
+                await gum_inst.writer.submit(
+                    lambda session: session.execute(text("VACUUM")),
+                    label="controller.vacuum",
+                    transactional=False
+                )
         except Exception as vacuum_error:
             logger.warning(f"VACUUM operation failed: {vacuum_error}")
             # Continue anyway as the cleanup was successful
@@ -1031,13 +1462,20 @@ async def query_gum(request: QueryRequest):
 
 @app.get("/observations", response_model=List[ObservationResponse])
 async def list_observations(
+    response: Response,
     user_name: Optional[str] = None,
     limit: Optional[int] = 20,
-    offset: Optional[int] = 0
+    offset: Optional[int] = 0,
+    cursor: Optional[str] = None
 ):
-    """List recent observations."""
+    """List recent observations.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch the
+    next page in constant time; ``offset`` is still honoured when no cursor
+    is given.
+    """
     try:
-        logger.info(f"Listing observations: limit={limit}, offset={offset}")
+        logger.info(f"Listing observations: limit={limit}, offset={offset}, cursor={cursor}")
         
         # Get GUM instance
         gum_inst = await ensure_gum_instance(user_name)
@@ -1045,21 +1483,29 @@ async def list_observations(
         # Query recent observations from database
         async with gum_inst._session() as session:
             from gum.models import Observation
-            from sqlalchemy import select, desc
+            from gum.db_utils import paginate_keyset, next_cursor
+            from sqlalchemy import select
             
-            stmt = (
-                select(Observation)
-                .order_by(desc(Observation.created_at))
-                .limit(limit)
-                .offset(offset)
-            )
+            try:
+                stmt = paginate_keyset(
+                    select(Observation), Observation, cursor=cursor, limit=limit, backend=gum_inst.backend
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            if not cursor and offset:
+                stmt = stmt.offset(offset)
             
             result = await session.execute(stmt)
-            observations = result.scalars().all()
+            rows = result.all()
+            observations = [row[0] for row in rows]
+            
+            page_cursor = next_cursor(rows, limit)
+            if page_cursor:
+                response.headers["X-Next-Cursor"] = page_cursor
             
-            response = []
+            response_items = []
             for obs in observations:
-                response.append(ObservationResponse(
+                response_items.append(ObservationResponse(
                     id=obs.id,
                     content=obs.content[:500] + "..." if len(obs.content) > 500 else obs.content,
                     content_type=obs.content_type,
@@ -1067,9 +1513,11 @@ async def list_observations(
                     created_at=serialize_datetime(parse_datetime(obs.created_at))
                 ))
             
-            logger.info(f"Retrieved {len(response)} observations")
-            return response
+            logger.info(f"Retrieved {len(response_items)} observations")
+            return response_items
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing observations: {e}")
         raise HTTPException(
@@ -1078,17 +1526,172 @@ async def list_observations(
         )
 
 
+@app.get("/observations/search", response_model=List[dict])
+async def search_observations(
+    query: str,
+    user_name: Optional[str] = None,
+    limit: Optional[int] = 10,
+    mode: Optional[str] = "OR",
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    include_archive: bool = True
+):
+    """Full-text search over observations, federated across the hot database and monthly archives."""
+    try:
+        logger.info(f"Searching observations: query={query}, include_archive={include_archive}")
+        
+        gum_inst = await ensure_gum_instance(user_name)
+        
+        hits = await get_archiver(gum_inst).search(
+            query,
+            limit=limit,
+            mode=mode,
+            start_time=parse_datetime(start_time) if start_time else None,
+            end_time=parse_datetime(end_time) if end_time else None,
+            include_archives=include_archive
+        )
+        
+        logger.info(f"Found {len(hits)} observations")
+        return hits
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching observations: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching observations: {str(e)}"
+        )
+
+
+def _export_value(value):
+    """Make an exported column value JSON-serializable."""
+    if isinstance(value, datetime):
+        return serialize_datetime(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return value
+
+
+@app.get("/export/{table}")
+async def export_table(
+    table: str,
+    request: Request,
+    user_name: Optional[str] = None,
+    format: str = "ndjson",
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    batch_size: int = 1000,
+    gzip: Optional[bool] = None
+):
+    """Stream a whole table as NDJSON or columnar JSON batches.
+
+    Rows are read from a server-side cursor and encoded (and optionally
+    gzip-compressed) batch by batch, so memory use does not grow with the
+    size of the export.
+
+    - ``format=ndjson``: one JSON object per row
+    - ``format=columnar``: one JSON object per batch, ``{"columns": [...], "data": [[col values]...]}``
+
+    Compression defaults to gzip when the client sends ``Accept-Encoding: gzip``.
+    """
+    import zlib
+    from gum.db_utils import EXPORT_TABLES, export_columns, stream_table
+
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown table '{table}'. Available: {', '.join(EXPORT_TABLES)}"
+        )
+    if format not in ("ndjson", "columnar"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'ndjson' or 'columnar'"
+        )
+    sa_table = EXPORT_TABLES[table]
+    if (start_time or end_time) and "created_at" not in sa_table.c:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Table '{table}' cannot be filtered by time"
+        )
+    batch_size = max(1, min(batch_size, 10_000))
+    if gzip is None:
+        gzip = "gzip" in request.headers.get("accept-encoding", "")
+
+    try:
+        start_dt = parse_datetime(start_time) if start_time else None
+        end_dt = parse_datetime(end_time) if end_time else None
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid start_time or end_time"
+        )
+
+    gum_inst = await ensure_gum_instance(user_name)
+    columns = [c.name for c in export_columns(sa_table)]
+    logger.info(f"Exporting {table} as {format} (gzip={gzip}, start={start_time}, end={end_time})")
+
+    async def generate():
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+        rows_sent = 0
+        try:
+            async with gum_inst._session() as session:
+                async for batch in stream_table(
+                    session, sa_table,
+                    start_time=start_dt, end_time=end_dt, batch_size=batch_size
+                ):
+                    if format == "ndjson":
+                        chunk = "".join(
+                            json.dumps(dict(zip(columns, map(_export_value, row))), separators=(",", ":")) + "\n"
+                            for row in batch
+                        )
+                    else:
+                        chunk = json.dumps(
+                            {"columns": columns, "data": [
+                                [_export_value(v) for v in col] for col in zip(*batch)
+                            ]},
+                            separators=(",", ":")
+                        ) + "\n"
+                    rows_sent += len(batch)
+                    data = chunk.encode("utf-8")
+                    if compressor:
+                        data = compressor.compress(data)
+                    if data:
+                        yield data
+            if compressor:
+                yield compressor.flush()
+            logger.info(f"Exported {rows_sent} rows from {table}")
+        except Exception as e:
+            # headers are already sent; all we can do is log and end the stream
+            logger.error(f"Error exporting {table} after {rows_sent} rows: {e}")
+            raise
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{table}.{format}.jsonl"',
+        "X-Export-Columns": ",".join(columns),
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+
 @app.get("/propositions", response_model=List[PropositionResponse])
 async def list_propositions(
+    response: Response,
     user_name: Optional[str] = None,
     limit: Optional[int] = 20,
     offset: Optional[int] = 0,
     confidence_min: Optional[int] = None,
-    sort_by: Optional[str] = "created_at"
+    sort_by: Optional[str] = "created_at",
+    cursor: Optional[str] = None
 ):
-    """List recent propositions with filtering and sorting options."""
+    """List recent propositions with filtering and sorting options.
+
+    When sorting by ``created_at`` the ``X-Next-Cursor`` response header can be
+    passed back as ``cursor`` for keyset pagination.
+    """
     try:
-        logger.info(f"Listing propositions: limit={limit}, offset={offset}, confidence_min={confidence_min}, sort_by={sort_by}")
+        logger.info(f"Listing propositions: limit={limit}, offset={offset}, cursor={cursor}, confidence_min={confidence_min}, sort_by={sort_by}")
         
         # Get GUM instance
         gum_inst = await ensure_gum_instance(user_name)
@@ -1096,6 +1699,7 @@ async def list_propositions(
         # Query recent propositions from database
         async with gum_inst._session() as session:
             from gum.models import Proposition
+            from gum.db_utils import paginate_keyset, next_cursor
             from sqlalchemy import select, desc, asc
             
             stmt = select(Proposition)
@@ -1104,23 +1708,35 @@ async def list_propositions(
             if confidence_min is not None:
                 stmt = stmt.where(Proposition.confidence >= confidence_min)
             
-            # Apply sorting
+            # Apply sorting and pagination
             if sort_by == "confidence":
-                stmt = stmt.order_by(desc(Proposition.confidence))
-            elif sort_by == "created_at":
-                stmt = stmt.order_by(desc(Proposition.created_at))
+                if cursor:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Cursor pagination is only supported with sort_by=created_at"
+                    )
+                stmt = stmt.order_by(desc(Proposition.confidence)).limit(limit).offset(offset)
+                result = await session.execute(stmt)
+                propositions = result.scalars().all()
             else:
-                stmt = stmt.order_by(desc(Proposition.created_at))
-            
-            # Apply pagination
-            stmt = stmt.limit(limit).offset(offset)
-            
-            result = await session.execute(stmt)
-            propositions = result.scalars().all()
+                try:
+                    stmt = paginate_keyset(stmt, Proposition, cursor=cursor, limit=limit, backend=gum_inst.backend)
+                except ValueError as e:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+                if not cursor and offset:
+                    stmt = stmt.offset(offset)
+                
+                result = await session.execute(stmt)
+                rows = result.all()
+                propositions = [row[0] for row in rows]
+                
+                page_cursor = next_cursor(rows, limit)
+                if page_cursor:
+                    response.headers["X-Next-Cursor"] = page_cursor
             
-            response = []
+            response_items = []
             for prop in propositions:
-                response.append(PropositionResponse(
+                response_items.append(PropositionResponse(
                     id=prop.id,
                     text=prop.text,
                     reasoning=prop.reasoning,
@@ -1128,9 +1744,11 @@ async def list_propositions(
                     created_at=serialize_datetime(parse_datetime(prop.created_at))
                 ))
             
-            logger.info(f"Retrieved {len(response)} propositions")
-            return response
+            logger.info(f"Retrieved {len(response_items)} propositions")
+            return response_items
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing propositions: {e}")
         raise HTTPException(
@@ -1179,6 +1797,79 @@ async def get_propositions_count(
         )
 
 
+@app.get("/propositions/{proposition_id}/lineage", response_model=dict)
+async def get_proposition_lineage(
+    proposition_id: int,
+    user_name: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    include_descendants: bool = True
+):
+    """Get a proposition's revision lineage: ancestry, descendants, latest revision and revision group."""
+    try:
+        gum_inst = await ensure_gum_instance(user_name)
+        
+        async with gum_inst._session() as session:
+            from gum.models import Proposition
+            from gum.db_utils import (
+                get_latest_descendant,
+                get_proposition_ancestry,
+                get_proposition_descendants,
+                get_revision_group,
+            )
+            
+            from sqlalchemy import select
+            from sqlalchemy.orm import raiseload
+            
+            proposition = (await session.execute(
+                select(Proposition).where(Proposition.id == proposition_id).options(raiseload("*"))
+            )).scalar_one_or_none()
+            if proposition is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Proposition {proposition_id} not found"
+                )
+            
+            def _item(prop, depth=None) -> dict:
+                item = {
+                    "id": prop.id,
+                    "text": prop.text,
+                    "confidence": prop.confidence,
+                    "version": prop.version,
+                    "revision_group": prop.revision_group,
+                    "created_at": serialize_datetime(parse_datetime(prop.created_at)),
+                }
+                if depth is not None:
+                    item["depth"] = depth
+                return item
+            
+            ancestry = await get_proposition_ancestry(session, proposition_id, max_depth=max_depth)
+            descendants = (
+                await get_proposition_descendants(session, proposition_id, max_depth=max_depth)
+                if include_descendants else []
+            )
+            latest = await get_latest_descendant(session, proposition_id)
+            group = await get_revision_group(session, proposition.revision_group)
+            
+            return {
+                "proposition": _item(proposition),
+                "latest": _item(latest),
+                "is_latest": latest.id == proposition.id,
+                "ancestry": [_item(p, d) for p, d in ancestry],
+                "descendants": [_item(p, d) for p, d in descendants],
+                "revision_group": [_item(p) for p in group],
+                "timestamp": serialize_datetime(datetime.now(timezone.utc))
+            }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting proposition lineage: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting proposition lineage: {str(e)}"
+        )
+
+
 @app.get("/propositions/by-hour", response_model=dict)
 async def get_propositions_by_hour(
     user_name: Optional[str] = None,
@@ -2379,15 +3070,16 @@ async def process_and_store_in_gum(frame_results: List[dict], user_name: str, ob
     gum_start = time.time()
     
     try:
-        async with gum_semaphore:
-            gum_inst = await ensure_gum_instance(user_name)
+        async with gum_semaphore, gum_lease(user_name) as gum_inst:
             observer = APIObserver(observer_name)
             
-            # Process in batches to avoid overwhelming the database
+            # Process in batches to avoid overwhelming the database; frames in a
+            # batch run concurrently so the database writer can group-commit them
             batch_size = 5
             for i in range(0, len(frame_results), batch_size):
                 batch = frame_results[i:i + batch_size]
                 
+                handlers = []
                 for frame_result in batch:
                     if isinstance(frame_result, dict) and "analysis" in frame_result and "frame_number" in frame_result:
                         # Create update with frame analysis
@@ -2396,7 +3088,12 @@ async def process_and_store_in_gum(frame_results: List[dict], user_name: str, ob
                             content=update_content,
                             content_type="input_text"
                         )
-                        await gum_inst._default_handler(observer, update)
+                        handlers.append(gum_inst._default_handler(observer, update))
+                
+                results = await asyncio.gather(*handlers, return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        raise result
         
         gum_time = time.time() - gum_start
         logger.info(f"Stored {len(frame_results)} frame analyses in GUM in {gum_time:.2f}s")
@@ -2577,10 +3274,18 @@ async def startup_event():
     logger.info("    Text Tasks: Azure OpenAI")
     logger.info("    Vision Tasks: OpenRouter (Qwen Vision)")
     logger.info(" Hybrid AI configuration initialized")
+    await get_gum_pool().start()
     logger.info("GUM API Controller started successfully")
 
 
+async def shutdown_event():
+    """Shutdown event handler: close every pooled GUM instance."""
+    if gum_pool is not None:
+        await gum_pool.stop()
+
+
 app.add_event_handler("startup", startup_event)
+app.add_event_handler("shutdown", shutdown_event)
 
 
 def run_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
@@ -2937,19 +3642,26 @@ async def get_suggestions_health():
 
 @app.get("/suggestions/history", response_model=List[dict])
 async def get_suggestion_history(
+    response: Response,
     user_name: Optional[str] = None,
     limit: Optional[int] = 50,
     offset: Optional[int] = 0,
     delivered_only: Optional[bool] = None,
-    suggestion_type: Optional[str] = None  # NEW: Filter by "proactive" or "gumbo"
+    suggestion_type: Optional[str] = None,  # NEW: Filter by "proactive" or "gumbo"
+    cursor: Optional[str] = None
 ):
-    """Get historical suggestions from database, including both proactive and Gumbo suggestions."""
+    """Get historical suggestions from database, including both proactive and Gumbo suggestions.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` for keyset
+    pagination; ``offset`` is still honoured when no cursor is given.
+    """
     
     try:
         gum_inst = await ensure_gum_instance(user_name)
         
         async with gum_inst._session() as session:
             from sqlalchemy import text
+            from gum.db_utils import decode_cursor, encode_cursor
             
             # Use raw SQL to avoid ORM field mapping issues
             sql_query = """
@@ -2977,13 +3689,23 @@ async def get_suggestion_history(
                     sql_query += " AND category != :category"
                     params["category"] = "proactive"
             
-            sql_query += " ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
+            if cursor:
+                try:
+                    params["cursor_created_at"], params["cursor_id"] = decode_cursor(cursor, gum_inst.backend)
+                except ValueError as e:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+                sql_query += " AND (created_at, id) < (:cursor_created_at, :cursor_id)"
+            
+            sql_query += " ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :offset"
             params["limit"] = limit
-            params["offset"] = offset
+            params["offset"] = 0 if cursor else offset
             
             result = await session.execute(text(sql_query), params)
             rows = result.fetchall()
             
+            if rows and len(rows) >= limit:
+                response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+            
             # Build response from raw SQL results
             response_data = []
             for row in rows:
@@ -3020,6 +3742,8 @@ async def get_suggestion_history(
             
             return response_data
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting suggestion history: {e}")
         raise HTTPException(
@@ -3194,24 +3918,23 @@ async def clear_all_suggestions(user_name: Optional[str] = None):
     try:
         gum_inst = await ensure_gum_instance(user_name)
         
-        async with gum_inst._session() as session:
-            from gum.models import Suggestion
-            from sqlalchemy import delete
-            
-            # Delete all suggestions
-            delete_stmt = delete(Suggestion)
-            result = await session.execute(delete_stmt)
-            deleted_count = result.rowcount
-            
-            await session.commit()
-            
-            logger.info(f"Cleared {deleted_count} suggestions from database")
-            
-            return {
-                "message": f"Successfully cleared {deleted_count} suggestions",
-                "deleted_count": deleted_count,
-                "timestamp": serialize_datetime(datetime.now(timezone.utc))
-            }
+        from gum.models import Suggestion
+        from sqlalchemy import delete
+        
+        # Delete all suggestions
+        async def _clear(session):
+            result = await session.execute(delete(Suggestion))
+            return result.rowcount
+        
+        deleted_count = await gum_inst.writer.submit(_clear, label="controller.clear_suggestions")
+        
+        logger.info(f"Cleared {deleted_count} suggestions from database")
+        
+        return {
+            "message": f"Successfully cleared {deleted_count} suggestions",
+            "deleted_count": deleted_count,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
             
     except Exception as e:
         logger.error(f"Error clearing suggestions: {e}")
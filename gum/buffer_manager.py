@@ -4,6 +4,14 @@ Smart Data Bundling Buffer Manager
 This module implements a time-based buffering system that collects multiple frames/screenshots
 over time windows (5-10 minutes) and then sends them as batches to AI for analysis.
 This reduces API calls by 80%+ while improving accuracy through better context.
+
+Buffers are bounded by bytes as well as frame count: frames that would exceed
+the per-monitor or global memory budget are spilled to a memory-mapped segment
+file (see :mod:`gum.buffer_spill`) and read back without copying at flush.
+
+With a :class:`~gum.key_frames.KeyFrameConfig`, a flush hands the callback
+only the window's key frames (see :mod:`gum.key_frames`) instead of every
+buffered frame.
 """
 
 import asyncio
@@ -14,15 +22,39 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional, Callable, Any
 from datetime import datetime, timedelta
 
+from .buffer_spill import SpillRef, SpillStore
+from .key_frames import KeyFrameConfig, select_key_frames
+
 
 @dataclass
 class BufferedFrame:
     """Represents a single frame in the buffer."""
-    frame_data: str  # base64 encoded image
+    frame_data: str  # base64 encoded image ("" while spilled to disk, see image_data())
     timestamp: float
     event_type: str  # "move", "click", "scroll", "periodic"
     monitor_idx: int
     metadata: Dict[str, Any] = None
+    spill: Optional[SpillRef] = None
+
+    @property
+    def spilled(self) -> bool:
+        return self.spill is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the base64 image, wherever it is stored."""
+        return self.spill.length if self.spill is not None else len(self.frame_data)
+
+    def image_view(self):
+        """The base64 image without copying: the string, or a view into the spill segment."""
+        return self.spill.view() if self.spill is not None else self.frame_data
+
+    def image_data(self) -> str:
+        """The base64 image as a string (copied out of the spill segment if spilled)."""
+        if self.spill is None:
+            return self.frame_data
+        with self.spill.view() as view:
+            return str(view, "ascii")
 
 
 class BufferManager:
@@ -42,7 +74,11 @@ class BufferManager:
         max_buffer_size: int = 150,
         flush_on_activity: bool = True,
         activity_threshold: int = 3,
-        debug: bool = False
+        debug: bool = False,
+        max_buffer_bytes: Optional[int] = 32 * 1024 * 1024,
+        max_total_bytes: Optional[int] = 128 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        key_frames: Optional[KeyFrameConfig] = None,
     ):
         """
         Initialize the buffer manager.
@@ -53,6 +89,13 @@ class BufferManager:
             flush_on_activity: Whether to flush on significant activity (default: True)
             activity_threshold: Number of events to trigger activity-based flush (default: 3)
             debug: Enable debug logging (default: False)
+            max_buffer_bytes: In-memory image bytes per monitor before frames spill to disk
+                (default: 32 MiB, None for no limit)
+            max_total_bytes: In-memory image bytes across all monitors before frames spill
+                to disk (default: 128 MiB, None for no limit)
+            spill_dir: Directory for spill segment files (default: a temp directory)
+            key_frames: Reduce each flushed window to its key frames before calling the
+                flush callback (default: None, pass every frame)
         """
         self.buffer_minutes = buffer_minutes
         self.buffer_seconds = buffer_minutes * 60
@@ -66,6 +109,16 @@ class BufferManager:
         self.buffer_start_times: Dict[int, float] = {}  # monitor_idx -> start time
         self.buffer_timers: Dict[int, asyncio.TimerHandle] = {}
         
+        # Byte budgets and disk spill
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_total_bytes = max_total_bytes
+        self.resident_bytes: Dict[int, int] = {}  # monitor_idx -> in-memory image bytes
+        self.spill = SpillStore(spill_dir)
+        
+        # Key-frame selection on flush
+        self.key_frames = key_frames
+        self._key_frame_stats = {"windows": 0, "frames_in": 0, "frames_selected": 0}
+        
         # Activity tracking
         self.recent_events: Dict[int, int] = {}  # monitor_idx -> event count
         self.last_activity_flush: Dict[int, float] = {}
@@ -118,7 +171,7 @@ class BufferManager:
                 if self.debug:
                     self.logger.debug(f"Initialized buffer for monitor {monitor_idx}")
             
-            # Create buffered frame
+            # Create buffered frame, spilling it to disk if it would exceed a byte budget
             buffered_frame = BufferedFrame(
                 frame_data=frame_data,
                 timestamp=time.time(),
@@ -126,6 +179,13 @@ class BufferManager:
                 monitor_idx=monitor_idx,
                 metadata=metadata or {}
             )
+            if self._over_budget(monitor_idx, len(frame_data)):
+                buffered_frame.spill = self.spill.write(frame_data.encode("ascii"))
+                buffered_frame.frame_data = ""
+                if self.debug:
+                    self.logger.debug(f"Spilled frame for monitor {monitor_idx} to disk")
+            else:
+                self.resident_bytes[monitor_idx] = self.resident_bytes.get(monitor_idx, 0) + len(frame_data)
             
             # Add to buffer
             self.buffers[monitor_idx].append(buffered_frame)
@@ -157,6 +217,29 @@ class BufferManager:
             
             return True  # Frame was added to buffer
     
+    def _over_budget(self, monitor_idx: int, nbytes: int) -> bool:
+        """Whether keeping *nbytes* more in memory would exceed a byte budget."""
+        if self.max_buffer_bytes is not None and \
+                self.resident_bytes.get(monitor_idx, 0) + nbytes > self.max_buffer_bytes:
+            return True
+        return self.max_total_bytes is not None and \
+            sum(self.resident_bytes.values()) + nbytes > self.max_total_bytes
+
+    def _release_frames(self, monitor_idx: int, frames: List[BufferedFrame], keep_data: bool) -> None:
+        """Return flushed frames' bytes to the budget and free their spill space.
+
+        With *keep_data*, spilled frames are first copied back into ``frame_data``
+        so they stay readable for the caller.
+        """
+        for frame in frames:
+            if frame.spill is None:
+                self.resident_bytes[monitor_idx] -= len(frame.frame_data)
+                continue
+            if keep_data:
+                frame.frame_data = frame.image_data()
+            self.spill.release(frame.spill)
+            frame.spill = None
+
     def _schedule_buffer_timer(self, monitor_idx: int):
         """Schedule a timer to flush the buffer after the time window."""
         try:
@@ -226,12 +309,25 @@ class BufferManager:
         if self.debug:
             self.logger.debug(f"Flushed {len(frames)} frames from monitor {monitor_idx} buffer")
         
-        # Call flush callback if set
+        # Call flush callback if set; spilled frames are readable until it returns
         if self.on_flush_callback and frames:
             try:
-                await self.on_flush_callback(monitor_idx, frames)
+                selected = frames
+                if self.key_frames is not None:
+                    # hashing may decode JPEGs: keep it off the event loop
+                    selected = await asyncio.to_thread(select_key_frames, frames, self.key_frames)
+                    self._key_frame_stats["windows"] += 1
+                    self._key_frame_stats["frames_in"] += len(frames)
+                    self._key_frame_stats["frames_selected"] += len(selected)
+                    if self.debug:
+                        self.logger.debug(f"Selected {len(selected)} of {len(frames)} frames for monitor {monitor_idx}")
+                await self.on_flush_callback(monitor_idx, selected)
             except Exception as e:
                 self.logger.error(f"Error in flush callback: {e}")
+            finally:
+                self._release_frames(monitor_idx, frames, keep_data=False)
+        else:
+            self._release_frames(monitor_idx, frames, keep_data=True)
         
         return frames
     
@@ -256,48 +352,51 @@ class BufferManager:
             return all_flushed
     
     def get_buffer_status(self) -> Dict[str, Any]:
-        """Get the current status of all buffers."""
-        async def _get_status():
-            async with self._lock:
-                status = {
-                    "total_buffers": len(self.buffers),
-                    "total_frames": sum(len(buf) for buf in self.buffers.values()),
-                    "buffers": {}
-                }
-                
-                for monitor_idx, buffer in self.buffers.items():
-                    start_time = self.buffer_start_times.get(monitor_idx, 0)
-                    elapsed = time.time() - start_time if start_time else 0
-                    
-                    status["buffers"][monitor_idx] = {
-                        "frame_count": len(buffer),
-                        "elapsed_seconds": elapsed,
-                        "recent_events": self.recent_events.get(monitor_idx, 0),
-                        "has_timer": monitor_idx in self.buffer_timers and self.buffer_timers[monitor_idx] is not None
-                    }
-                
-                return status
+        """Get the current status of all buffers.
+
+        Buffers are only modified on the event loop and this reads them without
+        awaiting, so no lock is needed (blocking on the lock from the loop's own
+        thread would deadlock).
+        """
+        status = {
+            "total_buffers": len(self.buffers),
+            "total_frames": sum(len(buf) for buf in self.buffers.values()),
+            "resident_bytes": sum(self.resident_bytes.values()),
+            "max_total_bytes": self.max_total_bytes,
+            "spill": self.spill.get_stats(),
+            "key_frames": dict(self._key_frame_stats) if self.key_frames is not None else None,
+            "buffers": {}
+        }
         
-        # Run the async function in the current event loop
-        try:
-            loop = asyncio.get_running_loop()
-            return asyncio.run_coroutine_threadsafe(_get_status(), loop).result()
-        except RuntimeError:
-            # No event loop running, create a new one
-            return asyncio.run(_get_status())
+        for monitor_idx, buffer in self.buffers.items():
+            start_time = self.buffer_start_times.get(monitor_idx, 0)
+            elapsed = time.time() - start_time if start_time else 0
+            
+            status["buffers"][monitor_idx] = {
+                "frame_count": len(buffer),
+                "spilled_frames": sum(1 for frame in buffer if frame.spilled),
+                "resident_bytes": self.resident_bytes.get(monitor_idx, 0),
+                "elapsed_seconds": elapsed,
+                "recent_events": self.recent_events.get(monitor_idx, 0),
+                "has_timer": monitor_idx in self.buffer_timers and self.buffer_timers[monitor_idx] is not None
+            }
+        
+        return status
     
     async def cleanup(self):
         """Clean up resources and flush any remaining buffers."""
+        # Flush all buffers (takes the lock itself)
+        await self.flush_all_buffers()
+        
         async with self._lock:
-            # Cancel all timers
+            # Cancel all timers, including the ones the flushes rescheduled
             for timer in self.buffer_timers.values():
                 if timer:
                     timer.cancel()
             
-            # Flush all buffers
-            await self.flush_all_buffers()
-            
             # Clear all data
+            self.spill.close()
+            self.resident_bytes.clear()
             self.buffers.clear()
             self.buffer_start_times.clear()
             self.buffer_timers.clear()
@@ -325,7 +424,9 @@ def create_batch_prompt(frames: List[BufferedFrame], time_span_minutes: float) -
     
     for frame in frames:
         dt = datetime.fromtimestamp(frame.timestamp)
-        timestamps.append(f"{dt.strftime('%H:%M:%S')} ({frame.event_type})")
+        similar = (frame.metadata or {}).get("represents", 1) - 1
+        note = f", {similar} similar" if similar > 0 else ""
+        timestamps.append(f"{dt.strftime('%H:%M:%S')} ({frame.event_type}{note})")
         event_types.append(frame.event_type)
     
     # Count event types
@@ -379,7 +480,9 @@ def create_pillar_specific_prompt(frames: List[BufferedFrame], time_span_minutes
     
     for frame in frames:
         dt = datetime.fromtimestamp(frame.timestamp)
-        timestamps.append(f"{dt.strftime('%H:%M:%S')} ({frame.event_type})")
+        similar = (frame.metadata or {}).get("represents", 1) - 1
+        note = f", {similar} similar" if similar > 0 else ""
+        timestamps.append(f"{dt.strftime('%H:%M:%S')} ({frame.event_type}{note})")
         event_types.append(frame.event_type)
     
     # Count event types
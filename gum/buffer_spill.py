@@ -0,0 +1,168 @@
+"""
+Disk spill for BufferManager frames.
+
+Frames that would push a buffer past its memory budget are appended to a
+memory-mapped segment file instead of being kept as Python strings. A
+spilled frame is read back as a ``memoryview`` into the mapping, so no copy
+is made until a consumer actually needs the text (for instance only for the
+key frames that end up in a request).
+
+Segments are append-only. A segment is unmapped and deleted once every frame
+written to it has been released; the segment currently being appended to is
+rewound instead, so a steady capture session keeps reusing the same file
+and disk use stays bounded by the largest backlog.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Segment:
+    """One preallocated, memory-mapped segment file."""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        with open(path, "w+b") as fh:
+            fh.truncate(size)
+            self.map = mmap.mmap(fh.fileno(), size)
+        self.offset = 0
+        self.live = 0
+
+    def append(self, data: bytes) -> Optional[int]:
+        """Write *data* at the end; returns its offset, or None if it does not fit."""
+        if self.offset + len(data) > self.size:
+            return None
+        start = self.offset
+        self.map[start:start + len(data)] = data
+        self.offset += len(data)
+        self.live += 1
+        return start
+
+    def close(self) -> bool:
+        """Unmap and delete the file; False while views into it are still alive."""
+        try:
+            self.map.close()
+        except BufferError:
+            return False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        return True
+
+
+class SpillRef:
+    """Location of one spilled frame."""
+
+    __slots__ = ("segment", "offset", "length", "released")
+
+    def __init__(self, segment: _Segment, offset: int, length: int):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.released = False
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the spilled bytes; valid until the frame is released."""
+        if self.released:
+            raise ValueError("Spilled frame has been released")
+        return memoryview(self.segment.map)[self.offset:self.offset + self.length]
+
+
+class SpillStore:
+    """
+    Append-only, memory-mapped frame storage for over-budget buffer frames.
+
+    Not thread-safe; BufferManager only uses it from the event loop.
+    """
+
+    def __init__(self, directory: Optional[str] = None, segment_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Where segment files are created (default: a fresh temp directory)
+            segment_bytes: Size of each segment file; larger frames get their own segment
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._active: Optional[_Segment] = None
+        self._sealed: List[_Segment] = []
+        self._closing: List[_Segment] = []
+        self._counter = 0
+        self._stats = {"spilled_frames": 0, "spilled_bytes": 0, "segments_created": 0}
+
+    def _new_segment(self, min_size: int) -> _Segment:
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="gum-buffer-spill-")
+        os.makedirs(self.directory, exist_ok=True)
+        self._counter += 1
+        path = os.path.join(self.directory, f"segment-{os.getpid()}-{self._counter}.bin")
+        self._stats["segments_created"] += 1
+        return _Segment(path, max(self.segment_bytes, min_size))
+
+    def write(self, data: bytes) -> SpillRef:
+        """Append *data* and return where it went."""
+        offset = self._active.append(data) if self._active is not None else None
+        if offset is None:
+            if self._active is not None:
+                self._seal(self._active)
+            self._active = self._new_segment(len(data))
+            offset = self._active.append(data)
+        self._stats["spilled_frames"] += 1
+        self._stats["spilled_bytes"] += len(data)
+        return SpillRef(self._active, offset, len(data))
+
+    def release(self, ref: SpillRef) -> None:
+        """Mark a spilled frame as consumed; frees its segment when it was the last one."""
+        if ref.released:
+            return
+        ref.released = True
+        if self._closing:
+            self._retry_closing()
+        segment = ref.segment
+        segment.live -= 1
+        if segment.live > 0:
+            return
+        if segment is self._active:
+            segment.offset = 0  # rewind: reuse the mapped file for the next frames
+        else:
+            self._sealed.remove(segment)
+            self._retire(segment)
+
+    def _seal(self, segment: _Segment) -> None:
+        if segment.live == 0:
+            self._retire(segment)
+        else:
+            self._sealed.append(segment)
+
+    def _retire(self, segment: _Segment) -> None:
+        if not segment.close():
+            self._closing.append(segment)
+
+    def _retry_closing(self) -> None:
+        self._closing = [s for s in self._closing if not s.close()]
+
+    def close(self) -> None:
+        """Delete every segment (outstanding spilled frames become unreadable)."""
+        for segment in ([self._active] if self._active else []) + self._sealed + self._closing:
+            if not segment.close():
+                logger.warning(f"Spill segment {segment.path} still has live views; leaving it mapped")
+        self._active = None
+        self._sealed, self._closing = [], []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Spill counters and the segment files currently on disk."""
+        segments = ([self._active] if self._active else []) + self._sealed + self._closing
+        return {
+            **self._stats,
+            "segments": len(segments),
+            "disk_bytes": sum(s.size for s in segments),
+            "live_frames": sum(s.live for s in segments),
+        }
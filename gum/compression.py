@@ -0,0 +1,329 @@
+"""
+Observation Content Compression
+
+Screen transcriptions are multi-KB markdown blobs and make up most of a GUM
+database. Observations whose content is at least ``min_bytes`` long are
+stored compressed in ``observations.content`` (as a BLOB) with the codec
+recorded in ``observations.content_codec``:
+
+- ``zstd`` / ``zlib``: plain compression (zstd needs the ``zstandard``
+  package, ``pip install gum[compression]``; zlib is the fallback)
+- ``zstd:<id>`` / ``zlib:<id>``: compressed against trained dictionary
+  ``<id>`` from the ``content_dictionaries`` table. Screen transcriptions
+  repeat the same headings and UI chrome, so a dictionary trained on them
+  compresses small transcriptions much better than the codec alone.
+  Dictionary ids belong to one database, so loaded dictionaries are kept
+  in a :class:`DictionaryRegistry` per database file.
+
+``Observation.content`` decompresses lazily on first access. Inside SQLite
+the ``gum_content(content, codec)`` function does the same, so the FTS5
+triggers index the uncompressed text and raw SQL can read it; every GUM
+connection registers it (see :func:`register_sqlite_functions`), and other
+tools that write to ``observations`` must register it too.
+
+Only SQLite compresses: PostgreSQL already compresses large values through
+TOAST. Configure with ``GUM_CONTENT_COMPRESSION`` (``auto``, ``zstd``,
+``zlib`` or ``off``) and ``GUM_CONTENT_COMPRESSION_MIN_BYTES``.
+"""
+
+import os
+import threading
+import urllib.parse
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SQL_FUNCTION = "gum_content"
+CODECS = ("zstd", "zlib")
+_ZLIB_MAX_DICTIONARY = 32 * 1024  # zlib only looks back 32 KiB
+
+
+@dataclass
+class CompressionConfig:
+    """Configuration settings for observation content compression."""
+
+    codec: str = "auto"             # auto / zstd / zlib / off
+    min_bytes: int = 2048           # smaller content is stored as plain text
+    level: int = 6
+    dictionary_size: int = 64 * 1024
+    dictionary_samples: int = 500   # observations sampled to train a dictionary
+
+    @classmethod
+    def from_environment(cls) -> 'CompressionConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            codec=os.getenv('GUM_CONTENT_COMPRESSION', 'auto').lower(),
+            min_bytes=int(os.getenv('GUM_CONTENT_COMPRESSION_MIN_BYTES', 2048)),
+            level=int(os.getenv('GUM_CONTENT_COMPRESSION_LEVEL', 6)),
+            dictionary_size=int(os.getenv('GUM_CONTENT_DICTIONARY_SIZE', 64 * 1024)),
+            dictionary_samples=int(os.getenv('GUM_CONTENT_DICTIONARY_SAMPLES', 500)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.codec != "off"
+
+    def resolved_codec(self) -> str:
+        """The codec new content is compressed with."""
+        if self.codec == "auto":
+            return "zstd" if zstandard is not None else "zlib"
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown compression codec '{self.codec}'. Available: auto, off, {', '.join(CODECS)}")
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression needs the 'zstandard' package")
+        return self.codec
+
+
+_config: Optional[CompressionConfig] = None
+
+_registries: Dict[str, "DictionaryRegistry"] = {}
+_lock = threading.Lock()
+_totals = {"compressed": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+
+def get_compression_config() -> CompressionConfig:
+    """Process-wide compression configuration (from the environment on first use)."""
+    global _config
+    if _config is None:
+        _config = CompressionConfig.from_environment()
+    return _config
+
+
+def set_compression_config(config: CompressionConfig) -> None:
+    """Replace the process-wide compression configuration."""
+    global _config
+    _config = config
+
+
+# ─────────────────────────────── dictionaries
+class DictionaryRegistry:
+    """
+    Loaded compression dictionaries of one database.
+
+    Dictionary ids are ``content_dictionaries`` row ids, so they are only
+    meaningful within the database that stored them: every database has its
+    own registry (see :func:`dictionary_registry`).
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[str, bytes]] = {}
+        self._active: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def register(self, dictionary_id: int, codec: str, data: bytes, *, activate: bool = False) -> None:
+        """Make a stored dictionary available for decompression (and optionally new writes)."""
+        with self._lock:
+            self._entries[dictionary_id] = (codec, bytes(data))
+            if activate or self._active is None or dictionary_id > self._active:
+                self._active = dictionary_id
+
+    @property
+    def active(self) -> Optional[int]:
+        """Id of the dictionary new content is compressed against, if any."""
+        return self._active
+
+    def get(self, dictionary_id: int) -> Tuple[str, bytes]:
+        """``(codec, data)`` of a loaded dictionary.
+
+        Raises:
+            LookupError: If the dictionary is not loaded.
+        """
+        entry = self._entries.get(dictionary_id)
+        if entry is None:
+            raise LookupError(f"Compression dictionary {dictionary_id} is not loaded")
+        return entry
+
+
+def dictionary_registry(database: Optional[str]) -> DictionaryRegistry:
+    """The registry of the SQLite database at *database*.
+
+    *database* is a file path or ``file:`` URI; every spelling of the same
+    file shares one registry.
+    """
+    key = database or ":memory:"
+    registry = _registries.get(key)
+    if registry is not None:
+        return registry
+    path = key
+    if path.startswith("file:"):
+        path = urllib.parse.unquote(urllib.parse.urlsplit(path).path)
+    if path != ":memory:":
+        path = os.path.realpath(os.path.expanduser(path))
+    with _lock:
+        registry = _registries.setdefault(path, DictionaryRegistry())
+        _registries[key] = registry
+    return registry
+
+
+def train_dictionary(samples: List[str], codec: str, size: int) -> bytes:
+    """Train a compression dictionary from sample contents.
+
+    zstd uses its own trainer. zlib can only use a preset buffer of recent
+    history, so its dictionary is the most frequent lines of the samples,
+    most frequent last (closest to the data, cheapest to reference).
+
+    Raises:
+        ValueError: If there are too few samples to train on, or (zlib) no
+            line repeats across them.
+    """
+    encoded = [s.encode("utf-8") for s in samples if s]
+    if len(encoded) < 8:
+        raise ValueError(f"Need at least 8 samples to train a dictionary, got {len(encoded)}")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd dictionaries need the 'zstandard' package")
+        return zstandard.train_dictionary(size, encoded).as_bytes()
+
+    counts = Counter(
+        line for s in samples for line in set(s.splitlines(keepends=True)) if len(line.strip()) > 3
+    )
+    budget = min(size, _ZLIB_MAX_DICTIONARY)
+    picked: List[bytes] = []
+    for line, n in counts.most_common():
+        if n < 2:
+            break
+        chunk = line.encode("utf-8")
+        if len(chunk) > budget:
+            continue
+        picked.append(chunk)
+        budget -= len(chunk)
+    if not picked:
+        raise ValueError("No line repeats across the samples; nothing to build a dictionary from")
+    return b"".join(reversed(picked))
+
+
+# ─────────────────────────────── codecs
+def _split_codec(codec: str, dictionaries: Optional[DictionaryRegistry]) -> Tuple[str, Optional[bytes]]:
+    name, _, dict_id = codec.partition(":")
+    if not dict_id:
+        return name, None
+    if dictionaries is None:
+        raise LookupError(f"Compression dictionary {dict_id} needs the database's dictionary registry")
+    return name, dictionaries.get(int(dict_id))[1]
+
+
+def compress_content(
+    text: str,
+    config: Optional[CompressionConfig] = None,
+    dictionaries: Optional[DictionaryRegistry] = None,
+) -> Tuple[Any, Optional[str]]:
+    """Compress *text* if it is large enough.
+
+    Args:
+        text: Content to store
+        config: Compression configuration (defaults to the process-wide one)
+        dictionaries: Registry of the database the content is written to; its
+            active dictionary is used when it matches the codec
+
+    Returns:
+        ``(payload, codec)``: the compressed bytes and codec name, or the
+        original text and None when it stays uncompressed
+    """
+    config = config or get_compression_config()
+    raw = text.encode("utf-8")
+    if not config.enabled or len(raw) < config.min_bytes:
+        return text, None
+
+    name = config.resolved_codec()
+    dict_id = dictionaries.active if dictionaries is not None else None
+    if dict_id is not None and dictionaries.get(dict_id)[0] != name:
+        dict_id = None
+    codec = name if dict_id is None else f"{name}:{dict_id}"
+    _, dictionary = _split_codec(codec, dictionaries)
+
+    if name == "zstd":
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        payload = zstandard.ZstdCompressor(level=config.level, dict_data=zdict).compress(raw)
+    else:
+        compressor = (
+            zlib.compressobj(config.level, zdict=dictionary) if dictionary
+            else zlib.compressobj(config.level)
+        )
+        payload = compressor.compress(raw) + compressor.flush()
+
+    if len(payload) >= len(raw):  # incompressible
+        return text, None
+    with _lock:
+        _totals["compressed"] += 1
+        _totals["raw_bytes"] += len(raw)
+        _totals["stored_bytes"] += len(payload)
+    return payload, codec
+
+
+def decompress_content(
+    payload: Any,
+    codec: Optional[str],
+    dictionaries: Optional[DictionaryRegistry] = None,
+) -> Any:
+    """Inverse of :func:`compress_content`; plain text passes through.
+
+    *dictionaries* must be the registry of the database *payload* was read from.
+    """
+    if codec is None or payload is None:
+        return payload
+    name, dictionary = _split_codec(codec, dictionaries)
+    data = bytes(payload)
+    if name == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Content compressed with zstd needs the 'zstandard' package")
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        raw = zstandard.ZstdDecompressor(dict_data=zdict).decompressobj().decompress(data)
+    elif name == "zlib":
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        raw = decompressor.decompress(data) + decompressor.flush()
+    else:
+        raise ValueError(f"Unknown compression codec '{codec}'")
+    return raw.decode("utf-8")
+
+
+def compression_totals() -> Dict[str, Any]:
+    """Contents compressed by this process so far and their overall ratio."""
+    stored = _totals["stored_bytes"]
+    return {
+        **_totals,
+        "ratio": round(_totals["raw_bytes"] / stored, 3) if stored else None,
+    }
+
+
+# ─────────────────────────────── SQL integration
+def register_sqlite_functions(dbapi_conn, dictionaries: Optional[DictionaryRegistry] = None) -> None:
+    """Register ``gum_content(content, codec)`` on a SQLite DB-API connection.
+
+    *dictionaries* is the registry of the database the connection opens.
+    Works for both ``sqlite3`` and SQLAlchemy's ``aiosqlite`` adapter.
+    """
+    dbapi_conn.create_function(
+        SQL_FUNCTION, 2,
+        lambda payload, codec: decompress_content(payload, codec, dictionaries),
+        deterministic=True,
+    )
+
+
+class observation_text(GenericFunction):
+    """SQL expression for the uncompressed text of ``(content, codec)`` columns."""
+
+    type = Text()
+    inherit_cache = True
+    name = SQL_FUNCTION
+
+
+@compiles(observation_text, "postgresql")
+def _compile_observation_text_pg(element, compiler, **kw):
+    # content is never compressed on PostgreSQL
+    content, _codec = list(element.clauses)
+    return compiler.process(content, **kw)
+
+
+def sql_content(column: str = "content", codec_column: str = "content_codec") -> str:
+    """Raw-SQL spelling of :class:`observation_text` for SQLite statements."""
+    return f"{SQL_FUNCTION}({column}, {codec_column})"
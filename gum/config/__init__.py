@@ -0,0 +1,5 @@
+"""
+GUM Configuration Package
+
+Dataclass-based settings for the proactive engine and storage layer.
+"""
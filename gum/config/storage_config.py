@@ -0,0 +1,102 @@
+"""
+Storage Profile Configuration
+
+Named SQLite tuning profiles applied to every connection GUM opens. Each
+profile trades durability for ingest throughput differently:
+
+- ``durable``: ``synchronous=FULL`` and inline auto-checkpointing; every
+  commit survives power loss.
+- ``balanced`` (default): ``synchronous=NORMAL`` (a commit may be lost on
+  power loss but the database stays consistent), larger page cache, mmap
+  reads and checkpointing moved to a background task.
+- ``throughput``: ``synchronous=OFF``, large page size, cache and mmap. An
+  OS crash or power loss can lose or corrupt recent transactions; meant for
+  bulk imports and benchmarks.
+
+Select one with ``gum(storage_profile=...)`` or ``GUM_STORAGE_PROFILE``.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Union
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """SQLite pragmas and checkpoint policy for one storage profile."""
+
+    name: str
+    synchronous: str                    # FULL / NORMAL / OFF
+    cache_size_kib: int                 # page cache per connection
+    mmap_size_bytes: int                # 0 disables memory-mapped I/O
+    temp_store: str                     # DEFAULT / FILE / MEMORY
+    wal_autocheckpoint_pages: int       # 0 disables inline checkpoints
+    page_size: int                      # only applied when the database is created
+    checkpoint_interval_seconds: float  # background checkpoint cadence, 0 = none
+    checkpoint_truncate_bytes: int      # TRUNCATE the WAL once it grows past this
+
+    def connection_pragmas(self) -> List[str]:
+        """PRAGMA statements to run on every new connection."""
+        return [
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size=-{self.cache_size_kib}",
+            f"PRAGMA mmap_size={self.mmap_size_bytes}",
+            f"PRAGMA temp_store={self.temp_store}",
+            f"PRAGMA wal_autocheckpoint={self.wal_autocheckpoint_pages}",
+        ]
+
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    "durable": StorageProfile(
+        name="durable",
+        synchronous="FULL",
+        cache_size_kib=8 * 1024,
+        mmap_size_bytes=0,
+        temp_store="DEFAULT",
+        wal_autocheckpoint_pages=1000,
+        page_size=4096,
+        checkpoint_interval_seconds=0.0,
+        checkpoint_truncate_bytes=0,
+    ),
+    "balanced": StorageProfile(
+        name="balanced",
+        synchronous="NORMAL",
+        cache_size_kib=64 * 1024,
+        mmap_size_bytes=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint_pages=0,
+        page_size=4096,
+        checkpoint_interval_seconds=30.0,
+        checkpoint_truncate_bytes=64 * 1024 * 1024,
+    ),
+    "throughput": StorageProfile(
+        name="throughput",
+        synchronous="OFF",
+        cache_size_kib=256 * 1024,
+        mmap_size_bytes=1024 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint_pages=0,
+        page_size=8192,
+        checkpoint_interval_seconds=60.0,
+        checkpoint_truncate_bytes=256 * 1024 * 1024,
+    ),
+}
+
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+
+def get_storage_profile(profile: Union[str, StorageProfile, None] = None) -> StorageProfile:
+    """Resolve a profile name (or ``GUM_STORAGE_PROFILE``) to a :class:`StorageProfile`.
+
+    Raises:
+        ValueError: If the name is not a known profile.
+    """
+    if isinstance(profile, StorageProfile):
+        return profile
+    name = (profile or os.getenv('GUM_STORAGE_PROFILE', DEFAULT_STORAGE_PROFILE)).lower()
+    try:
+        return STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage profile '{name}'. Available: {', '.join(STORAGE_PROFILES)}"
+        ) from None
@@ -2,48 +2,192 @@
 
 from __future__ import annotations
 
+import base64
+import json
 import math
-import re
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, AsyncIterator, List, Optional, Sequence
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from sqlalchemy import (
-    MetaData,
+    Select,
+    String,
     Table,
     select,
+    literal,
     literal_column,
-    text,
     func,
+    tuple_,
+    type_coerce,
 )
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from .models import (
     Observation,
     Proposition,
+    Suggestion,
     proposition_parent,
     observation_proposition,
 )
+from .compression import observation_text
+from .storage import StorageBackend, build_fts_query, get_backend  # noqa: F401  (build_fts_query re-exported)
 
 # Constants
 K_DECAY = 2.0      # decay rate for recency adjustment
 LAMBDA = 0.5       # trade-off for MMR
 
-def build_fts_query(raw: str, mode: str = "OR") -> str:
-    tokens = re.findall(r"\w+", raw.lower())
-    if not tokens:
-        return ""
-    if mode == "PHRASE":
-        return f'"{" ".join(tokens)}"'
-    elif mode == "OR":
-        return " OR ".join(tokens)
-    else:  # implicit AND
-        return " ".join(tokens)
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    """Encode a ``(created_at, id)`` keyset position as an opaque cursor.
+
+    ``created_at`` is kept exactly as stored so that the next page compares
+    against the same representation the index holds.
+    """
+    payload = json.dumps([str(created_at), int(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _text_timestamps(backend: Optional[StorageBackend]) -> bool:
+    """Whether keyset positions compare ``created_at`` as its stored text.
+
+    SQLite stores timestamps as text, so the stored string is the exact key
+    the index holds; PostgreSQL compares typed ``timestamptz`` values.
+    """
+    return backend is None or backend.name == "sqlite"
+
+
+def decode_cursor(cursor: str, backend: Optional[StorageBackend] = None) -> tuple[Any, int]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    ``created_at`` comes back as the stored string on SQLite (the default)
+    and as a ``datetime`` on any other *backend*.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not _text_timestamps(backend):
+            return datetime.fromisoformat(str(created_at)), int(row_id)
+        return str(created_at), int(row_id)
+    except Exception as exc:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from exc
+
+
+def paginate_keyset(
+    stmt: Select,
+    model,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    backend: Optional[StorageBackend] = None,
+) -> Select:
+    """Apply ``(created_at, id) DESC`` keyset pagination to a select of *model*.
+
+    The raw ``created_at`` value is appended as an extra result column so the
+    caller can build the next cursor with :func:`next_cursor`; rows therefore
+    come back as ``(instance, created_at_raw)`` tuples.
+
+    Args:
+        stmt: Select over *model* (filters already applied).
+        model: ORM class with ``created_at`` and ``id`` columns.
+        cursor: Cursor returned for the previous page, if any.
+        limit: Page size.
+        backend: Storage backend of the session (SQLite when omitted).
+    """
+    if _text_timestamps(backend):
+        created = type_coerce(model.created_at, String)
+    else:
+        created = model.created_at
+    stmt = (
+        stmt.add_columns(created.label("cursor_created_at"))
+        .order_by(model.created_at.desc(), model.id.desc())
+    )
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, backend)
+        stmt = stmt.where(tuple_(created, model.id) < tuple_(
+            literal(created_at, created.type), literal(row_id, model.id.type)
+        ))
+    return stmt.limit(limit)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """Return the cursor for the page after *rows*, or None on the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    obj, created_raw = rows[-1][0], rows[-1][-1]
+    return encode_cursor(created_raw, obj.id)
+
+
+# Tables that may be bulk-exported, by public name
+EXPORT_TABLES: dict[str, Table] = {
+    "observations": Observation.__table__,
+    "propositions": Proposition.__table__,
+    "suggestions": Suggestion.__table__,
+    "observation_proposition": observation_proposition,
+    "proposition_parent": proposition_parent,
+}
+
+
+def export_columns(table: Table) -> list:
+    """Column expressions exported for *table*, in export order.
+
+    Observation content is exported as text: compressed payloads are decoded
+    in SQL and ``content_codec`` is left out, so an export can be read
+    without the ``content_dictionaries`` table.
+    """
+    if table is not Observation.__table__:
+        return list(table.columns)
+    return [
+        observation_text(table.c.content, table.c.content_codec).label("content")
+        if column.name == "content" else column
+        for column in table.columns
+        if column.name != "content_codec"
+    ]
+
+
+async def stream_table(
+    session: AsyncSession,
+    table: Table,
+    *,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[list[tuple]]:
+    """Yield every row of *table* in ``batch_size`` chunks from a server-side cursor.
+
+    Rows are plain tuples in :func:`export_columns` order (no ORM identity
+    map), so memory stays bounded by one batch regardless of table size.
+
+    Args:
+        session: Open session; the cursor lives as long as its transaction.
+        table: Table to export (see :data:`EXPORT_TABLES`).
+        start_time: Only rows created at or after this time.
+        end_time: Only rows created at or before this time.
+        batch_size: Rows fetched per round trip.
+
+    Raises:
+        ValueError: If a time filter is given for a table without ``created_at``.
+    """
+    stmt = select(*export_columns(table))
+    if start_time is not None or end_time is not None:
+        if "created_at" not in table.c:
+            raise ValueError(f"Table {table.name} has no created_at column to filter on")
+        if start_time is not None:
+            stmt = stmt.where(table.c.created_at >= start_time.astimezone(timezone.utc).replace(tzinfo=None))
+        if end_time is not None:
+            stmt = stmt.where(table.c.created_at <= end_time.astimezone(timezone.utc).replace(tzinfo=None))
+    stmt = stmt.order_by(*table.primary_key.columns)
+
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        yield [tuple(row) for row in partition]
+
 
 def _has_child_subquery() -> select:
     return (
@@ -67,7 +211,8 @@ async def search_propositions_bm25(
     enable_mmr: bool = True,
 ) -> list[tuple["Proposition", float]]:
 
-    q = build_fts_query(user_query, mode)
+    backend = get_backend(session)
+    q = backend.build_search_query(user_query, mode)
     has_query = bool(q)
 
     # --------------------------------------------------------
@@ -77,74 +222,32 @@ async def search_propositions_bm25(
     has_child      = _has_child_subquery()
 
     if has_query:
-        fts_prop = Table("propositions_fts", MetaData())
+        # scores come from the storage backend: lower is better (bm25 convention)
+        sub_p = backend.proposition_scores()
 
         if include_observations:
             # --- 1-a-1  WITH observations --------------------
-            fts_obs  = Table("observations_fts", MetaData())
-
-            bm25_p   = literal_column("bm25(propositions_fts)").label("score")
-            bm25_o   = literal_column("bm25(observations_fts)").label("score")
-
-            sub_p = (
-                select(Proposition.id.label("pid"), bm25_p)
-                .select_from(
-                    fts_prop.join(
-                        Proposition,
-                        literal_column("propositions_fts.rowid") == Proposition.id,
-                    )
-                )
-                .where(text("propositions_fts MATCH :q"))
-            )
-
-            sub_o = (
-                select(observation_proposition.c.proposition_id.label("pid"), bm25_o)
-                .select_from(
-                    fts_obs
-                    .join(
-                        Observation,
-                        literal_column("observations_fts.rowid") == Observation.id,
-                    )
-                    .join(
-                        observation_proposition,
-                        observation_proposition.c.observation_id == Observation.id,
-                    )
-                )
-                .where(text("observations_fts MATCH :q"))
-            )
+            sub_o = backend.observation_scores()
 
             union_sub = sub_p.union_all(sub_o).subquery()
 
             best_scores = (
                 select(
                     union_sub.c.pid,
-                    func.min(union_sub.c.score).label("bm25"),
+                    func.min(union_sub.c.score).label("score"),
                 )
                 .group_by(union_sub.c.pid)
                 .subquery()
             )
         else:
             # --- 1-a-2  WITHOUT observations -----------------
-            best_scores = (
-                select(
-                    Proposition.id.label("pid"),
-                    literal_column("bm25(propositions_fts)").label("bm25"),
-                )
-                .select_from(
-                    fts_prop.join(
-                        Proposition,
-                        literal_column("propositions_fts.rowid") == Proposition.id,
-                    )
-                )
-                .where(text("propositions_fts MATCH :q"))
-                .subquery()
-            )
+            best_scores = sub_p.subquery()
 
         stmt = (
-            select(Proposition, best_scores.c.bm25)
+            select(Proposition, best_scores.c.score)
             .join(best_scores, best_scores.c.pid == Proposition.id)
             .where(~has_child)
-            .order_by(best_scores.c.bm25.asc())          # smallest→best
+            .order_by(best_scores.c.score.asc())          # smallest→best
         )
     else:
         # --- 1-b  No user query ------------------------------
@@ -254,4 +357,115 @@ async def get_related_observations(
         .limit(limit)
     )
     result = await session.execute(stmt)
-    return result.scalars().all()
\ No newline at end of file
+    return result.scalars().all()
+
+# ------------------------------------------------------------
+# Revision lineage (recursive CTEs over proposition_parent)
+# ------------------------------------------------------------
+
+def _lineage_cte(proposition_id: int, direction: str, max_depth: int | None = None):
+    """Recursive CTE of ``(id, depth)`` reachable from *proposition_id*.
+
+    ``direction`` is ``"ancestors"`` (child → parent edges) or
+    ``"descendants"`` (parent → child edges). The seed row is the
+    proposition itself at depth 0. Revisions form a DAG (a revision can have
+    several parents), so ``UNION`` de-duplicates rows reached along
+    different paths; callers take ``min(depth)`` per id.
+    """
+    if direction == "ancestors":
+        near, far = proposition_parent.c.child_id, proposition_parent.c.parent_id
+    else:
+        near, far = proposition_parent.c.parent_id, proposition_parent.c.child_id
+
+    lineage = select(
+        literal(proposition_id).label("id"), literal(0).label("depth")
+    ).cte(f"{direction}_cte", recursive=True)
+
+    step = (
+        select(far.label("id"), (lineage.c.depth + 1).label("depth"))
+        .join(lineage, near == lineage.c.id)
+    )
+    if max_depth is not None:
+        step = step.where(lineage.c.depth < max_depth)
+    return lineage.union(step)
+
+
+async def _lineage(
+    session: AsyncSession,
+    proposition_id: int,
+    direction: str,
+    max_depth: int | None,
+) -> list[tuple[Proposition, int]]:
+    lineage = _lineage_cte(proposition_id, direction, max_depth)
+    depths = (
+        select(lineage.c.id, func.min(lineage.c.depth).label("depth"))
+        .where(lineage.c.depth > 0)
+        .group_by(lineage.c.id)
+        .subquery()
+    )
+    stmt = (
+        select(Proposition, depths.c.depth)
+        .join(depths, depths.c.id == Proposition.id)
+        .order_by(depths.c.depth, Proposition.id)
+        .options(raiseload("*"))
+    )
+    return [(prop, depth) for prop, depth in (await session.execute(stmt)).all()]
+
+
+async def get_proposition_ancestry(
+    session: AsyncSession,
+    proposition_id: int,
+    *,
+    max_depth: int | None = None,
+) -> list[tuple[Proposition, int]]:
+    """Every revision *proposition_id* was derived from, in one query.
+
+    Returns ``(proposition, depth)`` pairs, nearest first (parents are depth
+    1). Relationships on the returned objects are not loaded.
+    """
+    return await _lineage(session, proposition_id, "ancestors", max_depth)
+
+
+async def get_proposition_descendants(
+    session: AsyncSession,
+    proposition_id: int,
+    *,
+    max_depth: int | None = None,
+) -> list[tuple[Proposition, int]]:
+    """Every revision derived from *proposition_id*, in one query (children are depth 1)."""
+    return await _lineage(session, proposition_id, "descendants", max_depth)
+
+
+async def get_latest_descendant(
+    session: AsyncSession,
+    proposition_id: int,
+) -> Optional[Proposition]:
+    """The current revision of *proposition_id*: its newest descendant without children.
+
+    Returns the proposition itself if it has not been revised, or None if it
+    does not exist.
+    """
+    lineage = _lineage_cte(proposition_id, "descendants")
+    stmt = (
+        select(Proposition)
+        .join(lineage, lineage.c.id == Proposition.id)
+        .where(~_has_child_subquery())
+        .order_by(Proposition.version.desc(), Proposition.created_at.desc(), Proposition.id.desc())
+        .limit(1)
+        .options(raiseload("*"))
+    )
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def get_revision_group(
+    session: AsyncSession,
+    revision_group: str,
+) -> list[Proposition]:
+    """All members of a revision group, oldest version first."""
+    stmt = (
+        select(Proposition)
+        .where(Proposition.revision_group == revision_group)
+        .order_by(Proposition.version, Proposition.id)
+        .options(raiseload("*"))
+    )
+    return list((await session.execute(stmt)).scalars().all())
@@ -0,0 +1,171 @@
+"""
+Key-frame selection for BufferManager flushes.
+
+A buffer window of several minutes can hold dozens of frames of the same
+screen (typing in one editor, scrolling one page). Sending all of them
+makes batch prompts large without telling the model anything new.
+:func:`select_key_frames` reduces a window to a few frames:
+
+1. Frames are clustered by perceptual hash (a difference hash of a small
+   grayscale view): frames within ``max_distance`` of a cluster's first
+   frame show the same screen.
+2. Each cluster is represented by its most informative frame, the one with
+   the highest change score (then the largest encoded image).
+3. Event-boundary frames are kept so the timeline stays readable: the first
+   and last frame of the window, the first frame after an idle gap, and
+   the first frame after every switch to a different screen.
+4. Candidates are taken in priority order (window ends, cluster
+   representatives by cluster size, then the other boundaries) until the
+   image count or byte budget is used up, and returned in chronological
+   order.
+
+Selected frames are annotated with ``metadata["represents"]``, the number of
+window frames of the same screen they stand for (each frame counts towards
+the selected frame of its cluster nearest in time), and
+``metadata["window_frames"]``.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class KeyFrameConfig:
+    """How a flushed window is reduced to key frames."""
+
+    max_frames: int = 8                 # images per batch request
+    max_bytes: Optional[int] = None     # encoded bytes per batch request, None for no limit
+    hash_size: int = 16                 # hash grid side; the hash has hash_size ** 2 bits
+    max_distance: float = 0.12          # share of differing hash bits still "the same screen"
+    boundary_gap_sec: float = 60.0      # idle time after which the next frame starts a new segment
+
+
+def dhash(gray: np.ndarray, hash_size: int = 16) -> int:
+    """Difference hash of a grayscale image: one bit per horizontally adjacent pixel pair."""
+    image = Image.fromarray(np.asarray(gray, dtype=np.uint8))
+    small = np.asarray(image.resize((hash_size + 1, hash_size), Image.BOX), dtype=np.int16)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_image_data(data: Any, hash_size: int = 16) -> Optional[int]:
+    """Difference hash of a base64 JPEG (``str`` or bytes-like), or None if it cannot be decoded."""
+    try:
+        image = Image.open(io.BytesIO(base64.b64decode(data)))
+        image.draft("L", (hash_size * 8, hash_size * 8))  # decode at reduced scale
+        return dhash(np.asarray(image.convert("L")), hash_size)
+    except Exception as e:
+        logger.debug(f"Could not hash frame image: {e}")
+        return None
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _frame_hash(frame: Any, hash_size: int) -> Optional[int]:
+    value = (frame.metadata or {}).get("phash")
+    if value is not None:
+        return value
+    return hash_image_data(frame.image_view(), hash_size)
+
+
+def cluster_frames(hashes: Sequence[Optional[int]], max_bits: int) -> List[int]:
+    """Cluster id of each frame; a frame joins the nearest cluster within *max_bits* of its leader."""
+    leaders: List[int] = []
+    clusters: List[int] = []
+    for value in hashes:
+        best, best_distance = None, max_bits + 1
+        if value is not None:
+            for cid, leader in enumerate(leaders):
+                if leader is None:
+                    continue
+                distance = hamming(value, leader)
+                if distance < best_distance:
+                    best, best_distance = cid, distance
+        if best is None:
+            leaders.append(value)  # unhashable frames always form their own cluster
+            best = len(leaders) - 1
+        clusters.append(best)
+    return clusters
+
+
+def select_key_frames(frames: List[Any], config: Optional[KeyFrameConfig] = None) -> List[Any]:
+    """
+    Pick the frames worth sending from a flushed buffer window.
+
+    Args:
+        frames: Flushed :class:`~gum.buffer_manager.BufferedFrame` objects, oldest first
+        config: Budget and clustering settings
+
+    Returns:
+        List: The selected frames in chronological order
+    """
+    config = config or KeyFrameConfig()
+    if not frames:
+        return []
+    n = len(frames)
+    clusters = cluster_frames(
+        [_frame_hash(f, config.hash_size) for f in frames],
+        int(config.max_distance * config.hash_size ** 2),
+    )
+    sizes: Dict[int, int] = {}
+    for cid in clusters:
+        sizes[cid] = sizes.get(cid, 0) + 1
+
+    def informativeness(i: int):
+        score = (frames[i].metadata or {}).get("score")
+        return (float("inf") if score is None else score, frames[i].nbytes)
+
+    representatives: Dict[int, int] = {}
+    for i, cid in enumerate(clusters):
+        if cid not in representatives or informativeness(i) > informativeness(representatives[cid]):
+            representatives[cid] = i
+
+    boundaries = [
+        i for i in range(1, n - 1)
+        if frames[i].timestamp - frames[i - 1].timestamp >= config.boundary_gap_sec
+        or clusters[i] != clusters[i - 1]
+    ]
+    ranked_reps = sorted(
+        representatives.items(), key=lambda item: (sizes[item[0]], informativeness(item[1])), reverse=True
+    )
+    candidates = [n - 1, 0] + [i for _, i in ranked_reps] + boundaries
+
+    keep: List[int] = []
+    used = 0
+    for i in candidates:
+        if i in keep or len(keep) >= max(1, config.max_frames):
+            continue
+        size = frames[i].nbytes
+        if keep and config.max_bytes is not None and used + size > config.max_bytes:
+            continue
+        keep.append(i)
+        used += size
+
+    keep.sort()
+    represents = dict.fromkeys(keep, 0)
+    for i, cid in enumerate(clusters):
+        members = [k for k in keep if clusters[k] == cid]
+        if members:
+            represents[min(members, key=lambda k: abs(k - i))] += 1
+
+    selected = []
+    for i in keep:
+        frame = frames[i]
+        if frame.metadata is None:
+            frame.metadata = {}
+        frame.metadata["represents"] = represents[i]
+        frame.metadata["window_frames"] = n
+        selected.append(frame)
+    return selected
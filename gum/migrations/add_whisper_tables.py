@@ -3,15 +3,29 @@ Database migration to add WHISPER tables.
 
 This migration adds the new WHISPER reasoning chain tables alongside
 existing tables without breaking any existing functionality.
+
+``db_path`` may be a SQLite file path or any database URL supported by
+:mod:`gum.storage` (e.g. ``postgresql+asyncpg://...``).
 """
 
 import asyncio
 import logging
 from datetime import datetime, timezone
 
+from sqlalchemy import inspect, text
+
+from gum.storage import StorageBackend, get_backend, resolve_database_url
+
 logger = logging.getLogger(__name__)
 
 
+def _connect(db_path: str):
+    """Engine and storage backend for a database path or URL."""
+    url = resolve_database_url(db_path)
+    backend = get_backend(url)
+    return backend.create_engine(url), backend
+
+
 async def migrate_to_whisper_schema(db_path: str = "gum.db"):
     """
     Add WHISPER tables to existing database schema.
@@ -19,20 +33,21 @@ async def migrate_to_whisper_schema(db_path: str = "gum.db"):
     This migration is safe to run multiple times and won't affect existing data.
     """
     try:
-        import aiosqlite
-
-        async with aiosqlite.connect(db_path) as db:
-            # Enable WAL mode for better concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=30000")
-
-            # Create WHISPER tables
-            await create_whisper_tables(db)
-
-            # Create indexes for performance
-            await create_whisper_indexes(db)
-
-            await db.commit()
+        engine, backend = _connect(db_path)
+        try:
+            async with engine.begin() as db:
+                if backend.embedded:
+                    # Enable WAL mode for better concurrent access
+                    await db.execute(text("PRAGMA journal_mode=WAL"))
+                    await db.execute(text("PRAGMA busy_timeout=30000"))
+
+                # Create WHISPER tables
+                await create_whisper_tables(db, backend)
+
+                # Create indexes for performance
+                await create_whisper_indexes(db)
+        finally:
+            await engine.dispose()
 
         logger.info("✅ WHISPER database migration completed successfully")
         return True
@@ -42,11 +57,12 @@ async def migrate_to_whisper_schema(db_path: str = "gum.db"):
         return False
 
 
-async def create_whisper_tables(db):
+async def create_whisper_tables(db, backend: StorageBackend):
     """Create all WHISPER-related tables."""
+    pk = backend.autoincrement_pk
 
     # Session tracking table
-    await db.execute("""
+    await db.execute(text("""
         CREATE TABLE IF NOT EXISTS whisper_sessions (
             id TEXT PRIMARY KEY,
             trigger_proposition_id INTEGER REFERENCES propositions(id),
@@ -55,12 +71,12 @@ async def create_whisper_tables(db):
             session_status TEXT DEFAULT 'in_progress',
             FOREIGN KEY (trigger_proposition_id) REFERENCES propositions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Scenario understanding table
-    await db.execute("""
+    await db.execute(text(f"""
         CREATE TABLE IF NOT EXISTS scenario_understandings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id {pk},
             session_id TEXT REFERENCES whisper_sessions(id),
             current_activity TEXT,
             immediate_context TEXT,
@@ -71,12 +87,12 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Goal reasoning table
-    await db.execute("""
+    await db.execute(text(f"""
         CREATE TABLE IF NOT EXISTS goal_reasonings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id {pk},
             session_id TEXT REFERENCES whisper_sessions(id),
             primary_goal TEXT,
             secondary_goals TEXT,  -- JSON array
@@ -89,12 +105,12 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Next move prediction table
-    await db.execute("""
+    await db.execute(text(f"""
         CREATE TABLE IF NOT EXISTS next_move_predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id {pk},
             session_id TEXT REFERENCES whisper_sessions(id),
             predicted_action TEXT,
             useful_preparation TEXT,
@@ -107,12 +123,12 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Delivery strategy table
-    await db.execute("""
+    await db.execute(text(f"""
         CREATE TABLE IF NOT EXISTS delivery_strategies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id {pk},
             session_id TEXT REFERENCES whisper_sessions(id),
             delivery_type TEXT,
             message TEXT,
@@ -128,12 +144,12 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Prepared content table
-    await db.execute("""
+    await db.execute(text(f"""
         CREATE TABLE IF NOT EXISTS prepared_contents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id {pk},
             session_id TEXT REFERENCES whisper_sessions(id),
             content TEXT,
             content_type TEXT,
@@ -148,10 +164,10 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     # Whisper UI data table
-    await db.execute("""
+    await db.execute(text("""
         CREATE TABLE IF NOT EXISTS whisper_ui_data (
             id TEXT PRIMARY KEY,
             session_id TEXT REFERENCES whisper_sessions(id),
@@ -172,7 +188,7 @@ async def create_whisper_tables(db):
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES whisper_sessions(id) ON DELETE CASCADE
         )
-    """)
+    """))
 
     logger.info("Created all WHISPER tables")
 
@@ -181,21 +197,21 @@ async def create_whisper_indexes(db):
     """Create indexes for WHISPER table performance."""
 
     # Session indexes
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_proposition ON whisper_sessions(trigger_proposition_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_status ON whisper_sessions(session_status)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_created ON whisper_sessions(created_at)")
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_proposition ON whisper_sessions(trigger_proposition_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_status ON whisper_sessions(session_status)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_whisper_sessions_created ON whisper_sessions(created_at)"))
 
     # Foreign key indexes for performance
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_scenario_session ON scenario_understandings(session_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_goals_session ON goal_reasonings(session_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_prediction_session ON next_move_predictions(session_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_strategy_session ON delivery_strategies(session_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_content_session ON prepared_contents(session_id)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_ui_session ON whisper_ui_data(session_id)")
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_scenario_session ON scenario_understandings(session_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_goals_session ON goal_reasonings(session_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_prediction_session ON next_move_predictions(session_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_strategy_session ON delivery_strategies(session_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_content_session ON prepared_contents(session_id)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_ui_session ON whisper_ui_data(session_id)"))
 
     # UI data indexes
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_ui_delivered ON whisper_ui_data(delivered)")
-    await db.execute("CREATE INDEX IF NOT EXISTS idx_ui_interaction ON whisper_ui_data(user_interaction)")
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_ui_delivered ON whisper_ui_data(delivered)"))
+    await db.execute(text("CREATE INDEX IF NOT EXISTS idx_ui_interaction ON whisper_ui_data(user_interaction)"))
 
     logger.info("Created WHISPER performance indexes")
 
@@ -203,35 +219,35 @@ async def create_whisper_indexes(db):
 async def verify_migration(db_path: str = "gum.db"):
     """Verify that WHISPER tables were created successfully."""
     try:
-        import aiosqlite
-
-        async with aiosqlite.connect(db_path) as db:
-            # Check if all tables exist
-            tables = [
-                'whisper_sessions',
-                'scenario_understandings',
-                'goal_reasonings',
-                'next_move_predictions',
-                'delivery_strategies',
-                'prepared_contents',
-                'whisper_ui_data'
-            ]
-
-            for table in tables:
-                result = await db.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
-                if not await result.fetchone():
-                    logger.error(f"❌ Table {table} was not created")
-                    return False
-
-            # Count existing data to ensure nothing was lost
-            result = await db.execute("SELECT COUNT(*) FROM propositions")
-            prop_count = (await result.fetchone())[0]
-
-            result = await db.execute("SELECT COUNT(*) FROM observations")
-            obs_count = (await result.fetchone())[0]
-
-            logger.info(f"✅ Migration verified: {prop_count} propositions, {obs_count} observations preserved")
-            return True
+        engine, _ = _connect(db_path)
+        try:
+            async with engine.connect() as db:
+                existing = set(await db.run_sync(lambda conn: inspect(conn).get_table_names()))
+
+                # Check if all tables exist
+                tables = [
+                    'whisper_sessions',
+                    'scenario_understandings',
+                    'goal_reasonings',
+                    'next_move_predictions',
+                    'delivery_strategies',
+                    'prepared_contents',
+                    'whisper_ui_data'
+                ]
+
+                for table in tables:
+                    if table not in existing:
+                        logger.error(f"❌ Table {table} was not created")
+                        return False
+
+                # Count existing data to ensure nothing was lost
+                prop_count = (await db.execute(text("SELECT COUNT(*) FROM propositions"))).scalar()
+                obs_count = (await db.execute(text("SELECT COUNT(*) FROM observations"))).scalar()
+        finally:
+            await engine.dispose()
+
+        logger.info(f"✅ Migration verified: {prop_count} propositions, {obs_count} observations preserved")
+        return True
 
     except Exception as e:
         logger.error(f"❌ Migration verification failed: {e}")
@@ -241,9 +257,8 @@ async def verify_migration(db_path: str = "gum.db"):
 async def rollback_whisper_migration(db_path: str = "gum.db"):
     """Rollback WHISPER migration by dropping new tables."""
     try:
-        import aiosqlite
-
-        async with aiosqlite.connect(db_path) as db:
+        engine, _ = _connect(db_path)
+        try:
             tables = [
                 'whisper_ui_data',
                 'prepared_contents',
@@ -255,13 +270,15 @@ async def rollback_whisper_migration(db_path: str = "gum.db"):
             ]
 
             for table in tables:
+                # one transaction per table so a failed drop doesn't abort the rest
                 try:
-                    await db.execute(f"DROP TABLE IF EXISTS {table}")
+                    async with engine.begin() as db:
+                        await db.execute(text(f"DROP TABLE IF EXISTS {table}"))
                     logger.info(f"Dropped table {table}")
                 except Exception as e:
                     logger.warning(f"Could not drop table {table}: {e}")
-
-            await db.commit()
+        finally:
+            await engine.dispose()
 
         logger.info("✅ WHISPER migration rolled back successfully")
         return True
@@ -276,7 +293,7 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="WHISPER Database Migration")
-    parser.add_argument("--db-path", default="gum.db", help="Path to database file")
+    parser.add_argument("--db-path", default="gum.db", help="Path to database file or database URL")
     parser.add_argument("--rollback", action="store_true", help="Rollback migration instead of applying")
     parser.add_argument("--verify", action="store_true", help="Only verify migration status")
 
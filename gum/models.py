@@ -3,20 +3,29 @@
 from __future__ import annotations
 
 import pathlib
-from typing import Optional
+from typing import Optional, Union
 
 from sqlalchemy import (
     Boolean,
+    LargeBinary,
+    Delete,
+    Insert,
+    TextClause,
+    Update,
+    event,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
+    inspect,
     text as sql_text,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncEngine,
@@ -26,11 +35,24 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
+    Session,
     mapped_column,
     relationship,
 )
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.sql import func
 
+from .compression import (
+    DictionaryRegistry,
+    compress_content,
+    decompress_content,
+    dictionary_registry,
+    observation_text,
+    register_sqlite_functions,
+    sql_content,
+)
+from .config.storage_config import StorageProfile, get_storage_profile
+
 class Base(AsyncAttrs, DeclarativeBase):
     """Base class for all database models.
     
@@ -71,6 +93,8 @@ proposition_parent = Table(
         ForeignKey("propositions.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # the primary key covers child → parent walks; this one parent → child
+    Index("ix_proposition_parent_parent_id", "parent_id"),
 )
 
 
@@ -80,20 +104,29 @@ class Observation(Base):
     This model stores observations made by various observers about user behavior,
     including the content of the observation and metadata about when and how it was made.
 
+    Large content is stored compressed on SQLite (see :mod:`gum.compression`);
+    ``content`` decompresses it on first access and, in queries, compiles to
+    the uncompressed text.
+
     Attributes:
         id (int): Primary key for the observation.
         observer_name (str): Name of the observer that made this observation.
         content (str): The actual content of the observation.
+        content_codec (Optional[str]): Codec the stored content is compressed with, None if plain.
         content_type (str): Type of content (e.g., 'text', 'image', etc.).
         created_at (datetime): When the observation was created.
         updated_at (datetime): When the observation was last updated.
         propositions (set[Proposition]): Set of propositions related to this observation.
     """
     __tablename__ = "observations"
+    __table_args__ = (
+        Index("ix_observations_created_at_id", "created_at", "id"),
+    )
 
     id:            Mapped[int]   = mapped_column(primary_key=True)
     observer_name: Mapped[str]   = mapped_column(String(100), nullable=False)
-    content:       Mapped[str]   = mapped_column(Text,        nullable=False)
+    _content:      Mapped[str]   = mapped_column("content", Text, nullable=False)
+    content_codec: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     content_type:  Mapped[str]   = mapped_column(String(50),  nullable=False)
 
     created_at:    Mapped[str]   = mapped_column(
@@ -115,6 +148,28 @@ class Observation(Base):
         lazy="selectin",
     )
 
+    @hybrid_property
+    def content(self) -> str:
+        """The uncompressed content, decompressed once per loaded value."""
+        payload = self._content
+        cached = self.__dict__.get("_content_cache")
+        if cached is not None and cached[0] is payload:
+            return cached[1]
+        text = decompress_content(payload, self.content_codec, self.__dict__.get("_dictionaries"))
+        self.__dict__["_content_cache"] = (payload, text)
+        return text
+
+    @content.inplace.setter
+    def _content_setter(self, value: str) -> None:
+        # stored plain until flush; large values are compressed on insert/update
+        self._content = value
+        self.content_codec = None
+
+    @content.inplace.expression
+    @classmethod
+    def _content_expression(cls):
+        return observation_text(cls._content, cls.content_codec)
+
     def __repr__(self) -> str:
         """String representation of the observation.
         
@@ -124,6 +179,35 @@ class Observation(Base):
         return f"<Observation(id={self.id}, observer={self.observer_name})>"
 
 
+@event.listens_for(Observation, "load")
+@event.listens_for(Observation, "refresh")
+def _remember_dictionaries(target: Observation, context, *_) -> None:
+    """Keep the registry of the database an observation was loaded from."""
+    bind = context.session.get_bind(Observation.__mapper__)
+    if bind.dialect.name == "sqlite":
+        target.__dict__["_dictionaries"] = content_dictionaries(bind)
+
+
+@event.listens_for(Observation, "before_insert")
+@event.listens_for(Observation, "before_update")
+def _compress_observation_content(mapper, connection, target: Observation) -> None:
+    """Compress large plain content on SQLite right before it is written."""
+    if connection.dialect.name != "sqlite" or target.content_codec is not None:
+        return
+    if not isinstance(target._content, str):
+        return
+    if inspect(target).persistent and not inspect(target).attrs._content.history.has_changes():
+        return
+    text = target._content
+    dictionaries = content_dictionaries(connection)
+    target.__dict__["_dictionaries"] = dictionaries
+    payload, codec = compress_content(text, dictionaries=dictionaries)
+    if codec is not None:
+        target._content = payload
+        target.content_codec = codec
+        target.__dict__["_content_cache"] = (payload, text)
+
+
 class Proposition(Base):
     """Represents a proposition about user behavior.
     
@@ -144,6 +228,11 @@ class Proposition(Base):
         observations (set[Observation]): Set of observations related to this proposition.
     """
     __tablename__ = "propositions"
+    __table_args__ = (
+        Index("ix_propositions_created_at_id", "created_at", "id"),
+        # ids of archived propositions must never be handed out again
+        {"sqlite_autoincrement": True},
+    )
 
     id:         Mapped[int]           = mapped_column(primary_key=True)
     text:       Mapped[str]           = mapped_column(Text, nullable=False)
@@ -214,6 +303,9 @@ class Suggestion(Base):
         updated_at (datetime): When the suggestion was last updated.
     """
     __tablename__ = "suggestions"
+    __table_args__ = (
+        Index("ix_suggestions_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -256,13 +348,117 @@ class Suggestion(Base):
         return f"<Suggestion(id={self.id}, title={preview})>"
 
 
+class ColdProposition(Base):
+    """A proposition archived by the proposition garbage collector.
+
+    Rows keep the proposition's original id and columns, plus the links it
+    had when it was moved out of ``propositions``, so it can be restored
+    unchanged. Proposition ids are never reused (``AUTOINCREMENT`` on SQLite,
+    a sequence on PostgreSQL), so the original id is still free on restore.
+    Retrieval never reads this table.
+
+    Attributes:
+        observation_ids (str): JSON list of the observations it was linked to.
+        parent_ids (str): JSON list of its parent propositions.
+        support_count (int): Number of supporting observations when archived.
+        gc_score (float): Decayed score that put it below the threshold.
+        archived_at (datetime): When the proposition was archived.
+    """
+    __tablename__ = "propositions_cold"
+    __table_args__ = (
+        Index("ix_propositions_cold_archived_at", "archived_at"),
+    )
+
+    id:         Mapped[int]           = mapped_column(primary_key=True, autoincrement=False)
+    text:       Mapped[str]           = mapped_column(Text, nullable=False)
+    reasoning:  Mapped[str]           = mapped_column(Text, nullable=False)
+    confidence: Mapped[Optional[int]]
+    decay:      Mapped[Optional[int]]
+
+    created_at: Mapped[str]           = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[str]           = mapped_column(DateTime(timezone=True), nullable=False)
+
+    revision_group: Mapped[str]       = mapped_column(String(36), nullable=False, index=True)
+    version:        Mapped[int]       = mapped_column(Integer, nullable=False)
+
+    observation_ids: Mapped[str]      = mapped_column(Text, nullable=False, default="[]")
+    parent_ids:      Mapped[str]      = mapped_column(Text, nullable=False, default="[]")
+    support_count:   Mapped[int]      = mapped_column(Integer, nullable=False, default=0)
+    gc_score:        Mapped[float]    = mapped_column(Float, nullable=False)
+    archived_at:     Mapped[str]      = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the archived proposition."""
+        preview = (self.text[:27] + "…") if len(self.text) > 30 else self.text
+        return f"<ColdProposition(id={self.id}, text={preview})>"
+
+
+class ContentDictionary(Base):
+    """A trained compression dictionary for observation content.
+
+    Compressed observations reference their dictionary through their codec
+    (``zstd:<id>`` / ``zlib:<id>``), so rows are never deleted.
+
+    Attributes:
+        id (int): Primary key, referenced by codecs.
+        codec (str): Codec the dictionary was trained for.
+        data (bytes): The dictionary.
+        sample_count (int): Observations it was trained on.
+        created_at (datetime): When the dictionary was trained.
+    """
+    __tablename__ = "content_dictionaries"
+
+    id:           Mapped[int]   = mapped_column(primary_key=True)
+    codec:        Mapped[str]   = mapped_column(String(16), nullable=False)
+    data:         Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    sample_count: Mapped[int]   = mapped_column(Integer, nullable=False)
+    created_at:   Mapped[str]   = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the dictionary."""
+        return f"<ContentDictionary(id={self.id}, codec={self.codec}, size={len(self.data)})>"
+
+
 FTS_TOKENIZER = "porter ascii"
+FTS_PREFIX = "2 3"   # prefix indexes for typeahead (``term*``) queries
+
+_PROPOSITIONS_FTS_TRIGGERS = {
+    "propositions_ai": """
+        CREATE TRIGGER propositions_ai
+        AFTER INSERT ON propositions BEGIN
+            INSERT INTO propositions_fts(rowid, text, reasoning)
+            VALUES (new.id, new.text, new.reasoning);
+        END;
+    """,
+    "propositions_ad": """
+        CREATE TRIGGER propositions_ad
+        AFTER DELETE ON propositions BEGIN
+            INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
+            VALUES('delete', old.id, old.text, old.reasoning);
+        END;
+    """,
+    "propositions_au": """
+        CREATE TRIGGER propositions_au
+        AFTER UPDATE ON propositions BEGIN
+            INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
+            VALUES('delete', old.id, old.text, old.reasoning);
+            INSERT INTO propositions_fts(rowid, text, reasoning)
+            VALUES(new.id, new.text, new.reasoning);
+        END;
+    """,
+}
 
 def create_fts_table(conn) -> None:
     """Create FTS5 virtual table and triggers for proposition search.
     
     This function creates a full-text search table for propositions and sets up
     triggers to maintain the search index as propositions are modified.
+    Triggers missing from an existing index (dropped with a rebuilt
+    ``propositions`` table) are recreated.
 
     Args:
         conn: SQLite database connection.
@@ -273,6 +469,12 @@ def create_fts_table(conn) -> None:
         )
     ).fetchone()
     if exists:
+        for name, ddl in _PROPOSITIONS_FTS_TRIGGERS.items():
+            present = conn.execute(sql_text(
+                "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=:name"
+            ), {"name": name}).fetchone()
+            if present is None:
+                conn.execute(sql_text(ddl))
         return
 
     conn.execute(
@@ -284,46 +486,14 @@ def create_fts_table(conn) -> None:
                 reasoning,
                 content='propositions',
                 content_rowid='id',
+                prefix='{FTS_PREFIX}',
                 tokenize='{FTS_TOKENIZER}'
             );
         """
         )
     )
-    conn.execute(
-        sql_text(
-            """
-            CREATE TRIGGER propositions_ai
-            AFTER INSERT ON propositions BEGIN
-                INSERT INTO propositions_fts(rowid, text, reasoning)
-                VALUES (new.id, new.text, new.reasoning);
-            END;
-        """
-        )
-    )
-    conn.execute(
-        sql_text(
-            """
-            CREATE TRIGGER propositions_ad
-            AFTER DELETE ON propositions BEGIN
-                INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
-                VALUES('delete', old.id, old.text, old.reasoning);
-            END;
-        """
-        )
-    )
-    conn.execute(
-        sql_text(
-            """
-            CREATE TRIGGER propositions_au
-            AFTER UPDATE ON propositions BEGIN
-                INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
-                VALUES('delete', old.id, old.text, old.reasoning);
-                INSERT INTO propositions_fts(rowid, text, reasoning)
-                VALUES(new.id, new.text, new.reasoning);
-            END;
-        """
-        )
-    )
+    for ddl in _PROPOSITIONS_FTS_TRIGGERS.values():
+        conn.execute(sql_text(ddl))
     conn.execute(
         sql_text(
             """
@@ -333,11 +503,47 @@ def create_fts_table(conn) -> None:
         )
     )
 
+_OBSERVATIONS_FTS_TRIGGERS = {
+    "observations_ai": f"""
+        CREATE TRIGGER observations_ai
+        AFTER INSERT ON observations BEGIN
+            INSERT INTO observations_fts(rowid, content)
+            VALUES (new.id, {sql_content("new.content", "new.content_codec")});
+        END;
+    """,
+    "observations_ad": f"""
+        CREATE TRIGGER observations_ad
+        AFTER DELETE ON observations BEGIN
+            INSERT INTO observations_fts(observations_fts, rowid, content)
+            VALUES ('delete', old.id, {sql_content("old.content", "old.content_codec")});
+        END;
+    """,
+    "observations_au": f"""
+        CREATE TRIGGER observations_au
+        AFTER UPDATE ON observations BEGIN
+            INSERT INTO observations_fts(observations_fts, rowid, content)
+            VALUES ('delete', old.id, {sql_content("old.content", "old.content_codec")});
+            INSERT INTO observations_fts(rowid, content)
+            VALUES (new.id, {sql_content("new.content", "new.content_codec")});
+        END;
+    """,
+}
+
+# re-indexes every observation from its uncompressed text; FTS5's own
+# 'rebuild' would read the stored (possibly compressed) column instead
+OBSERVATIONS_FTS_BACKFILL = (
+    f"INSERT INTO observations_fts(rowid, content) SELECT id, {sql_content()} FROM observations"
+)
+
+
 def create_observations_fts(conn) -> None:
     """Create FTS5 virtual table and triggers for observation search.
     
     This function creates a full-text search table for observations and sets up
-    triggers to maintain the search index as observations are modified.
+    triggers to maintain the search index as observations are modified. The
+    triggers index the uncompressed text, so the connection needs the
+    ``gum_content`` function (see :func:`gum.compression.register_sqlite_functions`).
+    Triggers from before content compression are replaced.
 
     Args:
         conn: SQLite database connection.
@@ -347,7 +553,14 @@ def create_observations_fts(conn) -> None:
         "WHERE type='table' AND name='observations_fts'"
     )).fetchone()
     if exists:
-        return                      # already present
+        for name, ddl in _OBSERVATIONS_FTS_TRIGGERS.items():
+            current = conn.execute(sql_text(
+                "SELECT sql FROM sqlite_master WHERE type='trigger' AND name=:name"
+            ), {"name": name}).scalar()
+            if current is None or "content_codec" not in current:
+                conn.execute(sql_text(f"DROP TRIGGER IF EXISTS {name}"))
+                conn.execute(sql_text(ddl))
+        return
 
     conn.execute(sql_text(f"""
         CREATE VIRTUAL TABLE observations_fts
@@ -355,70 +568,244 @@ def create_observations_fts(conn) -> None:
             content,
             content='observations',
             content_rowid='id',
+            prefix='{FTS_PREFIX}',
             tokenize='{FTS_TOKENIZER}'
         );
     """))
-    conn.execute(sql_text("""
-        CREATE TRIGGER observations_ai
-        AFTER INSERT ON observations BEGIN
-            INSERT INTO observations_fts(rowid, content)
-            VALUES (new.id, new.content);
-        END;
-    """))
-    conn.execute(sql_text("""
-        CREATE TRIGGER observations_ad
-        AFTER DELETE ON observations BEGIN
-            INSERT INTO observations_fts(observations_fts, rowid, content)
-            VALUES ('delete', old.id, old.content);
-        END;
-    """))
-    conn.execute(sql_text("""
-        CREATE TRIGGER observations_au
-        AFTER UPDATE ON observations BEGIN
-            INSERT INTO observations_fts(observations_fts, rowid, content)
-            VALUES ('delete', old.id, old.content);
-            INSERT INTO observations_fts(rowid, content)
-            VALUES (new.id, new.content);
-        END;
-    """))
+    for ddl in _OBSERVATIONS_FTS_TRIGGERS.values():
+        conn.execute(sql_text(ddl))
     # back-fill the index
-    conn.execute(sql_text("""
-        INSERT INTO observations_fts(rowid, content)
-        SELECT id, content FROM observations;
-    """))
+    conn.execute(sql_text(OBSERVATIONS_FTS_BACKFILL))
 
 
-async def init_db(
-    db_path: str = "gum.db",
-    db_directory: Optional[str] = None,
-):
-    """Create the SQLite file, ORM tables & FTS5 index (first run only)."""
-    if db_directory:
-        path = pathlib.Path(db_directory).expanduser()
-        path.mkdir(parents=True, exist_ok=True)
-        db_path = str(path / db_path)
+def create_missing_columns(conn) -> None:
+    """Add ORM-declared nullable columns that are missing from existing tables.
+
+    ``create_all`` never alters existing tables, so databases created before
+    a column was declared never receive it.
+
+    Args:
+        conn: Database connection.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(sql_text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+
+
+def enable_proposition_autoincrement(conn) -> None:
+    """Rebuild a ``propositions`` table created without ``AUTOINCREMENT``.
+
+    Without it SQLite hands out ``max(id) + 1``, so archiving the newest
+    proposition frees its id for the next insert, and the archived copy in
+    ``propositions_cold`` can no longer be restored. The table is copied
+    into one declared with ``AUTOINCREMENT``, and the id sequence starts past
+    every live and archived id. Indexes and FTS triggers dropped with the
+    old table are recreated by :func:`create_missing_indexes` and
+    :func:`create_fts_table`.
+
+    Args:
+        conn: SQLite database connection (foreign keys not enforced).
+    """
+    table = Proposition.__table__
+    current = conn.execute(sql_text(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='propositions'"
+    )).scalar()
+    if current is None or "AUTOINCREMENT" in current.upper():
+        return
+
+    present = {c["name"] for c in inspect(conn).get_columns("propositions")}
+    columns = ", ".join(c.name for c in table.columns if c.name in present)
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).strip()
+    conn.execute(sql_text(ddl.replace("CREATE TABLE propositions ", "CREATE TABLE propositions_rebuild ", 1)))
+    conn.execute(sql_text(
+        f"INSERT INTO propositions_rebuild ({columns}) SELECT {columns} FROM propositions"
+    ))
+    conn.execute(sql_text("DROP TABLE propositions"))
+    conn.execute(sql_text("ALTER TABLE propositions_rebuild RENAME TO propositions"))
+
+    last_id = conn.execute(sql_text(
+        "SELECT max(id) FROM (SELECT max(id) AS id FROM propositions "
+        "UNION ALL SELECT max(id) FROM propositions_cold)"
+    )).scalar() or 0
+    conn.execute(sql_text("DELETE FROM sqlite_sequence WHERE name = 'propositions'"))
+    conn.execute(sql_text(
+        "INSERT INTO sqlite_sequence (name, seq) VALUES ('propositions', :seq)"
+    ), {"seq": last_id})
+
+
+def content_dictionaries(bind) -> DictionaryRegistry:
+    """Compression dictionary registry of the SQLite database behind an engine or connection."""
+    return dictionary_registry(getattr(bind, "engine", bind).url.database)
+
 
+def load_content_dictionaries(conn) -> None:
+    """Register every stored compression dictionary in the database's registry.
+
+    Args:
+        conn: Database connection.
+    """
+    dictionaries = content_dictionaries(conn)
+    for row in conn.execute(sql_text(
+        "SELECT id, codec, data FROM content_dictionaries ORDER BY id"
+    )):
+        dictionaries.register(row.id, row.codec, row.data)
+
+
+def create_missing_indexes(conn) -> None:
+    """Create ORM-declared indexes that are missing from existing tables.
+
+    ``create_all`` only emits indexes together with a newly created table, so
+    databases created before an index was declared never receive it.
+
+    Args:
+        conn: SQLite database connection.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+_READ_ONLY_PREFIXES = ("SELECT", "WITH", "EXPLAIN")
+
+
+def _is_write(clause) -> bool:
+    """Whether *clause* needs the primary (writable) connection."""
+    if clause is None:
+        return False
+    if isinstance(clause, (Insert, Update, Delete)):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith(_READ_ONLY_PREFIXES)
+    return False
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the read-only pool and writes to the primary engine.
+
+    Flushes, DML and non-SELECT text statements go to the primary engine.
+    Once a session has written, its later reads also use the primary engine
+    so it always sees its own uncommitted changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        read_engine = self.info.get("read_engine")
+        if read_engine is None or self.info.get("wrote"):
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self._flushing or _is_write(clause):
+            self.info["wrote"] = True
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        return read_engine.sync_engine
+
+
+def register_content_functions(engine: AsyncEngine) -> None:
+    """Register ``gum_content`` on every connection a SQLite *engine* opens."""
+    dictionaries = content_dictionaries(engine.sync_engine)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register(dbapi_conn, _record):
+        register_sqlite_functions(dbapi_conn, dictionaries)
+
+
+def apply_storage_profile(engine: AsyncEngine, profile: StorageProfile) -> None:
+    """Run the profile's per-connection pragmas on every connection *engine* opens."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for pragma in profile.connection_pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_read_engine(
+    db_path: str,
+    pool_size: int = 4,
+    storage_profile: Optional[StorageProfile] = None,
+) -> AsyncEngine:
+    """Create a pool of read-only connections to an existing WAL database.
+
+    Connections are opened with ``mode=ro`` and ``PRAGMA query_only`` so a
+    stray write through the pool fails instead of taking the write lock.
+
+    Args:
+        db_path: Path of the SQLite file (must already exist).
+        pool_size: Number of pooled read connections.
+        storage_profile: Profile whose cache/mmap pragmas to apply.
+    """
+    db_uri = pathlib.Path(db_path).expanduser().resolve().as_uri()
     engine: AsyncEngine = create_async_engine(
-        f"sqlite+aiosqlite:///{db_path}",
+        f"sqlite+aiosqlite:///{db_uri}?mode=ro&uri=true",
         future=True,
         connect_args={
             "timeout": 30,
             "isolation_level": None,
         },
-        poolclass=None,
+        pool_size=pool_size,
+        max_overflow=0,
     )
 
-    async with engine.begin() as conn:
-        await conn.execute(sql_text("PRAGMA journal_mode=WAL"))
-        await conn.execute(sql_text("PRAGMA busy_timeout=30000"))
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_read_only(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+    register_content_functions(engine)
+    if storage_profile is not None:
+        apply_storage_profile(engine, storage_profile)
+    return engine
+
+
+async def init_db(
+    db_path: str = "gum.db",
+    db_directory: Optional[str] = None,
+    read_pool_size: int = 4,
+    storage_profile: Union[str, StorageProfile, None] = None,
+    database_url: Optional[str] = None,
+    schema: Optional[str] = None,
+):
+    """Create the database, ORM tables & full-text index (first run only).
+
+    The database is *database_url* (or ``GUM_DATABASE_URL``) when given, and
+    otherwise the SQLite file ``db_directory/db_path``; the matching
+    :class:`~gum.storage.StorageBackend` sets up engine and search index.
+    On PostgreSQL, *schema* keeps the tables in their own schema so several
+    GUM users can share one database; SQLite ignores it.
+
+    Sessions from the returned sessionmaker route reads to a pool of
+    ``read_pool_size`` read-only connections and writes to the primary engine
+    (see :class:`RoutingSession`). Pass ``read_pool_size=0`` to use the
+    primary engine for everything. Only SQLite uses a separate read pool.
+
+    Every SQLite connection gets the pragmas of *storage_profile* (a name from
+    :data:`~gum.config.storage_config.STORAGE_PROFILES`, defaulting to
+    ``GUM_STORAGE_PROFILE`` or ``balanced``). Its page size only applies to
+    newly created databases.
+    """
+    from .storage import get_backend, resolve_database_url
+
+    profile = get_storage_profile(storage_profile)
+    url = resolve_database_url(db_path, db_directory, database_url)
+    backend = get_backend(url)
 
-        await conn.run_sync(Base.metadata.create_all)
-        await conn.run_sync(create_fts_table)
-        await conn.run_sync(create_observations_fts)
+    engine = backend.create_engine(url, profile, schema=schema)
+    await backend.init_schema(engine, profile, schema=schema)
+    read_engine = backend.create_read_engine(url, read_pool_size, profile)
 
     Session = async_sessionmaker(
         engine, 
         expire_on_commit=False,
-        autoflush=False
+        autoflush=False,
+        sync_session_class=RoutingSession,
+        info={"read_engine": read_engine},
     )
     return engine, Session
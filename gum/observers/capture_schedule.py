@@ -0,0 +1,170 @@
+"""
+Adaptive per-monitor capture scheduling for the Screen observer.
+
+The observer keeps a recent frame of every monitor so an interaction has a
+"before" image. Refreshing every monitor at the full rate wastes a
+full-resolution grab per idle display per tick, so :class:`CaptureScheduler`
+gives each monitor its own rate based on pointer activity:
+
+- **active** (pointer event within ``idle_after_sec``): ``active_fps``
+- **idle**: the rate decays geometrically to ``idle_fps`` over ``decay_sec``
+- **lazy** (no activity for ``lazy_after_sec``): no periodic grabs at all;
+  the observer grabs the monitor on demand when an event lands on it
+
+With ``adaptive=False`` every monitor is refreshed at ``active_fps`` (the
+previous fixed-rate behaviour). Both modes record grab counts and the CPU
+time spent grabbing, so they can be compared on the same machine.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class CaptureScheduleConfig:
+    """Per-monitor capture rates."""
+
+    active_fps: float = 10.0
+    idle_fps: float = 1.0
+    idle_after_sec: float = 5.0             # full rate this long after the last pointer event
+    decay_sec: float = 30.0                 # then decay from active_fps to idle_fps over this span
+    lazy_after_sec: Optional[float] = 120.0  # then stop periodic grabs (None: never)
+    adaptive: bool = True
+
+
+@dataclass
+class _MonitorState:
+    last_activity: float
+    last_grab: Optional[float] = None
+    grabs: int = 0
+    grabs_on_demand: int = 0
+    cpu_seconds: float = 0.0
+
+
+class CaptureScheduler:
+    """
+    Decides which monitors to grab on each tick of the capture loop.
+
+    Monitors are numbered from 1, like the observer's ``mss`` monitor list.
+    """
+
+    def __init__(
+        self,
+        monitors: int,
+        config: Optional[CaptureScheduleConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config or CaptureScheduleConfig()
+        self._clock = clock
+        self._started = clock()
+        self._monitors: Dict[int, _MonitorState] = {
+            idx: _MonitorState(last_activity=self._started) for idx in range(1, monitors + 1)
+        }
+
+    # ─────────────────────────────── activity
+    def note_activity(self, idx: int, now: Optional[float] = None) -> None:
+        """Record a pointer event on monitor *idx*."""
+        state = self._monitors.get(idx)
+        if state is not None:
+            state.last_activity = self._clock() if now is None else now
+
+    def fps(self, idx: int, now: float) -> Optional[float]:
+        """Current refresh rate of monitor *idx*, or None while it is lazy."""
+        cfg = self.config
+        if not cfg.adaptive:
+            return cfg.active_fps
+        idle_for = now - self._monitors[idx].last_activity
+        if idle_for <= cfg.idle_after_sec:
+            return cfg.active_fps
+        if cfg.lazy_after_sec is not None and idle_for > cfg.lazy_after_sec:
+            return None
+        progress = min(1.0, (idle_for - cfg.idle_after_sec) / cfg.decay_sec) if cfg.decay_sec > 0 else 1.0
+        return cfg.active_fps * (cfg.idle_fps / cfg.active_fps) ** progress
+
+    # ─────────────────────────────── scheduling
+    def due(self, now: Optional[float] = None) -> List[int]:
+        """Monitors whose refresh interval has elapsed."""
+        now = self._clock() if now is None else now
+        due = []
+        for idx, state in self._monitors.items():
+            rate = self.fps(idx, now)
+            if rate is None:
+                continue
+            if state.last_grab is None or now - state.last_grab >= 1.0 / rate:
+                due.append(idx)
+        return due
+
+    def next_wakeup(self, now: Optional[float] = None) -> float:
+        """Seconds until the next grab is due, never longer than one active tick.
+
+        Capping at the active interval lets a monitor that just became active
+        reach full rate on the next tick.
+        """
+        now = self._clock() if now is None else now
+        tick = 1.0 / self.config.active_fps
+        wait = tick
+        for idx, state in self._monitors.items():
+            rate = self.fps(idx, now)
+            if rate is None:
+                continue
+            if state.last_grab is None:
+                return 0.0
+            wait = min(wait, state.last_grab + 1.0 / rate - now)
+        return max(0.0, wait)
+
+    def is_stale(self, idx: int, now: Optional[float] = None) -> bool:
+        """Whether monitor *idx*'s latest frame is too old to serve as a "before" frame.
+
+        True when it was never grabbed or not within two active ticks, which
+        is the case for idle and lazy monitors.
+        """
+        now = self._clock() if now is None else now
+        state = self._monitors.get(idx)
+        if state is None or state.last_grab is None:
+            return True
+        return now - state.last_grab > 2.0 / self.config.active_fps
+
+    def record_grab(self, idx: int, cpu_seconds: float, *, on_demand: bool = False,
+                    now: Optional[float] = None) -> None:
+        """Account for a grab of monitor *idx* that used *cpu_seconds* of CPU."""
+        state = self._monitors.get(idx)
+        if state is None:
+            return
+        state.last_grab = self._clock() if now is None else now
+        state.grabs += 1
+        state.cpu_seconds += cpu_seconds
+        if on_demand:
+            state.grabs_on_demand += 1
+
+    # ─────────────────────────────── stats
+    def _rounded_fps(self, idx: int, now: float) -> Optional[float]:
+        rate = self.fps(idx, now)
+        return None if rate is None else round(rate, 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Grab counts, rates and capture CPU usage per monitor and in total."""
+        now = self._clock()
+        elapsed = max(now - self._started, 1e-9)
+        cpu = sum(s.cpu_seconds for s in self._monitors.values())
+        grabs = sum(s.grabs for s in self._monitors.values())
+        return {
+            "mode": "adaptive" if self.config.adaptive else "fixed",
+            "elapsed_seconds": round(elapsed, 1),
+            "grabs": grabs,
+            "grabs_per_second": round(grabs / elapsed, 2),
+            "capture_cpu_seconds": round(cpu, 3),
+            "capture_cpu_percent": round(100 * cpu / elapsed, 2),
+            "monitors": {
+                idx: {
+                    "fps": self._rounded_fps(idx, now),
+                    "idle_seconds": round(now - s.last_activity, 1),
+                    "grabs": s.grabs,
+                    "grabs_on_demand": s.grabs_on_demand,
+                    "capture_cpu_seconds": round(s.cpu_seconds, 3),
+                }
+                for idx, s in self._monitors.items()
+            },
+        }
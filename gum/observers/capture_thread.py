@@ -0,0 +1,307 @@
+"""
+Screen capture off the event loop.
+
+A single ``mss`` grab of a large display takes tens of milliseconds, which
+stalls every other coroutine sharing the loop (the controller's HTTP and SSE
+handlers included). :class:`CaptureThread` owns the ``mss`` context on a
+dedicated thread and refreshes monitors on the schedule of a
+:class:`~gum.observers.capture_schedule.CaptureScheduler`.
+
+Each monitor has a small ring of frame buffers allocated once, at the
+monitor's resolution, and reused for every grab. The async side reads the
+latest frame of a monitor through :meth:`CaptureThread.latest` (or asks for a
+fresh one with :meth:`CaptureThread.grab`) and gets a :class:`Frame` that
+points into the ring slot rather than a copy of it. A frame pins its slot
+until :meth:`Frame.release` is called, so the capture thread never
+overwrites pixels someone is still reading; it writes into another slot, and
+only grows the ring if every slot is pinned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import mss
+from PIL import Image
+
+from .capture_schedule import CaptureScheduleConfig, CaptureScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    __slots__ = ("buf", "width", "height", "seq", "timestamp", "pins")
+
+    def __init__(self, nbytes: int):
+        self.buf = bytearray(nbytes)
+        self.width = 0
+        self.height = 0
+        self.seq = 0
+        self.timestamp = 0.0
+        self.pins = 0
+
+
+class _Ring:
+    """Frame buffers of one monitor; all access happens under the thread's lock."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.slots: List[_Slot] = []
+        self.latest: Optional[_Slot] = None
+        self.seq = 0
+        self.grown = 0
+
+    def acquire(self, nbytes: int) -> _Slot:
+        """Pick a slot to write the next frame into and pin it for writing."""
+        if not self.slots or len(self.slots[0].buf) != nbytes:
+            # first grab or the resolution changed: (re)allocate the ring;
+            # pinned slots stay alive through their frames
+            self.slots = [_Slot(nbytes) for _ in range(self.size)]
+        for slot in self.slots:
+            if slot.pins == 0 and slot is not self.latest:
+                break
+        else:
+            slot = _Slot(nbytes)
+            self.slots.append(slot)
+            self.grown += 1
+        slot.pins += 1
+        return slot
+
+
+class Frame:
+    """
+    A captured monitor frame backed by a ring-buffer slot.
+
+    Exposes the ``raw`` (BGRA), ``width``, ``height`` and ``size`` attributes
+    of an ``mss`` screenshot. ``raw`` is a view of the slot: it stays valid
+    until :meth:`release`, after which the capture thread may overwrite it.
+    """
+
+    __slots__ = ("monitor", "seq", "timestamp", "width", "height", "raw", "_owner", "_slot")
+
+    def __init__(self, owner: "CaptureThread", monitor: int, slot: _Slot):
+        self.monitor = monitor
+        self.seq = slot.seq
+        self.timestamp = slot.timestamp
+        self.width = slot.width
+        self.height = slot.height
+        self.raw = memoryview(slot.buf)[: slot.width * slot.height * 4]
+        self._owner: Optional[CaptureThread] = owner
+        self._slot = slot
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    def release(self) -> None:
+        """Unpin the slot; safe to call more than once."""
+        owner, self._owner = self._owner, None
+        if owner is not None:
+            owner._unpin(self._slot)
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+
+def frame_to_image(frame: Any) -> Image.Image:
+    """RGB image of a :class:`Frame` or ``mss`` screenshot (converts from BGRA in C)."""
+    return Image.frombytes("RGB", (frame.width, frame.height), frame.raw, "raw", "BGRX")
+
+
+class CaptureThread(threading.Thread):
+    """
+    Grabs monitors on a dedicated thread into per-monitor frame rings.
+
+    ``monitors`` and ``scheduler`` are available once :attr:`ready` is set.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CaptureScheduleConfig] = None,
+        mon_start: int = 1,
+        ring_size: int = 3,
+    ):
+        """
+        Initialize the capture thread.
+
+        Args:
+            config: Per-monitor capture rates
+            mon_start: Index of the first real display in ``mss.monitors``
+            ring_size: Frame buffers preallocated per monitor
+        """
+        super().__init__(name="gum-screen-capture", daemon=True)
+        self.config = config or CaptureScheduleConfig()
+        self.mon_start = mon_start
+        self.ring_size = max(2, ring_size)
+
+        self.ready = threading.Event()
+        self.monitors: List[Dict[str, int]] = []
+        self.scheduler: Optional[CaptureScheduler] = None
+        self.error: Optional[BaseException] = None
+
+        # an RLock, because Frame.__del__ may release while the lock is held
+        self._lock = threading.RLock()
+        self._rings: Dict[int, _Ring] = {}
+        self._requests: "queue.SimpleQueue[Tuple[int, concurrent.futures.Future]]" = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._failures = 0
+
+    # ─────────────────────────────── async-side API
+    def latest(self, idx: int) -> Optional[Frame]:
+        """Latest frame of monitor *idx* (pinned until released), or None if never grabbed."""
+        with self._lock:
+            ring = self._rings.get(idx)
+            if ring is None or ring.latest is None:
+                return None
+            ring.latest.pins += 1
+            return Frame(self, idx, ring.latest)
+
+    def request(self, idx: int) -> concurrent.futures.Future:
+        """Ask for an immediate grab of monitor *idx*; resolves to a pinned :class:`Frame`."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if self._stopping.is_set() or not self.is_alive():
+            future.set_exception(RuntimeError("Screen capture thread is not running"))
+            return future
+        self._requests.put((idx, future))
+        self._wake.set()
+        if self._stopping.is_set():
+            # the thread may have drained the queue before the put
+            self._fail_requests()
+        return future
+
+    async def grab(self, idx: int) -> Frame:
+        """Awaitable form of :meth:`request`."""
+        return await asyncio.wrap_future(self.request(idx))
+
+    def note_activity(self, idx: int) -> None:
+        """Record a pointer event on monitor *idx* with the scheduler."""
+        if self.scheduler is not None:
+            self.scheduler.note_activity(idx)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop grabbing and wait for the thread to exit."""
+        self._stopping.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler stats plus ring-buffer usage."""
+        stats = self.scheduler.get_stats() if self.scheduler else {}
+        with self._lock:
+            stats["ring"] = {
+                idx: {
+                    "slots": len(ring.slots),
+                    "pinned": sum(1 for s in ring.slots if s.pins),
+                    "grown": ring.grown,
+                    "frame_bytes": len(ring.slots[0].buf) if ring.slots else 0,
+                }
+                for idx, ring in self._rings.items()
+            }
+        stats["failed_grabs"] = self._failures
+        return stats
+
+    # ─────────────────────────────── capture thread
+    def _unpin(self, slot: _Slot) -> None:
+        with self._lock:
+            slot.pins -= 1
+
+    def run(self) -> None:
+        try:
+            with mss.mss() as sct:
+                self.monitors = sct.monitors[self.mon_start:]
+                self.scheduler = CaptureScheduler(len(self.monitors), self.config)
+                self._rings = {idx: _Ring(self.ring_size) for idx in range(1, len(self.monitors) + 1)}
+                self.ready.set()
+
+                while not self._stopping.is_set():
+                    self._serve_requests(sct)
+                    for idx in self.scheduler.due():
+                        try:
+                            self._grab(sct, idx)
+                        except Exception as e:
+                            logger.error(f"Failed to refresh frame for monitor {idx}: {e}")
+                    self._wake.wait(self.scheduler.next_wakeup())
+                    self._wake.clear()
+        except Exception as e:
+            self.error = e
+            logger.error(f"Screen capture thread failed: {e}")
+        finally:
+            self._stopping.set()
+            self.ready.set()
+            self._fail_requests()
+
+    def _grab(self, sct: Any, idx: int, on_demand: bool = False) -> None:
+        cpu0 = time.thread_time()
+        try:
+            shot = sct.grab(self.monitors[idx - 1])
+            nbytes = shot.width * shot.height * 4
+            with self._lock:
+                slot = self._rings[idx].acquire(nbytes)
+            try:
+                # the only copy: mss's buffer into the preallocated slot
+                slot.buf[:nbytes] = shot.raw
+            except Exception:
+                self._unpin(slot)
+                raise
+            with self._lock:
+                ring = self._rings[idx]
+                ring.seq += 1
+                slot.seq = ring.seq
+                slot.width, slot.height = shot.width, shot.height
+                slot.timestamp = time.time()
+                ring.latest = slot
+                slot.pins -= 1
+        except Exception:
+            self._failures += 1
+            raise
+        finally:
+            # failed grabs count too, so a broken monitor is retried at its rate
+            self.scheduler.record_grab(idx, time.thread_time() - cpu0, on_demand=on_demand)
+
+    def _serve_requests(self, sct: Any) -> None:
+        pending: Dict[int, List[concurrent.futures.Future]] = {}
+        while True:
+            try:
+                idx, future = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            pending.setdefault(idx, []).append(future)
+
+        # one grab per monitor, however many callers asked for it
+        for idx, futures in pending.items():
+            try:
+                if idx not in self._rings:
+                    raise LookupError(f"No monitor {idx}")
+                self._grab(sct, idx, on_demand=True)
+            except Exception as e:
+                for future in futures:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+                continue
+            for future in futures:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                future.set_result(self.latest(idx))
+
+    def _fail_requests(self) -> None:
+        while True:
+            try:
+                _, future = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Screen capture thread stopped"))
@@ -0,0 +1,198 @@
+"""
+Frame change detection for the Screen observer.
+
+Each mouse interaction costs two vision calls (transcription and summary) on
+a before/after pair of frames, even when the interaction changed nothing on
+screen (hovering, scrolling an already-scrolled page, clicking dead space).
+:class:`FrameDiff` compares the pair cheaply first:
+
+1. Both frames are sampled down to a small grayscale thumbnail by striding
+   over the raw BGRA buffer (no full-resolution copy or colour conversion).
+2. The thumbnails are split into a grid of blocks and the mean absolute
+   difference of each block is computed.
+3. The pair counts as unchanged when no block differs by more than
+   ``threshold`` gray levels.
+
+Block-wise means keep the score local: a dialog opening in one corner moves
+a block well past the threshold even though the frame as a whole barely
+changes, while small repaints such as a blinking caret stay below it.
+
+The same thumbnails give the changed region: the bounding box of the
+thumbnail pixels that moved by more than ``pixel_threshold`` inside blocks
+over the threshold, scaled back to frame pixels.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..key_frames import dhash
+
+# ITU-R BT.601 luma weights for B, G, R (mss frames are BGRA)
+_LUMA_BGR = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class FrameDiffConfig:
+    """Thumbnail size and sensitivity of the change detector."""
+
+    thumb_width: int = 160
+    thumb_height: int = 90
+    block_size: int = 10         # thumbnail pixels per block side
+    threshold: float = 3.0       # max block mean abs difference (0-255) still "unchanged"
+    pixel_threshold: float = 16.0  # thumbnail pixel difference counted into the changed region
+
+
+Region = Tuple[int, int, int, int]  # (left, top, right, bottom) in frame pixels
+
+
+class FrameChange(NamedTuple):
+    """Result of comparing a before/after pair."""
+
+    changed: bool
+    score: float
+    region: Optional[Region]    # bounding box of the change, None if unchanged
+
+
+def _thumbnail_steps(frame: Any, config: FrameDiffConfig) -> Tuple[int, int]:
+    # ceil division: the last sampled row/column lies within one step of the
+    # frame's edge, so no band wider than a step goes unsampled
+    return max(1, -(-frame.height // config.thumb_height)), max(1, -(-frame.width // config.thumb_width))
+
+
+def _block_means(diff: np.ndarray, block_size: int) -> np.ndarray:
+    """Mean of each ``block_size`` square of *diff*; edge blocks may be smaller."""
+    h, w = diff.shape
+    rows, cols = np.arange(0, h, block_size), np.arange(0, w, block_size)
+    sums = np.add.reduceat(np.add.reduceat(diff, rows, axis=0), cols, axis=1)
+    counts = np.outer(np.diff(np.append(rows, h)), np.diff(np.append(cols, w)))
+    return sums / counts
+
+
+def _expand_blocks(blocks: np.ndarray, block_size: int, shape: Tuple[int, int]) -> np.ndarray:
+    return np.repeat(np.repeat(blocks, block_size, 0), block_size, 1)[: shape[0], : shape[1]]
+
+
+def frame_thumbnail(frame: Any, config: FrameDiffConfig) -> np.ndarray:
+    """Grayscale thumbnail of an ``mss`` screenshot.
+
+    Args:
+        frame: Object with ``raw`` (BGRA bytes), ``width`` and ``height``
+        config: Detector configuration
+
+    Returns:
+        ``float32`` array of at most ``thumb_height x thumb_width`` luma values,
+        sampled across the whole frame
+    """
+    pixels = np.frombuffer(frame.raw, dtype=np.uint8).reshape(frame.height, frame.width, 4)
+    step_y, step_x = _thumbnail_steps(frame, config)
+    sampled = pixels[::step_y, ::step_x, :3]
+    return sampled.astype(np.float32) @ _LUMA_BGR
+
+
+def frame_hash(frame: Any, hash_size: int = 16) -> int:
+    """Perceptual (difference) hash of an ``mss`` screenshot, from its thumbnail."""
+    return dhash(frame_thumbnail(frame, FrameDiffConfig()), hash_size)
+
+
+def change_score(before: np.ndarray, after: np.ndarray, block_size: int) -> float:
+    """Largest per-block mean absolute difference between two thumbnails.
+
+    Thumbnails of different shapes (e.g. the monitor changed resolution)
+    score as completely changed.
+    """
+    if before.shape != after.shape:
+        return 255.0
+    diff = np.abs(after - before)
+    return float(_block_means(diff, block_size).max()) if diff.size else 0.0
+
+
+def change_region(
+    before: np.ndarray, after: np.ndarray, block_size: int, threshold: float, pixel_threshold: float
+) -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box ``(x0, y0, x1, y1)``, in thumbnail pixels, of what changed.
+
+    Only pixels inside blocks whose mean difference exceeds *threshold*
+    count, so scattered noise outside the real change does not stretch the
+    box. Returns None when nothing qualifies.
+    """
+    if before.shape != after.shape:
+        return None
+    diff = np.abs(after - before)
+    if not diff.size:
+        return None
+    hot = _expand_blocks(_block_means(diff, block_size) > threshold, block_size, diff.shape)
+    mask = (diff > pixel_threshold) & hot
+    if not mask.any():
+        # a diffuse change (e.g. a fade) with no single pixel over the limit
+        mask = hot
+        if not mask.any():
+            return None
+    ys = np.flatnonzero(mask.any(axis=1))
+    xs = np.flatnonzero(mask.any(axis=0))
+    return int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1
+
+
+class FrameDiff:
+    """
+    Decides whether a before/after frame pair is worth analysing.
+
+    Keeps counters of compared and suppressed pairs for the observer's stats.
+    """
+
+    def __init__(self, config: Optional[FrameDiffConfig] = None):
+        self.config = config or FrameDiffConfig()
+        self._stats: Dict[str, Any] = {
+            "pairs_compared": 0,
+            "pairs_unchanged": 0,
+            "last_score": None,
+        }
+
+    def score(self, before: Any, after: Any) -> float:
+        """Change score of a frame pair (see :func:`change_score`)."""
+        return change_score(
+            frame_thumbnail(before, self.config),
+            frame_thumbnail(after, self.config),
+            self.config.block_size,
+        )
+
+    def compare(self, before: Any, after: Any) -> FrameChange:
+        """Score a pair and locate the change; updates the counters."""
+        cfg = self.config
+        before_t, after_t = frame_thumbnail(before, cfg), frame_thumbnail(after, cfg)
+        score = change_score(before_t, after_t, cfg.block_size)
+        self._stats["pairs_compared"] += 1
+        self._stats["last_score"] = round(score, 3)
+        if score <= cfg.threshold:
+            self._stats["pairs_unchanged"] += 1
+            return FrameChange(False, score, None)
+
+        region = None
+        box = change_region(before_t, after_t, cfg.block_size, cfg.threshold, cfg.pixel_threshold)
+        if box is not None:
+            step_y, step_x = _thumbnail_steps(after, cfg)
+            x0, y0, x1, y1 = box
+            # a thumbnail pixel stands for a step_x x step_y cell of the frame
+            region = (
+                x0 * step_x,
+                y0 * step_y,
+                min(after.width, x1 * step_x),
+                min(after.height, y1 * step_y),
+            )
+        return FrameChange(True, score, region)
+
+    def changed(self, before: Any, after: Any) -> bool:
+        """Whether *after* differs perceptibly from *before*; updates the counters."""
+        return self.compare(before, after).changed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters of compared and unchanged frame pairs."""
+        compared = self._stats["pairs_compared"]
+        return {
+            **self._stats,
+            "unchanged_rate": round(self._stats["pairs_unchanged"] / compared, 4) if compared else None,
+            "threshold": self.config.threshold,
+        }
@@ -0,0 +1,102 @@
+"""
+Encode-once JPEG cache for the Screen observer.
+
+Every frame sent to the vision model is encoded to JPEG and base64 exactly
+once. :class:`EncodedFrameCache` keeps the result, keyed by frame id, for as
+long as the frame can still be referenced: the transcription call uses the
+newest before/after pair and the summary call re-sends the last
+``history_k`` frames, so the cache only has to hold a few frames more than
+the history. Writing the JPEGs to disk is a side effect the observer can
+turn off; it never feeds back into the vision calls.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class EncodedFrame:
+    """A frame's JPEG bytes and their base64 form."""
+
+    frame_id: str
+    jpeg: bytes
+    b64: str
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.jpeg) + len(self.b64)
+
+
+def encode_jpeg(image: Image.Image, quality: int = 70) -> bytes:
+    """JPEG bytes of *image*."""
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+class EncodedFrameCache:
+    """
+    Bounded LRU of :class:`EncodedFrame` objects keyed by frame id.
+
+    Bounded by entry count and by total bytes, whichever is hit first.
+    Thread-safe, since frames are encoded in worker threads.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, EncodedFrame]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"encodes": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+    def put(self, frame_id: str, jpeg: bytes) -> EncodedFrame:
+        """Store *jpeg* under *frame_id*, base64-encoding it once."""
+        entry = EncodedFrame(frame_id, jpeg, base64.b64encode(jpeg).decode())
+        with self._lock:
+            old = self._entries.pop(frame_id, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[frame_id] = entry
+            self._bytes += entry.nbytes
+            self._stats["encodes"] += 1
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+        return entry
+
+    def get(self, frame_id: str) -> Optional[EncodedFrame]:
+        """The cached frame, or None if it was never stored or has been evicted."""
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(frame_id)
+            self._stats["hits"] += 1
+            return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
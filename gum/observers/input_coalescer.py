@@ -0,0 +1,182 @@
+"""
+Mouse-move coalescing between the pynput listener thread and the event loop.
+
+pynput reports pointer motion at the device rate, often several hundred
+events a second during a sweep. Submitting each one to the loop costs a
+cross-thread wakeup and a task, although the observer only needs to know
+that the pointer is moving and where it ended up.
+
+:class:`MouseCoalescer` sits on the listener thread. A move only stores the
+latest position of its monitor in a dict; no lock is taken, since single
+dict operations are atomic under the GIL. The first move after a quiet
+period wakes the loop once; from then on the loop drains the latest
+positions on its own timer at ``rate_hz`` for as long as the pointer keeps
+moving. Clicks and scrolls are forwarded immediately.
+
+Handshake: the listener writes the position *before* checking ``_armed``,
+and the loop clears ``_armed`` *before* draining. A move is therefore either
+drained by the current tick or sees ``_armed`` cleared and wakes the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class MouseCoalescer:
+    """
+    Forwards pynput events to the loop, coalescing moves per monitor.
+
+    :meth:`move`, :meth:`click` and :meth:`scroll` are called on the listener
+    thread; ``dispatch(x, y, typ)`` is always called on the loop.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        dispatch: Callable[[float, float, str], Any],
+        monitor_for: Callable[[float, float], Optional[int]],
+        rate_hz: float = 20.0,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            loop: Loop that receives the events
+            dispatch: Called on the loop with ``(x, y, typ)`` for every forwarded event
+            monitor_for: Maps a position to its monitor index (None when off-screen)
+            rate_hz: Maximum rate at which coalesced moves are delivered
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.loop = loop
+        self.dispatch = dispatch
+        self.monitor_for = monitor_for
+        self.interval = 1.0 / rate_hz
+
+        self._latest: Dict[Optional[int], Tuple[float, float]] = {}
+        self._armed = False
+        self._closed = False
+        self._last_tick = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # listener-thread counters (only ever incremented there)
+        self._moves = 0
+        self._passthrough = 0
+        self._submissions = 0
+        # loop-side counters
+        self._delivered = 0
+        self._wakeups = 0
+        self._second = int(time.monotonic())
+        self._second_wakeups = 0
+        self._last_rate = 0
+        self._peak_rate = 0
+
+    # ─────────────────────────────── listener thread
+    def move(self, x: float, y: float) -> None:
+        self._moves += 1
+        self._latest[self.monitor_for(x, y)] = (x, y)
+        if not self._armed and not self._closed:
+            self._armed = True
+            self._submit(self._wake)
+
+    def click(self, x: float, y: float) -> None:
+        self._forward(x, y, "click")
+
+    def scroll(self, x: float, y: float) -> None:
+        self._forward(x, y, "scroll")
+
+    def _forward(self, x: float, y: float, typ: str) -> None:
+        if self._closed:
+            return
+        self._passthrough += 1
+        self._submit(self._deliver, x, y, typ)
+
+    def _submit(self, callback: Callable, *args: Any) -> None:
+        self._submissions += 1
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # the loop closed under a late pynput callback
+            self._closed = True
+
+    # ─────────────────────────────── loop
+    def _count_wakeup(self) -> None:
+        now = int(time.monotonic())
+        if now != self._second:
+            self._last_rate = self._second_wakeups if now == self._second + 1 else 0
+            self._peak_rate = max(self._peak_rate, self._second_wakeups)
+            self._second, self._second_wakeups = now, 0
+        self._wakeups += 1
+        self._second_wakeups += 1
+
+    def _deliver(self, x: float, y: float, typ: str) -> None:
+        self._count_wakeup()
+        if not self._closed:
+            self.dispatch(x, y, typ)
+
+    def _wake(self) -> None:
+        self._count_wakeup()
+        if self._timer is None:  # otherwise the running timer drains the move
+            self._tick()
+
+    def _on_timer(self) -> None:
+        self._count_wakeup()
+        self._timer = None
+        self._tick()
+
+    def _tick(self) -> None:
+        if self._closed:
+            return
+        wait = self._last_tick + self.interval - time.monotonic()
+        if wait > 0:
+            # woken early by the listener: hold the rate
+            self._timer = self.loop.call_later(wait, self._on_timer)
+            return
+        self._last_tick = time.monotonic()
+
+        self._armed = False
+        positions = []
+        for mon in list(self._latest):
+            position = self._latest.pop(mon, None)
+            if position is not None:
+                positions.append(position)
+        if not positions:
+            return  # the pointer stopped: the next move wakes the loop again
+
+        self._armed = True
+        self._timer = self.loop.call_later(self.interval, self._on_timer)
+        for x, y in positions:
+            self._delivered += 1
+            self.dispatch(x, y, "move")
+
+    def close(self) -> None:
+        """Stop forwarding; pending moves are dropped."""
+        self._closed = True
+        self._latest.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Move, pass-through and loop-wakeup counters."""
+        current = int(time.monotonic())
+        if current == self._second:
+            last_rate = self._last_rate
+        elif current == self._second + 1:
+            last_rate = self._second_wakeups
+        else:
+            last_rate = 0
+        return {
+            "moves": self._moves,
+            "moves_delivered": self._delivered,
+            "moves_coalesced": self._moves - self._delivered,
+            "passthrough": self._passthrough,
+            "thread_submissions": self._submissions,
+            "loop_wakeups": self._wakeups,
+            "loop_wakeups_per_sec": last_rate,
+            "peak_wakeups_per_sec": max(self._peak_rate, self._second_wakeups),
+            "rate_hz": round(1.0 / self.interval, 3),
+        }
@@ -90,3 +90,11 @@ class Observer(ABC):
         # unblock any awaiters
         while not self.update_queue.empty():
             self.update_queue.get_nowait()
+
+    def get_stats(self) -> dict:
+        """Get observer statistics.
+
+        Returns:
+            dict: The observer's name and running state; subclasses add their own counters.
+        """
+        return {"name": self._name, "running": self._running}
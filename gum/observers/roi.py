@@ -0,0 +1,95 @@
+"""
+Region-of-interest cropping for the Screen observer's vision calls.
+
+Most interactions change a small part of the screen (a dialog, one editor
+pane, a menu), yet a full-monitor JPEG of a 5K display is several hundred
+kilobytes and the model spends most of its time on pixels that did not
+move. When :class:`~gum.observers.frame_diff.FrameDiff` locates the change,
+the observer sends:
+
+- the before and after frames cropped to the changed region plus a context
+  margin, downscaled to at most ``max_edge`` pixels, and
+- a small thumbnail of the whole after-frame so the model still knows which
+  application and window the crop belongs to.
+
+Crops are cut from the raw BGRA buffer before colour conversion, so only
+the region's pixels are ever converted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .frame_diff import Region
+
+
+@dataclass(frozen=True)
+class ROIConfig:
+    """How changed regions are cropped and scaled."""
+
+    margin: int = 64                # context pixels added around the changed region
+    max_edge: int = 1536            # longest edge of a crop sent to the model
+    thumbnail_edge: int = 384       # longest edge of the full-screen context thumbnail
+    full_frame_ratio: float = 0.6   # send full frames when the region covers more of the screen
+
+
+def expand_region(region: Region, width: int, height: int, margin: int) -> Region:
+    """Grow *region* by *margin* pixels on every side, clamped to the frame."""
+    x0, y0, x1, y1 = region
+    return max(0, x0 - margin), max(0, y0 - margin), min(width, x1 + margin), min(height, y1 + margin)
+
+
+def region_ratio(region: Region, width: int, height: int) -> float:
+    """Share of the frame's area covered by *region*."""
+    x0, y0, x1, y1 = region
+    return (x1 - x0) * (y1 - y0) / float(max(1, width * height))
+
+
+def _bgra(frame: Any) -> np.ndarray:
+    return np.frombuffer(frame.raw, dtype=np.uint8).reshape(frame.height, frame.width, 4)
+
+
+def _to_image(pixels: np.ndarray) -> Image.Image:
+    h, w = pixels.shape[:2]
+    return Image.frombytes("RGB", (w, h), np.ascontiguousarray(pixels).tobytes(), "raw", "BGRX")
+
+
+def _fit(image: Image.Image, max_edge: Optional[int]) -> Image.Image:
+    if max_edge and max(image.size) > max_edge:
+        scale = max_edge / max(image.size)
+        image = image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.LANCZOS,
+        )
+    return image
+
+
+def crop_image(frame: Any, region: Region, max_edge: Optional[int]) -> Image.Image:
+    """RGB image of *region* of a BGRA frame, downscaled to fit *max_edge*."""
+    x0, y0, x1, y1 = region
+    return _fit(_to_image(_bgra(frame)[y0:y1, x0:x1]), max_edge)
+
+
+def thumbnail_image(frame: Any, edge: int) -> Image.Image:
+    """Small RGB view of the whole frame, longest edge *edge*."""
+    # stride down to about twice the target first, then resample properly
+    step = max(1, max(frame.width, frame.height) // (2 * edge))
+    return _fit(_to_image(_bgra(frame)[::step, ::step]), edge)
+
+
+def plan_crop(region: Optional[Region], width: int, height: int, config: ROIConfig) -> Optional[Region]:
+    """The crop box for a changed region, or None to send the full frame.
+
+    Full frames are kept when the change is unknown or covers more than
+    ``full_frame_ratio`` of the screen after adding the margin.
+    """
+    if region is None:
+        return None
+    box: Tuple[int, int, int, int] = expand_region(region, width, height, config.margin)
+    if region_ratio(box, width, height) > config.full_frame_ratio:
+        return None
+    return box
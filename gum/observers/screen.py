@@ -5,17 +5,17 @@ from __future__ import annotations
 
 # — Standard library —
 import base64
+import json
 import logging
 import os
 import sys
 import time
 from collections import deque
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 import asyncio
 
 # — Third-party —
-import mss
 # Conditional import for macOS-specific Quartz module
 try:
     if sys.platform == "darwin":
@@ -25,61 +25,41 @@ try:
 except ImportError:
     Quartz = None
 
-from PIL import Image
 from pynput import mouse           # still synchronous
-from shapely.geometry import box
-from shapely.ops import unary_union
 
 # — Local —
+from .capture_schedule import CaptureScheduleConfig
+from .capture_thread import CaptureThread, frame_to_image
+from .image_cache import EncodedFrameCache, encode_jpeg
+from .input_coalescer import MouseCoalescer
+from .frame_diff import FrameDiff, FrameDiffConfig, Region, frame_hash
 from .observer import Observer
+from .roi import ROIConfig, crop_image, plan_crop, thumbnail_image
+from .window_visibility import WindowVisibility, occlusion_ratios
+from ..buffer_manager import BufferedFrame, BufferManager, create_batch_prompt
+from ..key_frames import KeyFrameConfig
 from ..schemas import Update
 
 # — OpenAI async client —
+import openai
 from openai import AsyncOpenAI
 
 # — Local —
-from gum.prompts.screen import TRANSCRIPTION_PROMPT, SUMMARY_PROMPT
+from gum.prompts.screen import (
+    COMBINED_CONTEXT_NOTE,
+    COMBINED_PROMPT,
+    NO_ACTIVITY_YET,
+    ROLLING_SUMMARY_PROMPT,
+    ROI_NOTE,
+    SUMMARY_PROMPT,
+    TRANSCRIPTION_PROMPT,
+)
 
 ###############################################################################
 # Window‑geometry helpers                                                     #
 ###############################################################################
 
 
-def _get_global_bounds() -> tuple[float, float, float, float]:
-    """Return a bounding box enclosing **all** physical displays.
-
-    Returns
-    -------
-    (min_x, min_y, max_x, max_y) tuple in Quartz global coordinates.
-    """
-    if Quartz is None:
-        # Fallback for non-macOS systems - use mss to get monitor bounds
-        with mss.mss() as sct:
-            monitors = sct.monitors[1:]  # Skip the "all monitors" entry
-            if not monitors:
-                return 0, 0, 1920, 1080  # Default fallback
-            
-            min_x = min(mon["left"] for mon in monitors)
-            min_y = min(mon["top"] for mon in monitors) 
-            max_x = max(mon["left"] + mon["width"] for mon in monitors)
-            max_y = max(mon["top"] + mon["height"] for mon in monitors)
-            return min_x, min_y, max_x, max_y
-    
-    err, ids, cnt = Quartz.CGGetActiveDisplayList(16, None, None)
-    if err != Quartz.kCGErrorSuccess:  # pragma: no cover (defensive)
-        raise OSError(f"CGGetActiveDisplayList failed: {err}")
-
-    min_x = min_y = float("inf")
-    max_x = max_y = -float("inf")
-    for did in ids[:cnt]:
-        r = Quartz.CGDisplayBounds(did)
-        x0, y0 = r.origin.x, r.origin.y
-        x1, y1 = x0 + r.size.width, y0 + r.size.height
-        min_x, min_y = min(min_x, x0), min(min_y, y0)
-        max_x, max_y = max(max_x, x1), max(max_y, y1)
-    return min_x, min_y, max_x, max_y
-
-
 def _get_visible_windows() -> List[tuple[dict, float]]:
     """List *onscreen* windows with their visible‑area ratio.
 
@@ -91,8 +71,6 @@ def _get_visible_windows() -> List[tuple[dict, float]]:
         # Fallback for non-macOS systems - return empty list
         # Window management functionality is not available
         return []
-    
-    _, _, _, gmax_y = _get_global_bounds()
 
     opts = (
         Quartz.kCGWindowListOptionOnScreenOnly
@@ -100,10 +78,9 @@ def _get_visible_windows() -> List[tuple[dict, float]]:
     )
     wins = Quartz.CGWindowListCopyWindowInfo(opts, Quartz.kCGNullWindowID)
 
-    occupied = None  # running union of opaque regions above the current window
-    result: list[tuple[dict, float]] = []
-
-    for info in wins:
+    infos: list[dict] = []
+    rects: list[tuple[float, float, float, float]] = []
+    for info in wins:  # front to back
         owner = info.get("kCGWindowOwnerName", "")
         if owner in ("Dock", "WindowServer", "Window Server"):
             continue
@@ -117,19 +94,15 @@ def _get_visible_windows() -> List[tuple[dict, float]]:
         )
         if w <= 0 or h <= 0:
             continue  # hidden or minimised
+        infos.append(info)
+        rects.append((x, y, x + w, y + h))
 
-        inv_y = gmax_y - y - h  # Quartz→Shapely Y‑flip
-        poly = box(x, inv_y, x + w, inv_y + h)
-        if poly.is_empty:
-            continue
+    return [(info, ratio) for info, ratio in zip(infos, occlusion_ratios(rects)) if ratio > 0]
 
-        visible = poly if occupied is None else poly.difference(occupied)
-        if not visible.is_empty:
-            ratio = visible.area / poly.area
-            result.append((info, ratio))
-            occupied = poly if occupied is None else unary_union([occupied, poly])
 
-    return result
+def _visible_owners() -> set[str]:
+    """Names of the apps with at least one partly visible window."""
+    return {info.get("kCGWindowOwnerName", "") for info, _ in _get_visible_windows()}
 
 
 def _is_app_visible(names: Iterable[str]) -> bool:
@@ -138,16 +111,15 @@ def _is_app_visible(names: Iterable[str]) -> bool:
         # Fallback for non-macOS systems - assume app is visible
         return True
     
-    targets = set(names)
-    return any(
-        info.get("kCGWindowOwnerName", "") in targets and ratio > 0
-        for info, ratio in _get_visible_windows()
-    )
+    return not _visible_owners().isdisjoint(names)
 
 ###############################################################################
 # Screen observer                                                             #
 ###############################################################################
 
+VISION_MODES = ("combined", "concurrent", "sequential")
+
+
 class Screen(Observer):
     """Observer that captures and analyzes screen content around user interactions.
 
@@ -164,8 +136,48 @@ class Screen(Observer):
         summary_prompt (Optional[str], optional): Custom prompt for summarizing screenshots.
             Defaults to None.
         model_name (str, optional): GPT model to use for vision analysis. Defaults to "gpt-4o-mini".
-        history_k (int, optional): Number of recent screenshots to keep in history. Defaults to 10.
+        history_k (int, optional): Number of recent screenshots sent with each summary request
+            when ``rolling_summary`` is off. Defaults to 10.
         debug (bool, optional): Enable debug logging. Defaults to False.
+        change_threshold (Optional[float], optional): Largest block-wise gray-level difference
+            between the before and after frames still treated as "nothing changed"; such
+            interactions are dropped without calling the vision model. None disables the check.
+            Defaults to 3.0.
+        adaptive_capture (bool, optional): Refresh monitors with recent pointer activity at
+            the full capture rate and let idle monitors decay to ``idle_fps``, then to on-demand
+            grabs. False refreshes every monitor at the full rate. Defaults to True.
+        idle_fps (float, optional): Refresh rate idle monitors decay to. Defaults to 1.0.
+        save_screenshots (bool, optional): Also write each analysed frame to ``screenshots_dir``
+            (in the background). Vision calls always use the in-memory JPEG cache.
+            Defaults to True.
+        crop_to_changes (bool, optional): Send the vision model only the region that changed
+            between the before and after frames (plus a margin and a small full-screen
+            thumbnail) instead of full frames. Needs ``change_threshold``. Defaults to True.
+        roi_max_edge (int, optional): Longest edge, in pixels, of the cropped region sent to
+            the model. Defaults to 1536.
+        vision_mode (str, optional): How the transcription and summary are requested:
+            ``"combined"`` (one request returning both as JSON, falling back to concurrent
+            calls if the provider rejects it or the answer does not parse), ``"concurrent"``
+            (two requests in parallel) or ``"sequential"`` (summary after a valid
+            transcription). Defaults to "combined".
+        rolling_summary (bool, optional): Instead of re-sending the screenshot history, keep the
+            latest summary as a compact text record of recent activity and send it with only
+            the newest before/after pair, so each summary request carries two images whatever
+            the history length. Defaults to True.
+        rolling_summary_chars (int, optional): Maximum length of the carried-over activity
+            text. Defaults to 2000.
+        buffer_minutes (Optional[float], optional): Batch mode. Instead of analysing each
+            interaction, buffer its after-frame per monitor and, every ``buffer_minutes`` (or
+            when a buffer fills), send the window's key frames (one per distinct screen, plus
+            boundary frames) in one multi-image request. None analyses every interaction. Defaults to None.
+        batch_max_frames (int, optional): Frames per batch request. Defaults to 8.
+        move_rate_hz (float, optional): Maximum rate at which mouse moves reach the event
+            loop. Moves are coalesced on the listener thread to the latest position per
+            monitor; clicks and scrolls are forwarded immediately. Defaults to 20.0.
+        visibility_ttl (float, optional): How old the skip guard's view of visible windows
+            may get. Window visibility is recomputed in the background every
+            ``visibility_ttl`` seconds and after every click or scroll, so guard checks only
+            read the latest result. Defaults to 0.5.
 
     Attributes:
         _CAPTURE_FPS (int): Frames per second for screen capture.
@@ -189,6 +201,19 @@ class Screen(Observer):
         debug: bool = False,
         api_key: str | None = None,
         api_base: str | None = None,
+        change_threshold: Optional[float] = 3.0,
+        adaptive_capture: bool = True,
+        idle_fps: float = 1.0,
+        save_screenshots: bool = True,
+        crop_to_changes: bool = True,
+        roi_max_edge: int = 1536,
+        vision_mode: str = "combined",
+        rolling_summary: bool = True,
+        rolling_summary_chars: int = 2000,
+        buffer_minutes: Optional[float] = None,
+        batch_max_frames: int = 8,
+        move_rate_hz: float = 20.0,
+        visibility_ttl: float = 0.5,
     ) -> None:
         """Initialize the Screen observer.
         
@@ -201,9 +226,34 @@ class Screen(Observer):
             summary_prompt (Optional[str], optional): Custom prompt for summarizing screenshots.
                 Defaults to None.
             model_name (str, optional): GPT model to use for vision analysis. Defaults to "gpt-4o-mini".
-            history_k (int, optional): Number of recent screenshots to keep in history. Defaults to 10.
+            history_k (int, optional): Number of recent screenshots sent with each summary request
+                when ``rolling_summary`` is off. Defaults to 10.
             debug (bool, optional): Enable debug logging. Defaults to False.
+            change_threshold (Optional[float], optional): Block difference below which a
+                before/after pair is skipped as unchanged. None disables. Defaults to 3.0.
+            adaptive_capture (bool, optional): Adapt each monitor's capture rate to pointer
+                activity. Defaults to True.
+            idle_fps (float, optional): Refresh rate idle monitors decay to. Defaults to 1.0.
+            save_screenshots (bool, optional): Write analysed frames to disk. Defaults to True.
+            crop_to_changes (bool, optional): Crop vision inputs to the changed region.
+                Defaults to True.
+            roi_max_edge (int, optional): Longest edge of the cropped region. Defaults to 1536.
+            vision_mode (str, optional): ``"combined"``, ``"concurrent"`` or ``"sequential"``.
+                Defaults to "combined".
+            rolling_summary (bool, optional): Summarize from the prior activity text and the
+                newest pair instead of the screenshot history. Defaults to True.
+            rolling_summary_chars (int, optional): Maximum length of the activity text.
+                Defaults to 2000.
+            buffer_minutes (Optional[float], optional): Batch window per monitor; None
+                analyses every interaction. Defaults to None.
+            batch_max_frames (int, optional): Frames per batch request. Defaults to 8.
+            move_rate_hz (float, optional): Maximum rate of coalesced mouse moves.
+                Defaults to 20.0.
+            visibility_ttl (float, optional): Seconds between refreshes of the window
+                visibility snapshot. Defaults to 0.5.
         """
+        if vision_mode not in VISION_MODES:
+            raise ValueError(f"Unknown vision mode '{vision_mode}'. Available: {', '.join(VISION_MODES)}")
         self.screens_dir = os.path.abspath(os.path.expanduser(screenshots_dir))
         os.makedirs(self.screens_dir, exist_ok=True)
 
@@ -216,12 +266,73 @@ class Screen(Observer):
         self.debug = debug
 
         # state shared with worker
-        self._frames: Dict[int, Any] = {}
-        self._frame_lock = asyncio.Lock()
-
         self._history: deque[str] = deque(maxlen=max(0, history_k))
+
+        # rolling summary: the last summary stands in for the screenshot history
+        self.rolling_summary = rolling_summary
+        self._rolling_summary_chars = rolling_summary_chars
+        self._activity: Optional[str] = None
+
+        # frame id -> JPEG + base64, encoded once; holds the history plus the newest pair
+        self._images = EncodedFrameCache(max_entries=max(0, history_k) + 4)
+        self.save_screenshots = save_screenshots
+        self._pending_writes: set[asyncio.Task] = set()
         self._pending_event: Optional[dict] = None
         self._debounce_handle: Optional[asyncio.TimerHandle] = None
+
+        # per-monitor capture rates; the capture thread is started by the worker
+        self._capture_config = CaptureScheduleConfig(
+            active_fps=self._CAPTURE_FPS, idle_fps=idle_fps, adaptive=adaptive_capture
+        )
+        self._capture: Optional[CaptureThread] = None
+
+        # pointer input; moves are coalesced on the listener thread
+        if move_rate_hz <= 0:
+            raise ValueError("move_rate_hz must be positive")
+        self.move_rate_hz = move_rate_hz
+        self._input: Optional[MouseCoalescer] = None
+        self._event_tasks: set[asyncio.Task] = set()
+
+        # skip guard: window visibility snapshot, started by the worker (macOS only)
+        self.visibility_ttl = visibility_ttl
+        self._visibility: Optional[WindowVisibility] = None
+
+        # frame change detection
+        self._frame_diff = (
+            FrameDiff(FrameDiffConfig(threshold=change_threshold))
+            if change_threshold is not None else None
+        )
+        self._roi = ROIConfig(max_edge=roi_max_edge) if crop_to_changes else None
+        self.roi_max_edge = roi_max_edge
+
+        # batch mode: interactions accumulate per monitor, one request per flush
+        self._buffer: Optional[BufferManager] = None
+        self.batch_max_frames = max(1, batch_max_frames)
+        if buffer_minutes is not None:
+            self._buffer = BufferManager(
+                buffer_minutes=buffer_minutes,
+                flush_on_activity=False,
+                debug=debug,
+                spill_dir=os.path.join(self.screens_dir, "buffer-spill"),
+                key_frames=KeyFrameConfig(max_frames=self.batch_max_frames),
+            )
+            self._buffer.set_flush_callback(self._process_batch)
+        self._stats: Dict[str, int] = {
+            "flushes": 0,
+            "flushes_unchanged": 0,
+            "vision_calls": 0,
+            "vision_calls_avoided": 0,
+            "roi_crops": 0,
+            "full_frames": 0,
+            "image_bytes_sent": 0,
+            "combined_fallbacks": 0,
+            "batch_events": 0,
+            "batch_requests": 0,
+            "batch_frames_sent": 0,
+        }
+        self.vision_mode = vision_mode
+        self._combined_unsupported = False
+        self._latency: Dict[str, Dict[str, deque]] = {}
         self.client = AsyncOpenAI(
             # try the class, then the env for screen, then the env for gum
             base_url=api_base or os.getenv("SCREEN_LM_API_BASE") or os.getenv("GUM_LM_API_BASE"), 
@@ -264,90 +375,427 @@ class Screen(Observer):
         with open(img_path, "rb") as fh:
             return base64.b64encode(fh.read()).decode()
 
+    def _frame_path(self, frame_id: str) -> str:
+        """Path a frame is (or would be) saved under."""
+        return os.path.join(self.screens_dir, f"{frame_id}.jpg")
+
+    async def _frame_b64(self, frame_id: str) -> Optional[str]:
+        """Base64 JPEG of a frame from the cache, or from disk if it was evicted."""
+        entry = self._images.get(frame_id)
+        if entry is not None:
+            return entry.b64
+        path = self._frame_path(frame_id)
+        if self.save_screenshots and os.path.exists(path):
+            return await asyncio.to_thread(self._encode_image, path)
+        return None
+
     # ─────────────────────────────── OpenAI Vision (async)
-    async def _call_gpt_vision(self, prompt: str, img_paths: list[str]) -> str:
+    async def _call_gpt_vision(
+        self, prompt: str, frame_ids: list[str], response_format: Optional[dict] = None
+    ) -> str:
         """Call GPT Vision API to analyze images.
         
         Args:
             prompt (str): Prompt to guide the analysis.
-            img_paths (list[str]): List of image paths to analyze.
+            frame_ids (list[str]): Ids of the encoded frames to analyze.
+            response_format (Optional[dict], optional): Response format of the request.
+                Defaults to plain text.
             
         Returns:
             str: GPT's analysis of the images.
         """
+        images = await asyncio.gather(*[self._frame_b64(f) for f in frame_ids])
+        return await self._vision_request(
+            prompt, [encoded for encoded in images if encoded is not None], response_format
+        )
+
+    async def _vision_request(
+        self, prompt: str, images: list[str], response_format: Optional[dict] = None
+    ) -> str:
+        """Send base64 JPEGs and a prompt to the vision model.
+        
+        Args:
+            prompt (str): Prompt to guide the analysis.
+            images (list[str]): Base64-encoded JPEG images, in order.
+            response_format (Optional[dict], optional): Response format of the request.
+                Defaults to plain text.
+            
+        Returns:
+            str: The model's answer.
+        """
         content = [
             {
                 "type": "image_url",
                 "image_url": {"url": f"data:image/jpeg;base64,{encoded}"},
             }
-            for encoded in (await asyncio.gather(
-                *[asyncio.to_thread(self._encode_image, p) for p in img_paths]
-            ))
+            for encoded in images
         ]
         content.append({"type": "text", "text": prompt})
 
+        self._stats["vision_calls"] += 1
+        self._stats["image_bytes_sent"] += sum(len(c["image_url"]["url"]) for c in content[:-1])
         rsp = await self.client.chat.completions.create(
             model=self.model_name,
             messages=[{"role": "user", "content": content}],
-            response_format={"type": "text"},
+            response_format=response_format or {"type": "text"},
         )
         return rsp.choices[0].message.content
 
     # ─────────────────────────────── I/O helpers
-    async def _save_frame(self, frame, tag: str) -> str:
-        """Save a frame as a JPEG image.
+    async def _encode_frame(
+        self,
+        frame,
+        tag: str,
+        crop: Optional[Region] = None,
+        max_edge: Optional[int] = None,
+        thumbnail: bool = False,
+    ) -> str:
+        """Encode a frame to JPEG once and cache it; optionally save it in the background.
         
         Args:
-            frame: Frame data to save.
-            tag (str): Tag to include in the filename.
+            frame: Frame data to encode.
+            tag (str): Tag to include in the frame id.
+            crop (Optional[Region], optional): Encode only this region. Defaults to None
+                (the full frame).
+            max_edge (Optional[int], optional): Downscale so the longest edge fits.
+                Defaults to None (native size).
+            thumbnail (bool, optional): Encode a small view of the full frame instead.
+                Defaults to False.
             
         Returns:
-            str: Path to the saved image.
+            str: Frame id (``<epoch>_<tag>``, also the screenshot's file name).
+        """
+        frame_id = f"{time.time():.5f}_{tag}"
+
+        def build():
+            if thumbnail:
+                image = thumbnail_image(frame, self._roi.thumbnail_edge)
+            elif crop is not None or max_edge:
+                image = crop_image(frame, crop or (0, 0, frame.width, frame.height), max_edge)
+            else:
+                image = frame_to_image(frame)
+            return self._images.put(frame_id, encode_jpeg(image, quality=70))
+
+        entry = await asyncio.to_thread(build)
+        if self.save_screenshots:
+            task = asyncio.create_task(
+                asyncio.to_thread(self._write_frame, self._frame_path(frame_id), entry.jpeg)
+            )
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+        return frame_id
+
+    @staticmethod
+    def _write_frame(path: str, jpeg: bytes) -> None:
+        """Write encoded JPEG bytes to *path*."""
+        try:
+            with open(path, "wb") as fh:
+                fh.write(jpeg)
+        except OSError as e:
+            logging.getLogger("Screen").warning(f"Failed to save screenshot {path}: {e}")
+
+    # ─────────────────────────────── interactions
+    async def _encode_interaction(self, ev: dict, aft) -> Optional[dict]:
+        """Compare an interaction's frames and encode the ones that will be sent.
+
+        The frames are not needed once this returns, so the caller can release them
+        before the (slow) vision requests.
+
+        Args:
+            ev (dict): Pending event with ``type``, ``mon``, ``before`` and ``time``.
+            aft: The after-frame.
+
+        Returns:
+            Optional[dict]: Frame ids (``before``, ``after``, ``context``) and change
+                ``score``, or None when nothing visible changed.
+        """
+        change = None
+        if self._frame_diff is not None:
+            change = await asyncio.to_thread(self._frame_diff.compare, ev["before"], aft)
+            if not change.changed:
+                # nothing visible changed: skip transcription + summary
+                self._stats["flushes_unchanged"] += 1
+                self._stats["vision_calls_avoided"] += 2
+                return None
+        score = change.score if change is not None else None
+
+        if self._buffer is not None:
+            # batch mode sends one downscaled full view per interaction; the hash
+            # lets the flush cluster near-identical frames without decoding them
+            aft_path, phash = await asyncio.gather(
+                self._encode_frame(aft, "after", max_edge=self.roi_max_edge),
+                asyncio.to_thread(frame_hash, aft),
+            )
+            return {"before": None, "after": aft_path, "context": None, "score": score, "phash": phash}
+
+        crop = None
+        if change is not None and self._roi is not None:
+            crop = plan_crop(change.region, aft.width, aft.height, self._roi)
+
+        if crop is None:
+            self._stats["full_frames"] += 1
+            bef_path, aft_path = await asyncio.gather(
+                self._encode_frame(ev["before"], "before"),
+                self._encode_frame(aft, "after"),
+            )
+            ctx_path = None
+        else:
+            self._stats["roi_crops"] += 1
+            bef_path, aft_path, ctx_path = await asyncio.gather(
+                self._encode_frame(ev["before"], "before", crop, self._roi.max_edge),
+                self._encode_frame(aft, "after", crop, self._roi.max_edge),
+                self._encode_frame(aft, "context", thumbnail=True),
+            )
+        return {"before": bef_path, "after": aft_path, "context": ctx_path, "score": score}
+
+    async def _analyse_interaction(self, ev: dict, encoded: dict, flush_time: float) -> None:
+        """Analyse an encoded interaction now, or add it to its monitor's batch buffer."""
+        if self._buffer is None:
+            await self._process_and_emit(
+                encoded["before"], encoded["after"], encoded["context"],
+                event_time=ev["time"], flush_time=flush_time,
+            )
+            return
+
+        entry = self._images.get(encoded["after"])
+        if entry is None:
+            return
+        self._stats["batch_events"] += 1
+        await self._buffer.add_frame(
+            entry.b64, ev["type"], ev["mon"],
+            metadata={
+                "score": encoded["score"],
+                "phash": encoded.get("phash"),
+                "event_time": ev["time"],
+                "frame_id": encoded["after"],
+            },
+        )
+
+    async def _process_batch(self, monitor_idx: int, frames: List[BufferedFrame]) -> None:
+        """Analyse a flushed buffer window with one multi-image request.
+
+        Registered as the BufferManager's flush callback.
+
+        Args:
+            monitor_idx (int): Monitor the frames were captured on.
+            frames (List[BufferedFrame]): The window's key frames, oldest first.
+        """
+        start = time.monotonic()
+        total = (frames[0].metadata or {}).get("window_frames", len(frames))
+        prompt = create_batch_prompt(frames, (frames[-1].timestamp - frames[0].timestamp) / 60)
+        if len(frames) < total:
+            prompt += (
+                f"\n\nThese are {len(frames)} key frames of the {total} interactions "
+                f"captured on this screen during the period; near-identical screens are "
+                f"shown once."
+            )
+
+        self._stats["batch_requests"] += 1
+        self._stats["batch_frames_sent"] += len(frames)
+        try:
+            text = await self._vision_request(prompt, [f.image_data() for f in frames])
+        except Exception as exc:
+            if self.debug:
+                logging.getLogger("Screen").warning(f"Batch analysis of monitor {monitor_idx} failed: {exc}")
+            return
+        if not self._is_valid_content(text):
+            if self.debug:
+                logging.getLogger("Screen").warning(f"Invalid batch analysis: {text[:100] if text else 'None'}...")
+            return
+
+        await self.update_queue.put(Update(content=text.strip(), content_type="input_text"))
+        for i, frame in enumerate(frames):
+            self._record_latency("batch", (frame.metadata or {}).get("event_time"), start if i == 0 else None)
+
+    # ─────────────────────────────── transcription + summary
+    async def _transcribe_and_summarize(
+        self,
+        before_path: str,
+        after_path: str,
+        context_path: Optional[str],
+        prev_paths: list[str],
+    ) -> tuple[Optional[str], Optional[str], str]:
+        """Get the transcription and summary of an interaction in the configured vision mode.
+
+        Args:
+            before_path (str): Frame id of the "before" screenshot.
+            after_path (str): Frame id of the "after" screenshot.
+            context_path (Optional[str]): Frame id of the full-screen thumbnail, if cropped.
+            prev_paths (list[str]): History frame ids, oldest first, ending with ``before_path``.
+
+        Returns:
+            tuple: ``(transcription, summary, mode)``; either text is None when its call failed
+                or, in sequential mode, was skipped. ``mode`` is the mode actually used.
         """
-        ts   = f"{time.time():.5f}"
-        path = os.path.join(self.screens_dir, f"{ts}_{tag}.jpg")
-        await asyncio.to_thread(
-            Image.frombytes("RGB", (frame.width, frame.height), frame.rgb).save,
-            path,
-            "JPEG",
-            quality=70,
+        log = logging.getLogger("Screen")
+        transcription_ids = [before_path, after_path] + ([context_path] if context_path else [])
+        transcription_prompt = (
+            self.transcription_prompt if context_path is None
+            else f"{self.transcription_prompt}\n\n{ROI_NOTE}"
         )
-        return path
+        if self.rolling_summary:
+            history_ids: list[str] = []
+            summary_ids = [before_path, after_path]
+            summary_prompt = ROLLING_SUMMARY_PROMPT.format(
+                activity=self._activity or NO_ACTIVITY_YET, summary_prompt=self.summary_prompt
+            )
+        else:
+            history_ids = prev_paths[:-1]
+            summary_ids = prev_paths + [before_path, after_path]
+            summary_prompt = self.summary_prompt
+
+        mode = self.vision_mode
+        if mode == "combined" and self._combined_unsupported:
+            mode = "concurrent"
+
+        if mode == "combined":
+            prompt = COMBINED_PROMPT.format(
+                history=len(history_ids),
+                context=COMBINED_CONTEXT_NOTE if context_path else "",
+                transcription_prompt=self.transcription_prompt,
+                summary_prompt=summary_prompt,
+            )
+            try:
+                raw = await self._call_gpt_vision(
+                    prompt, history_ids + transcription_ids, response_format={"type": "json_object"}
+                )
+            except openai.BadRequestError as exc:
+                # the provider rejects JSON output: run the two calls concurrently from now on
+                log.warning(f"Combined vision request unsupported, using concurrent calls: {exc}")
+                self._combined_unsupported = True
+                raw = None
+            except Exception as exc:
+                if self.debug:
+                    log.warning(f"Combined vision request failed: {exc}")
+                return None, None, mode
+            parsed = self._parse_combined(raw)
+            if parsed is not None:
+                return parsed[0], parsed[1], mode
+            self._stats["combined_fallbacks"] += 1
+            mode = "concurrent"
+
+        if mode == "concurrent":
+            transcription, summary = await asyncio.gather(
+                self._call_gpt_vision(transcription_prompt, transcription_ids),
+                self._call_gpt_vision(summary_prompt, summary_ids),
+                return_exceptions=True,
+            )
+            if isinstance(transcription, BaseException):
+                if self.debug:
+                    log.warning(f"Transcription failed: {transcription}")
+                transcription = None
+            if isinstance(summary, BaseException):
+                if self.debug:
+                    log.warning(f"Summary failed: {summary}")
+                summary = None
+            return transcription, summary, mode
+
+        # sequential: the summary is only requested for a valid transcription
+        try:
+            transcription = await self._call_gpt_vision(transcription_prompt, transcription_ids)
+        except Exception as exc:
+            if self.debug:
+                log.warning(f"Transcription failed: {exc}")
+            return None, None, mode
+        if not self._is_valid_content(transcription):
+            return transcription, None, mode
+        try:
+            summary = await self._call_gpt_vision(summary_prompt, summary_ids)
+        except Exception as exc:
+            if self.debug:
+                log.warning(f"Summary failed: {exc}")
+            summary = None
+        return transcription, summary, mode
 
-    async def _process_and_emit(self, before_path: str, after_path: str) -> None:
+    @staticmethod
+    def _parse_combined(raw: Optional[str]) -> Optional[tuple[str, str]]:
+        """Extract ``(transcription, summary)`` from a combined JSON response."""
+        if not raw:
+            return None
+        text = raw.strip()
+        if text.startswith("```"):
+            # tolerate a fenced block despite the JSON response format
+            text = text.strip("`")
+            text = text[text.find("{"):] if "{" in text else text
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        transcription, summary = data.get("transcription"), data.get("summary")
+        if not isinstance(transcription, str) or not isinstance(summary, str):
+            return None
+        return transcription, summary
+
+    def _record_latency(self, mode: str, event_time: Optional[float], flush_time: Optional[float]) -> None:
+        """Record event-to-Update and processing latency of an emitted update."""
+        now = time.monotonic()
+        samples = self._latency.setdefault(mode, {
+            "event_to_update_ms": deque(maxlen=200),
+            "processing_ms": deque(maxlen=200),
+        })
+        if event_time is not None:
+            samples["event_to_update_ms"].append((now - event_time) * 1000)
+        if flush_time is not None:
+            samples["processing_ms"].append((now - flush_time) * 1000)
+
+    def _latency_stats(self) -> dict:
+        """Summaries of the recorded latencies per vision mode."""
+        def summarize(values) -> Optional[dict]:
+            if not values:
+                return None
+            ordered = sorted(values)
+            return {
+                "count": len(ordered),
+                "mean": round(sum(ordered) / len(ordered), 1),
+                "p50": round(ordered[len(ordered) // 2], 1),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+            }
+
+        return {
+            mode: {name: summarize(values) for name, values in samples.items()}
+            for mode, samples in self._latency.items()
+        }
+
+    async def _process_and_emit(
+        self,
+        before_path: str,
+        after_path: str,
+        context_path: Optional[str] = None,
+        event_time: Optional[float] = None,
+        flush_time: Optional[float] = None,
+    ) -> None:
         """Process screenshots and emit an update with robust error detection.
         
         Args:
-            before_path (str): Path to the "before" screenshot.
-            after_path (str | None): Path to the "after" screenshot, if any.
+            before_path (str): Frame id of the "before" screenshot.
+            after_path (str | None): Frame id of the "after" screenshot, if any.
+            context_path (Optional[str], optional): Frame id of a full-screen thumbnail,
+                given when the before/after frames are crops. Defaults to None.
+            event_time (Optional[float], optional): ``time.monotonic()`` of the interaction,
+                for latency stats. Defaults to None.
+            flush_time (Optional[float], optional): ``time.monotonic()`` when processing
+                started, for latency stats. Defaults to None.
         """
         # chronology: append 'before' first (history order == real order)
         self._history.append(before_path)
         prev_paths = list(self._history)
 
-        # Step 1: Get transcription with validation
-        try:
-            transcription = await self._call_gpt_vision(self.transcription_prompt, [before_path, after_path])
-        except Exception as exc:
-            if self.debug:
-                logging.getLogger("Screen").warning(f"Transcription failed: {exc}")
+        # Steps 1-3: get transcription and summary (one request, two concurrent, or in turn)
+        transcription, summary, mode = await self._transcribe_and_summarize(
+            before_path, after_path, context_path, prev_paths
+        )
+        if transcription is None:
             return  # Skip on exception
-        
+
         # Step 2: Validate transcription quality
         if not self._is_valid_content(transcription):
             if self.debug:
                 logging.getLogger("Screen").warning(f"Invalid transcription: {transcription[:100] if transcription else 'None'}...")
             return  # Skip invalid content
 
-        prev_paths.append(before_path)
-        prev_paths.append(after_path)
-        
-        # Step 3: Get summary with validation
-        try:
-            summary = await self._call_gpt_vision(self.summary_prompt, prev_paths)
-        except Exception as exc:
-            if self.debug:
-                logging.getLogger("Screen").warning(f"Summary failed: {exc}")
+        if summary is None:
             return  # Skip on exception
         
         # Step 4: Validate summary quality
@@ -367,8 +815,13 @@ class Screen(Observer):
                 logging.getLogger("Screen").warning(f"Invalid final content: {txt[:100] if txt else 'None'}...")
             return  # Skip invalid final content
         
+        if self.rolling_summary:
+            # carried into the next summary request in place of the screenshot history
+            self._activity = summary_clean[: self._rolling_summary_chars]
+
         # Step 6: Send to behavioral analysis
         await self.update_queue.put(Update(content=txt, content_type="input_text"))
+        self._record_latency(mode, event_time, flush_time)
 
     def _is_valid_content(self, content: str) -> bool:
         """Check if content is valid for behavioral analysis."""
@@ -435,6 +888,31 @@ class Screen(Observer):
         
         return has_activity
 
+    # ─────────────────────────────── stats
+    def get_stats(self) -> dict:
+        """Get capture and vision-call counters.
+
+        Returns:
+            dict: Flushes, flushes skipped because the frames were unchanged, vision calls
+                made and avoided, the change detector's counters, per-monitor capture
+                rates and CPU usage, mouse-move coalescing and loop wakeups per second, the
+                skip guard's visibility refreshes, the JPEG cache's counters, and event-to-Update latency per vision mode.
+        """
+        return {
+            **super().get_stats(),
+            **self._stats,
+            "frame_diff": self._frame_diff.get_stats() if self._frame_diff else None,
+            "capture": self._capture.get_stats() if self._capture else None,
+            "input": self._input.get_stats() if self._input else None,
+            "visibility": self._visibility.get_stats() if self._visibility else None,
+            "image_cache": self._images.get_stats(),
+            "vision_mode": self.vision_mode,
+            "rolling_summary": self.rolling_summary,
+            "activity_chars": len(self._activity) if self._activity else 0,
+            "buffer": self._buffer.get_buffer_status() if self._buffer else None,
+            "latency": self._latency_stats(),
+        }
+
     # ─────────────────────────────── skip guard
     def _skip(self) -> bool:
         """Check if capture should be skipped based on visible applications.
@@ -442,7 +920,11 @@ class Screen(Observer):
         Returns:
             bool: True if capture should be skipped, False otherwise.
         """
-        return _is_app_visible(self._guard) if self._guard else False
+        if not self._guard:
+            return False
+        if self._visibility is not None:
+            return self._visibility.watched_visible  # snapshot, refreshed in the background
+        return _is_app_visible(self._guard)
 
     # ─────────────────────────────── main async worker
     async def _worker(self) -> None:          # overrides base class
@@ -461,16 +943,24 @@ class Screen(Observer):
             log.addHandler(logging.NullHandler())
             log.propagate = False
 
-        CAP_FPS  = self._CAPTURE_FPS
         DEBOUNCE = self._DEBOUNCE_SEC
 
         loop = asyncio.get_running_loop()
 
         # ------------------------------------------------------------------
-        # All calls to mss / Quartz are wrapped in `to_thread`
+        # mss grabs run on the capture thread; the loop only reads its frames
         # ------------------------------------------------------------------
-        sct = mss.mss()  # Create mss context in main thread
-        mons = sct.monitors[self._MON_START:]
+        capture = self._capture = CaptureThread(self._capture_config, mon_start=self._MON_START)
+        capture.start()
+        await asyncio.to_thread(capture.ready.wait, 5.0)
+        if capture.error is not None or not capture.ready.is_set():
+            raise RuntimeError(f"Screen capture thread failed to start: {capture.error}")
+        mons = capture.monitors
+
+        # ---- skip guard: visibility is refreshed off the loop ----
+        if self._guard and Quartz is not None:
+            self._visibility = WindowVisibility(self._guard, _visible_owners, ttl=self.visibility_ttl)
+            await asyncio.to_thread(self._visibility.start)
 
         # ---- mouse event reception ----
         async def mouse_event(x: float, y: float, typ: str):
@@ -482,38 +972,53 @@ class Screen(Observer):
                 typ (str): Event type ("move", "click", or "scroll").
             """
             idx = self._mon_for(x, y, mons)
+            if typ != "move" and self._visibility is not None:
+                self._visibility.invalidate()  # a click or scroll may raise another window
+            guarded = self._skip()
             log.info(
-                f"{typ:<6} @({x:7.1f},{y:7.1f}) → mon={idx}   {'(guarded)' if self._skip() else ''}"
+                f"{typ:<6} @({x:7.1f},{y:7.1f}) → mon={idx}   {'(guarded)' if guarded else ''}"
             )
-            if self._skip() or idx is None:
+            if guarded or idx is None:
                 return
+            capture.note_activity(idx)
 
             # lazily grab before-frame
             if self._pending_event is None:
-                async with self._frame_lock:
-                    bf = self._frames.get(idx)
+                bf = None
+                if not capture.scheduler.is_stale(idx):
+                    bf = capture.latest(idx)
                 if bf is None:
-                    # Wait a bit for frames to be populated
-                    await asyncio.sleep(0.1)
-                    async with self._frame_lock:
-                        bf = self._frames.get(idx)
-                    if bf is None:
+                    # idle or lazy monitor: its last frame may predate what the user sees now
+                    try:
+                        bf = await capture.grab(idx)
+                    except Exception as e:
+                        log.error(f"Failed to grab frame for monitor {idx}: {e}")
                         return
-                self._pending_event = {"type": typ, "mon": idx, "before": bf}
+                if self._pending_event is not None:
+                    # another event set it while we waited for the grab
+                    bf.release()
+                else:
+                    self._pending_event = {"type": typ, "mon": idx, "before": bf, "time": time.monotonic()}
 
             # reset debounce timer
             if self._debounce_handle:
                 self._debounce_handle.cancel()
             self._debounce_handle = loop.call_later(DEBOUNCE, debounce_flush)
 
-        # ---- mouse callbacks (pynput is sync → schedule into loop) ----
+        # ---- mouse callbacks (pynput is sync → coalesced into the loop) ----
         def schedule_event(x: float, y: float, typ: str):
-            asyncio.run_coroutine_threadsafe(mouse_event(x, y, typ), loop)
+            """Start handling an event; runs on the loop."""
+            task = loop.create_task(mouse_event(x, y, typ))
+            self._event_tasks.add(task)
+            task.add_done_callback(self._event_tasks.discard)
 
+        coalescer = self._input = MouseCoalescer(
+            loop, schedule_event, lambda x, y: self._mon_for(x, y, mons), rate_hz=self.move_rate_hz
+        )
         listener = mouse.Listener(
-            on_move=lambda x, y: schedule_event(x, y, "move"),
-            on_click=lambda x, y, btn, prs: schedule_event(x, y, "click") if prs else None,
-            on_scroll=lambda x, y, dx, dy: schedule_event(x, y, "scroll"),
+            on_move=coalescer.move,
+            on_click=lambda x, y, btn, prs: coalescer.click(x, y) if prs else None,
+            on_scroll=lambda x, y, dx, dy: coalescer.scroll(x, y),
         )
         listener.start()
 
@@ -522,54 +1027,52 @@ class Screen(Observer):
             """Process pending event and emit update."""
             if self._pending_event is None:
                 return
-            if self._skip():
-                self._pending_event = None
+            ev, self._pending_event = self._pending_event, None
+            try:
+                if self._skip():
+                    return
+                await emit(ev)
+            finally:
+                ev["before"].release()
+
+        async def emit(ev: dict):
+            """Grab the after-frame of *ev* and analyse the pair if anything changed."""
+            flush_time = time.monotonic()
+            with await capture.grab(ev["mon"]) as aft:
+                self._stats["flushes"] += 1
+                encoded = await self._encode_interaction(ev, aft)
+            if encoded is None:
+                log.info(f"{ev['type']} on monitor {ev['mon']} left the screen unchanged — skipped")
                 return
-
-            ev = self._pending_event
-            aft = sct.grab(mons[ev["mon"] - 1])  # Use sct directly, not in thread
-
-            bef_path = await self._save_frame(ev["before"], "before")
-            aft_path = await self._save_frame(aft, "after")
-            await self._process_and_emit(bef_path, aft_path)
+            await self._analyse_interaction(ev, encoded, flush_time)
 
             log.info(f"{ev['type']} captured on monitor {ev['mon']}")
-            self._pending_event = None
 
         def debounce_flush():
             """Schedule flush as a task."""
             asyncio.run_coroutine_threadsafe(flush(), loop)
 
-        # ---- main capture loop ----
+        # ---- main loop: capture runs on its own thread ----
         log.info(f"Screen observer started — guarding {self._guard or '∅'}")
-        
-        # Add initial frame population
-        for idx, m in enumerate(mons, 1):
-            try:
-                frame = sct.grab(m)  # Use sct directly
-                async with self._frame_lock:
-                    self._frames[idx] = frame
-            except Exception as e:
-                log.error(f"Failed to populate frame for monitor {idx}: {e}")
-
-        while self._running:                         # flag from base class
-            t0 = time.time()
-
-            # refresh 'before' buffers
-            for idx, m in enumerate(mons, 1):
+        try:
+            while self._running and capture.is_alive():   # flag from base class
+                await asyncio.sleep(0.5)
+            if capture.error is not None:
+                raise RuntimeError(f"Screen capture thread failed: {capture.error}")
+        finally:
+            # shutdown
+            listener.stop()
+            coalescer.close()
+            if self._visibility is not None:
+                await asyncio.to_thread(self._visibility.stop)
+            if self._debounce_handle:
+                self._debounce_handle.cancel()
+            await asyncio.to_thread(capture.stop)
+            if self._buffer is not None:
+                # analyse what is still buffered before exiting
                 try:
-                    frame = sct.grab(m)  # Use sct directly
-                    async with self._frame_lock:
-                        self._frames[idx] = frame
+                    await self._buffer.cleanup()
                 except Exception as e:
-                    log.error(f"Failed to refresh frame for monitor {idx}: {e}")
-
-            # fps throttle
-            dt = time.time() - t0
-            await asyncio.sleep(max(0, (1 / CAP_FPS) - dt))
-
-        # shutdown
-        listener.stop()
-        if self._debounce_handle:
-            self._debounce_handle.cancel()
-        sct.close()  # Close mss context
+                    log.error(f"Failed to flush screen buffers: {e}")
+            if self._pending_writes:
+                await asyncio.gather(*self._pending_writes, return_exceptions=True)
@@ -0,0 +1,166 @@
+"""
+Window-visibility snapshots for the Screen observer's skip guard.
+
+The guard ("do not capture while any of these apps is visible") used to
+enumerate every window and compute its visible area with general polygon
+unions on each check, and a check ran several times per mouse event.
+
+:class:`WindowVisibility` computes visibility once per refresh on a
+background thread instead: every ``ttl`` seconds, or as soon as
+:meth:`~WindowVisibility.invalidate` signals a likely window change (a click
+raising another window, for instance). Each refresh stores whether a watched
+app is visible, so a guard check is a single attribute read.
+
+Window bounds are axis-aligned rectangles, so occlusion is computed by
+rectangle subtraction: a window's rectangle is split into the fragments not
+covered by each window in front of it, and whatever area is left is visible.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[float, float, float, float]  # (left, top, right, bottom)
+
+
+def subtract_rect(pieces: List[Rect], occluder: Rect) -> List[Rect]:
+    """Parts of *pieces* not covered by *occluder* (at most four fragments per piece)."""
+    ox0, oy0, ox1, oy1 = occluder
+    result: List[Rect] = []
+    for piece in pieces:
+        x0, y0, x1, y1 = piece
+        if ox0 >= x1 or ox1 <= x0 or oy0 >= y1 or oy1 <= y0:
+            result.append(piece)
+            continue
+        if oy0 > y0:
+            result.append((x0, y0, x1, oy0))            # above
+        if oy1 < y1:
+            result.append((x0, oy1, x1, y1))            # below
+        top, bottom = max(y0, oy0), min(y1, oy1)
+        if ox0 > x0:
+            result.append((x0, top, ox0, bottom))       # left
+        if ox1 < x1:
+            result.append((ox1, top, x1, bottom))       # right
+    return result
+
+
+def occlusion_ratios(rects: Sequence[Rect]) -> List[float]:
+    """Visible share of each rectangle, given front-to-back order."""
+    ratios: List[float] = []
+    for i, rect in enumerate(rects):
+        x0, y0, x1, y1 = rect
+        area = (x1 - x0) * (y1 - y0)
+        if area <= 0:
+            ratios.append(0.0)
+            continue
+        pieces = [rect]
+        for occluder in rects[:i]:
+            pieces = subtract_rect(pieces, occluder)
+            if not pieces:
+                break
+        ratios.append(sum((p[2] - p[0]) * (p[3] - p[1]) for p in pieces) / area)
+    return ratios
+
+
+class VisibilitySnapshot(NamedTuple):
+    """Result of one refresh."""
+
+    owners: FrozenSet[str]      # apps with at least one partly visible window
+    watched_visible: bool       # whether any watched app is among them
+    taken_at: float             # time.monotonic() of the refresh
+
+
+class WindowVisibility:
+    """
+    Keeps a periodically refreshed snapshot of which apps are visible.
+
+    Not started: reads return the initial snapshot, which counts watched apps
+    as visible so that nothing is captured before the first refresh.
+    """
+
+    def __init__(
+        self,
+        watch: Iterable[str],
+        visible_owners: Callable[[], Iterable[str]],
+        ttl: float = 0.5,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            watch: App names whose visibility is checked by :attr:`watched_visible`
+            visible_owners: Returns the names of apps with a visible window
+            ttl: Seconds between refreshes
+        """
+        self.watch = frozenset(watch)
+        self.visible_owners = visible_owners
+        self.ttl = ttl
+        self.snapshot = VisibilitySnapshot(frozenset(), bool(self.watch), 0.0)
+
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._stats = {"refreshes": 0, "invalidations": 0, "failures": 0, "refresh_ms": 0.0}
+
+    @property
+    def watched_visible(self) -> bool:
+        """Whether a watched app was visible at the last refresh."""
+        return self.snapshot.watched_visible
+
+    def refresh(self) -> VisibilitySnapshot:
+        """Recompute the snapshot now (normally done by the background thread)."""
+        start = time.perf_counter()
+        try:
+            owners = frozenset(self.visible_owners())
+        except Exception as e:
+            # keep guarding: an unknown screen state counts as visible
+            self._stats["failures"] += 1
+            logger.error(f"Failed to list visible windows: {e}")
+            self.snapshot = VisibilitySnapshot(self.snapshot.owners, bool(self.watch), time.monotonic())
+            return self.snapshot
+        self.snapshot = VisibilitySnapshot(owners, not owners.isdisjoint(self.watch), time.monotonic())
+        self._stats["refreshes"] += 1
+        self._stats["refresh_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return self.snapshot
+
+    def invalidate(self) -> None:
+        """Refresh as soon as possible, e.g. after an event that may have changed windows."""
+        self._stats["invalidations"] += 1
+        self._wake.set()
+
+    def start(self) -> None:
+        """Take a first snapshot and keep refreshing on a background thread."""
+        self.refresh()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="gum-window-visibility", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+            if not self._stopping.is_set():
+                self.refresh()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Refresh counters, the last refresh's duration and the snapshot's age."""
+        taken_at = self.snapshot.taken_at
+        return {
+            **self._stats,
+            "ttl": self.ttl,
+            "age_sec": round(time.monotonic() - taken_at, 3) if taken_at else None,
+            "watched_visible": self.snapshot.watched_visible,
+        }
@@ -14,6 +14,8 @@ DO NOT make assumptions about:
 
 Provide complete word-for-word transcription with ONLY observable interface context."""
 
+ROI_NOTE = """The first two images are the before and after views of the part of the screen that changed, cropped from the full display. The last image is a small view of the whole screen, included only so you can tell which application and window the crop belongs to; transcribe the cropped images."""
+
 SUMMARY_PROMPT = """Analyze the screenshots to understand what the user is doing based on clearly visible evidence.
 
 Focus on what you can definitively observe:
@@ -28,4 +30,22 @@ Focus on what you can definitively observe:
 
 IMPORTANT: Only make observations based on clearly visible evidence. If something is unclear or not visible, do not make assumptions about it.
 
-Generate 3-4 specific observations about what you can clearly see the user doing."""
\ No newline at end of file
+Generate 3-4 specific observations about what you can clearly see the user doing."""
+ROLLING_SUMMARY_PROMPT = """Recent activity so far (your previous summary):
+{activity}
+
+The screenshots show the user's latest interaction (before and after). Update the picture of what the user is doing with this new evidence, keeping what is still relevant from the recent activity.
+
+{summary_prompt}"""
+
+NO_ACTIVITY_YET = "(nothing yet: this is the first interaction)"
+
+COMBINED_CONTEXT_NOTE = """, then a small view of the whole screen (the before and after screenshots are crops of the part of the screen that changed; the small view only shows which application and window they belong to)"""
+
+COMBINED_PROMPT = """You are given {history} earlier screenshots, then the before and after screenshots of the user's latest interaction{context}. Complete both tasks below and answer with a JSON object with exactly two string fields, "transcription" and "summary".
+
+Task "transcription" (the before and after screenshots only):
+{transcription_prompt}
+
+Task "summary" (all screenshots):
+{summary_prompt}"""
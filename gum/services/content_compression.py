@@ -0,0 +1,217 @@
+"""
+Observation Content Compression Maintenance
+
+New observations are compressed as they are written (see
+:mod:`gum.compression`). :class:`ContentCompressor` handles everything
+else:
+
+- compressing the backlog of rows written before compression was enabled,
+  in bounded batches through the database writer;
+- training a dictionary on recent screen transcriptions and re-compressing
+  older rows against it;
+- reporting the compression ratio of the stored content.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import LargeBinary, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..compression import (
+    CompressionConfig,
+    compress_content,
+    compression_totals,
+    decompress_content,
+    get_compression_config,
+    train_dictionary,
+)
+from ..models import ContentDictionary, Observation, content_dictionaries
+from .db_writer import DatabaseWriter
+
+logger = logging.getLogger(__name__)
+
+SCREEN_OBSERVER = "Screen"
+
+
+class ContentCompressor:
+    """
+    Backlog compression, dictionary training and ratio reporting.
+
+    Only meaningful on SQLite; PostgreSQL stores content uncompressed and
+    relies on TOAST.
+    """
+
+    def __init__(
+        self,
+        Session: async_sessionmaker[AsyncSession],
+        writer: DatabaseWriter,
+        config: Optional[CompressionConfig] = None,
+    ):
+        """
+        Initialize the compressor.
+
+        Args:
+            Session: Session factory of the GUM database
+            writer: The database's writer
+            config: Compression configuration (defaults to the process-wide one)
+        """
+        self.Session = Session
+        self.writer = writer
+        self.config = config or get_compression_config()
+        self.dictionaries = content_dictionaries(writer.engine.sync_engine)
+        self._last_report: Optional[Dict[str, Any]] = None
+
+    # ─────────────────────────────── dictionary
+    async def train(self, observer_name: str = SCREEN_OBSERVER) -> Dict[str, Any]:
+        """Train a dictionary on recent *observer_name* observations and make it active.
+
+        Returns:
+            The new dictionary's id, codec, size and sample count
+
+        Raises:
+            ValueError: If there are too few observations to train on, or they share
+                nothing a dictionary could hold.
+        """
+        codec = self.config.resolved_codec()
+        async with self.Session() as session:
+            rows = (await session.execute(
+                select(Observation._content, Observation.content_codec)
+                .where(Observation.observer_name == observer_name)
+                .order_by(Observation.id.desc())
+                .limit(self.config.dictionary_samples)
+            )).all()
+        samples = [decompress_content(stored, row_codec, self.dictionaries) for stored, row_codec in rows]
+        data = train_dictionary(samples, codec, self.config.dictionary_size)
+
+        async def _store(session: AsyncSession) -> int:
+            entry = ContentDictionary(codec=codec, data=data, sample_count=len(samples))
+            session.add(entry)
+            await session.flush()
+            return entry.id
+
+        dictionary_id = await self.writer.submit(_store, label="content_dictionary")
+        self.dictionaries.register(dictionary_id, codec, data, activate=True)
+        logger.info(
+            f"Trained {codec} content dictionary {dictionary_id} "
+            f"({len(data)} bytes from {len(samples)} observations)"
+        )
+        return {"id": dictionary_id, "codec": codec, "bytes": len(data), "samples": len(samples)}
+
+    # ─────────────────────────────── backlog
+    def _backlog_filter(self, recompress: bool):
+        plain = Observation.content_codec.is_(None) & (
+            func.length(Observation._content) >= self.config.min_bytes
+        )
+        dictionary_id = self.dictionaries.active
+        if not recompress or dictionary_id is None:
+            return plain
+        # rows compressed before the active dictionary existed
+        return plain | (
+            Observation.content_codec.is_not(None)
+            & Observation.content_codec.not_like(f"%:{dictionary_id}")
+        )
+
+    async def _compress_batch(self, session: AsyncSession, recompress: bool, limit: int) -> Dict[str, int]:
+        rows = (await session.execute(
+            select(Observation.id, Observation._content, Observation.content_codec)
+            .where(self._backlog_filter(recompress))
+            .order_by(Observation.id)
+            .limit(limit)
+        )).all()
+        stats = {"rows": len(rows), "compressed": 0, "bytes_before": 0, "bytes_after": 0}
+        table = Observation.__table__
+        for obs_id, stored, codec in rows:
+            text = decompress_content(stored, codec, self.dictionaries)
+            payload, new_codec = compress_content(text, self.config, self.dictionaries)
+            before = len(stored) if isinstance(stored, bytes) else len(stored.encode("utf-8"))
+            after = len(payload) if isinstance(payload, bytes) else len(payload.encode("utf-8"))
+            stats["bytes_before"] += before
+            if new_codec is None or new_codec == codec or after >= before:
+                stats["bytes_after"] += before
+                continue
+            # keep updated_at: recompression is not a content change
+            await session.execute(
+                update(table)
+                .where(table.c.id == obs_id)
+                .values(content=payload, content_codec=new_codec, updated_at=table.c.updated_at)
+            )
+            stats["compressed"] += 1
+            stats["bytes_after"] += after
+        return stats
+
+    async def run(self, batch_size: int = 500, max_batches: int = 20, recompress: bool = False) -> Dict[str, Any]:
+        """Compress up to ``batch_size * max_batches`` backlog rows.
+
+        Args:
+            batch_size: Rows compressed per write transaction
+            max_batches: Upper bound on transactions this run
+            recompress: Also re-compress rows not using the active dictionary
+
+        Returns:
+            Report with rows compressed and stored bytes before/after
+        """
+        start = time.perf_counter()
+        totals = {"rows": 0, "compressed": 0, "bytes_before": 0, "bytes_after": 0}
+        for _ in range(max_batches):
+            stats = await self.writer.submit(
+                lambda s: self._compress_batch(s, recompress, batch_size), label="content_compression"
+            )
+            for key, value in stats.items():
+                totals[key] += value
+            if stats["rows"] < batch_size or stats["compressed"] == 0:
+                break
+        report = {
+            **totals,
+            "bytes_saved": totals["bytes_before"] - totals["bytes_after"],
+            "ratio": round(totals["bytes_before"] / totals["bytes_after"], 3) if totals["bytes_after"] else None,
+            "dictionary": self.dictionaries.active,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        self._last_report = report
+        return report
+
+    # ─────────────────────────────── stats
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get the stored compression ratio, backlog size and dictionaries.
+
+        Measuring the uncompressed size decompresses every compressed row.
+        """
+        async with self.Session() as session:
+            stored = func.length(Observation._content)
+            total, compressed, stored_bytes, raw_bytes = (await session.execute(
+                select(
+                    func.count(),
+                    func.count(Observation.content_codec),
+                    func.coalesce(func.sum(stored).filter(Observation.content_codec.is_not(None)), 0),
+                    func.coalesce(
+                        func.sum(func.length(cast(Observation.content, LargeBinary)))
+                        .filter(Observation.content_codec.is_not(None)),
+                        0,
+                    ),
+                )
+            )).one()
+            backlog = (await session.execute(
+                select(func.count()).select_from(Observation).where(self._backlog_filter(False))
+            )).scalar_one()
+            dictionaries: List[Dict[str, Any]] = [
+                {"id": d.id, "codec": d.codec, "bytes": len(d.data), "samples": d.sample_count}
+                for d in (await session.execute(
+                    select(ContentDictionary).order_by(ContentDictionary.id)
+                )).scalars()
+            ]
+        return {
+            "codec": self.config.codec if not self.config.enabled else self.config.resolved_codec(),
+            "min_bytes": self.config.min_bytes,
+            "observations": total,
+            "compressed_observations": compressed,
+            "compressed_stored_bytes": stored_bytes,
+            "compressed_raw_bytes": raw_bytes,
+            "ratio": round(raw_bytes / stored_bytes, 3) if stored_bytes else None,
+            "backlog": backlog,
+            "active_dictionary": self.dictionaries.active,
+            "dictionaries": dictionaries,
+            "process_totals": compression_totals(),
+            "last_run": self._last_report,
+        }
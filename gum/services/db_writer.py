@@ -0,0 +1,377 @@
+"""
+Single-Writer Database Actor
+
+SQLite allows one writer at a time. With every call site opening its own
+transaction, concurrent writers (the update handler, Gumbo, the controller's
+admin endpoints, the video pipeline) serialize on the WAL write lock and
+spin through ``busy_timeout``, and each tiny transaction pays its own commit.
+
+:class:`DatabaseWriter` owns the single write connection instead. Call sites
+submit *write intents* — short async callables that receive an
+``AsyncSession`` — and the writer task executes everything that arrives within
+a few milliseconds of each other inside one transaction (group commit; on
+SQLite a ``BEGIN IMMEDIATE`` one). Each intent runs under its own SAVEPOINT, so a failing intent
+is rolled back and reported to its submitter without affecting the others.
+
+Intents must only touch the database: no LLM calls or other slow awaits, as
+they hold the write transaction for the whole group.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from ..storage import get_backend
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteFn = Callable[[AsyncSession], Awaitable[Any]]
+
+# Writers by absolute database path, so code that only holds a session can
+# find the writer owning its database (see :func:`run_write`).
+_writers: Dict[str, "DatabaseWriter"] = {}
+
+
+@dataclass
+class WriterConfig:
+    """Configuration settings for the single-writer actor."""
+
+    group_window_ms: float = 4.0   # how long to wait for more intents after the first
+    max_group_size: int = 128      # intents committed per transaction, at most
+    queue_size: int = 10_000       # back-pressure: submit() waits when full
+    metrics_window: int = 1000     # recent groups/intents kept for percentiles
+
+    @classmethod
+    def from_environment(cls) -> 'WriterConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            group_window_ms=float(os.getenv('GUM_WRITER_GROUP_WINDOW_MS', 4.0)),
+            max_group_size=int(os.getenv('GUM_WRITER_MAX_GROUP_SIZE', 128)),
+            queue_size=int(os.getenv('GUM_WRITER_QUEUE_SIZE', 10_000)),
+        )
+
+
+@dataclass
+class _WriteIntent:
+    fn: WriteFn
+    label: str
+    transactional: bool
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def _percentiles(values) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50": round(pick(0.50), 3),
+        "p95": round(pick(0.95), 3),
+        "p99": round(pick(0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _database_key(bind: Any) -> Optional[str]:
+    """Absolute database path (server URL for client/server databases) of a bind."""
+    url = getattr(bind, "url", None)
+    database = getattr(url, "database", None)
+    if not database or database == ":memory:":
+        return None
+    if url.get_backend_name() != "sqlite":
+        return url.render_as_string(hide_password=True)
+    return os.path.abspath(os.path.expanduser(database))
+
+
+class DatabaseWriter:
+    """
+    Actor that owns the write connection and group-commits write intents.
+
+    Usage::
+
+        writer = DatabaseWriter(engine)
+        await writer.start()
+
+        async def _insert(session):
+            session.add(obj)
+            await session.flush()
+            return obj.id
+
+        obj_id = await writer.submit(_insert, label="observation")
+    """
+
+    def __init__(self, engine: AsyncEngine, config: Optional[WriterConfig] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            engine: Engine of the database to write to
+            config: Writer configuration (defaults to environment)
+        """
+        self.engine = engine
+        self.config = config or WriterConfig.from_environment()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+        window = self.config.metrics_window
+        self._group_sizes: Deque[int] = deque(maxlen=window)
+        self._commit_ms: Deque[float] = deque(maxlen=window)
+        self._wait_ms: Deque[float] = deque(maxlen=window)
+        self._latency_ms: Deque[float] = deque(maxlen=window)
+        self._commits: Deque[Tuple[float, int]] = deque(maxlen=window)  # (time, intents)
+        self._counters = {
+            "groups_committed": 0,
+            "groups_failed": 0,
+            "intents_committed": 0,
+            "intents_failed": 0,
+        }
+        self._by_label: Dict[str, int] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer task is accepting intents."""
+        return self._task is not None and not self._task.done()
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Open the write connection and start the writer task."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.config.queue_size)
+        self._conn = await self.engine.connect()
+        self._task = asyncio.create_task(self._worker())
+        key = _database_key(self.engine)
+        if key:
+            _writers[key] = self
+        logger.info(f"Database writer started (group window {self.config.group_window_ms} ms)")
+
+    async def stop(self):
+        """Commit everything already queued, then stop the writer task."""
+        if not self.running:
+            return
+        key = _database_key(self.engine)
+        if key and _writers.get(key) is self:
+            del _writers[key]
+
+        await self._queue.put(None)  # sentinel, processed after pending intents
+        try:
+            await asyncio.wait_for(self._task, timeout=10.0)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+        logger.info("Database writer stopped")
+
+    # ─────────────────────────────── submission
+    async def submit(self, fn: Callable[[AsyncSession], Awaitable[T]], *,
+                     label: str = "write", transactional: bool = True) -> T:
+        """Queue a write intent and wait until it is committed.
+
+        Args:
+            fn: Async callable receiving the writer's session. Objects it adds
+                are flushed and detached after commit, with loaded attributes
+                (including primary keys) still readable.
+            label: Name used in per-caller metrics
+            transactional: If False the intent runs alone, outside any
+                transaction (e.g. ``VACUUM``)
+
+        Returns:
+            Whatever *fn* returned, once its group has committed
+
+        Raises:
+            RuntimeError: If the writer is not running.
+            Exception: Whatever *fn* raised; its changes are rolled back.
+        """
+        if not self.running:
+            raise RuntimeError("Database writer is not running")
+        intent = _WriteIntent(fn, label, transactional, asyncio.get_running_loop().create_future())
+        await self._queue.put(intent)
+        return await intent.future
+
+    # ─────────────────────────────── writer task
+    async def _worker(self):
+        """Collect intents into groups and commit them."""
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            group: List[_WriteIntent] = [first]
+
+            if first.transactional:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.config.group_window_ms / 1000
+                while len(group) < self.config.max_group_size:
+                    try:
+                        nxt = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            nxt = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    if nxt is None:
+                        stopping = True
+                        break
+                    if not nxt.transactional:
+                        # run the group first, then the standalone intent
+                        await self._commit_group(group)
+                        group = []
+                        await self._run_standalone(nxt)
+                        break
+                    group.append(nxt)
+                if group:
+                    await self._commit_group(group)
+            else:
+                await self._run_standalone(first)
+
+        # drain anything submitted before stop() was called
+        while not self._queue.empty():
+            intent = self._queue.get_nowait()
+            if intent is not None:
+                await (self._commit_group([intent]) if intent.transactional
+                       else self._run_standalone(intent))
+
+    async def _commit_group(self, group: List[_WriteIntent]):
+        """Run *group* inside one transaction, one SAVEPOINT per intent."""
+        started = time.perf_counter()
+        for intent in group:
+            self._wait_ms.append((started - intent.enqueued_at) * 1000)
+
+        results: List[Tuple[_WriteIntent, Any]] = []
+        session = AsyncSession(bind=self._conn, expire_on_commit=False, autoflush=False)
+        try:
+            await get_backend(self._conn).begin_write(session)
+            for intent in group:
+                try:
+                    async with session.begin_nested():
+                        result = await intent.fn(session)
+                        await session.flush()
+                    results.append((intent, result))
+                except Exception as e:
+                    self._fail(intent, e)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(group)} write intents failed: {e}")
+            try:
+                await session.rollback()
+            except Exception:
+                pass  # connection already out of the transaction
+            self._counters["groups_failed"] += 1
+            # intents that ran are rolled back; the rest never got to run
+            for intent in group:
+                if not intent.future.done():
+                    self._fail(intent, e)
+            return
+        finally:
+            session.expunge_all()
+            await session.close()
+
+        done = time.perf_counter()
+        self._counters["groups_committed"] += 1
+        self._group_sizes.append(len(group))
+        self._commit_ms.append((done - started) * 1000)
+        self._commits.append((time.monotonic(), len(results)))
+        for intent, result in results:
+            self._succeed(intent, result, done)
+
+    async def _run_standalone(self, intent: _WriteIntent):
+        """Run a non-transactional intent on the write connection."""
+        started = time.perf_counter()
+        self._wait_ms.append((started - intent.enqueued_at) * 1000)
+        session = AsyncSession(bind=self._conn, expire_on_commit=False, autoflush=False)
+        try:
+            result = await intent.fn(session)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            self._fail(intent, e)
+            return
+        finally:
+            session.expunge_all()
+            await session.close()
+        done = time.perf_counter()
+        self._commit_ms.append((done - started) * 1000)
+        self._commits.append((time.monotonic(), 1))
+        self._succeed(intent, result, done)
+
+    def _succeed(self, intent: _WriteIntent, result: Any, done: float):
+        self._counters["intents_committed"] += 1
+        self._by_label[intent.label] = self._by_label.get(intent.label, 0) + 1
+        self._latency_ms.append((done - intent.enqueued_at) * 1000)
+        if not intent.future.done():
+            intent.future.set_result(result)
+
+    def _fail(self, intent: _WriteIntent, exc: BaseException):
+        self._counters["intents_failed"] += 1
+        if not intent.future.done():
+            intent.future.set_exception(exc)
+
+    # ─────────────────────────────── stats
+    def get_stats(self) -> Dict[str, Any]:
+        """Get group-commit batch sizes, latencies and throughput."""
+        now = time.monotonic()
+        recent = [n for t, n in self._commits if now - t <= 60.0]
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            **self._counters,
+            "group_size": {
+                "mean": round(statistics.fmean(self._group_sizes), 2) if self._group_sizes else None,
+                **_percentiles(self._group_sizes),
+            },
+            "queue_wait_ms": _percentiles(self._wait_ms),
+            "commit_ms": _percentiles(self._commit_ms),
+            "latency_ms": _percentiles(self._latency_ms),
+            "intents_per_second_1m": round(sum(recent) / 60.0, 2),
+            "intents_by_label": dict(self._by_label),
+            "config": {
+                "group_window_ms": self.config.group_window_ms,
+                "max_group_size": self.config.max_group_size,
+            },
+        }
+
+
+def get_database_writer(bind: Any) -> Optional[DatabaseWriter]:
+    """Return the running writer for the database behind *bind*, if any.
+
+    Args:
+        bind: An engine, connection or anything with a ``url`` attribute
+    """
+    key = _database_key(bind)
+    writer = _writers.get(key) if key else None
+    return writer if writer is not None and writer.running else None
+
+
+async def run_write(session: AsyncSession, fn: Callable[[AsyncSession], Awaitable[T]], *,
+                    label: str = "write") -> T:
+    """Run a write intent through the database's writer, or directly on *session*.
+
+    Lets code that is handed a session (e.g. the Gumbo engine) use group
+    commit when a :class:`DatabaseWriter` owns the database, and keep the old
+    commit-on-the-caller's-session behaviour otherwise.
+    """
+    writer = get_database_writer(session.bind)
+    if writer is not None:
+        return await writer.submit(fn, label=label)
+    result = await fn(session)
+    await session.commit()
+    return result
@@ -0,0 +1,465 @@
+"""
+FTS5 Maintenance Scheduler
+
+Background maintenance for the ``propositions_fts`` and ``observations_fts``
+indexes. Both tables only ever receive trigger-based inserts and deletes, so
+every committed transaction adds a new b-tree segment. FTS5 merges segments
+opportunistically (``automerge``), but under continuous screen capture the
+segment count still creeps up and MATCH latency degrades.
+
+The scheduler watches the segment structure of each index and, whenever GUM
+has been idle for a while, spends a bounded time budget on incremental
+``merge`` work (or a full ``optimize`` for small tables). MATCH latency is
+probed before and after each maintenance run so the effect is observable.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from ..models import FTS_PREFIX, OBSERVATIONS_FTS_BACKFILL
+
+logger = logging.getLogger(__name__)
+
+# FTS tables maintained by the scheduler
+FTS_TABLES = ("propositions_fts", "observations_fts")
+
+# rowid of the structure record in the ``<table>_data`` shadow table
+_FTS5_STRUCTURE_ROWID = 10
+_FTS5_STRUCTURE_V2 = b"\xff\x00\x00\x01"
+
+
+@dataclass
+class FTSMaintenanceConfig:
+    """Configuration settings for FTS5 index maintenance."""
+
+    # Scheduling
+    check_interval_seconds: float = 60.0
+    idle_seconds: float = 30.0          # no writes for this long == idle
+    time_budget_seconds: float = 0.5    # max wall time spent per table per run
+
+    # Merge tuning
+    merge_pages: int = 256              # pages written per 'merge' step
+    segment_threshold: int = 12         # start merging above this many segments
+    optimize_max_rows: int = 20_000     # full 'optimize' allowed below this size
+
+    # FTS5 configuration options applied on start
+    automerge: int = 8
+    crisismerge: int = 32
+    usermerge: int = 4
+
+    # Latency probes
+    probe_terms: int = 5
+    probe_repeats: int = 3
+
+    @classmethod
+    def from_environment(cls) -> 'FTSMaintenanceConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            check_interval_seconds=float(os.getenv('FTS_MAINT_INTERVAL', 60.0)),
+            idle_seconds=float(os.getenv('FTS_MAINT_IDLE_SECONDS', 30.0)),
+            time_budget_seconds=float(os.getenv('FTS_MAINT_TIME_BUDGET', 0.5)),
+            merge_pages=int(os.getenv('FTS_MAINT_MERGE_PAGES', 256)),
+            segment_threshold=int(os.getenv('FTS_MAINT_SEGMENT_THRESHOLD', 12)),
+            optimize_max_rows=int(os.getenv('FTS_MAINT_OPTIMIZE_MAX_ROWS', 20_000)),
+            automerge=int(os.getenv('FTS_MAINT_AUTOMERGE', 8)),
+            crisismerge=int(os.getenv('FTS_MAINT_CRISISMERGE', 32)),
+            usermerge=int(os.getenv('FTS_MAINT_USERMERGE', 4)),
+        )
+
+
+def _read_varint(buf: bytes, i: int) -> Tuple[int, int]:
+    """Decode an SQLite varint from ``buf`` at offset ``i``.
+
+    Returns:
+        (value, new_offset)
+    """
+    value = 0
+    for n in range(9):
+        byte = buf[i + n]
+        if n == 8:
+            return (value << 8) | byte, i + 9
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, i + n + 1
+    return value, i + 9  # pragma: no cover (unreachable)
+
+
+def parse_fts5_structure(blob: bytes) -> Dict[str, Any]:
+    """Parse an FTS5 structure record into level / segment counts.
+
+    Args:
+        blob: Contents of ``<table>_data`` at the structure rowid.
+
+    Returns:
+        Dictionary with ``levels``, ``segments``, ``write_counter`` and a
+        per-level list of segment counts.
+    """
+    i = 4  # skip cookie
+    v2 = blob[i:i + 4] == _FTS5_STRUCTURE_V2
+    if v2:
+        i += 4
+
+    n_level, i = _read_varint(blob, i)
+    n_segment, i = _read_varint(blob, i)
+    write_counter, i = _read_varint(blob, i)
+    if v2:
+        _, i = _read_varint(blob, i)  # origin counter
+
+    per_level: List[int] = []
+    for _ in range(n_level):
+        _, i = _read_varint(blob, i)          # segments in ongoing merge
+        n_total, i = _read_varint(blob, i)
+        per_level.append(n_total)
+        for _ in range(n_total):
+            for _ in range(8 if v2 else 3):   # segid, first, last (+ v2 extras)
+                _, i = _read_varint(blob, i)
+
+    return {
+        "levels": n_level,
+        "segments": n_segment,
+        "write_counter": write_counter,
+        "segments_per_level": per_level,
+    }
+
+
+class FTSMaintenanceScheduler:
+    """
+    Idle-time maintenance for the FTS5 indexes.
+
+    Call :meth:`note_activity` whenever GUM writes to the database; the
+    background worker only touches the indexes once no write has happened
+    for ``idle_seconds``.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        config: Optional[FTSMaintenanceConfig] = None,
+        tables: Tuple[str, ...] = FTS_TABLES,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            engine: Async engine of the GUM database
+            config: Maintenance configuration (defaults to environment)
+            tables: FTS5 tables to maintain
+        """
+        self.engine = engine
+        self.config = config or FTSMaintenanceConfig.from_environment()
+        self.tables = tables
+
+        self._last_activity = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+
+        self._stats: Dict[str, Any] = {
+            "runs": 0,
+            "merge_steps": 0,
+            "optimizes": 0,
+            "last_run_at": None,
+            "last_report": None,
+        }
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Apply FTS5 merge options and start the background worker."""
+        if self._task is None or self._task.done():
+            await self.configure()
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._worker())
+            logger.info("FTS maintenance worker started")
+
+    async def stop(self):
+        """Stop the background worker."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            logger.info("FTS maintenance worker stopped")
+
+    def note_activity(self):
+        """Record a write so maintenance is deferred until the next idle period."""
+        self._last_activity = time.monotonic()
+
+    @property
+    def idle_for(self) -> float:
+        """Seconds since the last recorded write."""
+        return time.monotonic() - self._last_activity
+
+    async def _worker(self):
+        """Background loop that runs maintenance during idle periods."""
+        while not self._shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.config.check_interval_seconds,
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            if self.idle_for < self.config.idle_seconds:
+                continue
+
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"FTS maintenance run failed: {e}")
+
+    # ─────────────────────────────── configuration
+    async def configure(self):
+        """Apply ``automerge`` / ``crisismerge`` / ``usermerge`` to every table.
+
+        These options are persisted in the ``<table>_config`` shadow table, so
+        applying them once per start is enough.
+        """
+        cfg = self.config
+        async with self.engine.connect() as conn:
+            for table in self.tables:
+                if not await self._table_exists(conn, table):
+                    continue
+                for option, value in (
+                    ("automerge", cfg.automerge),
+                    ("crisismerge", cfg.crisismerge),
+                    ("usermerge", cfg.usermerge),
+                ):
+                    await conn.execute(
+                        text(f"INSERT INTO {table}({table}, rank) VALUES (:opt, :val)"),
+                        {"opt": option, "val": value},
+                    )
+            await conn.commit()
+
+    # ─────────────────────────────── inspection
+    @staticmethod
+    async def _table_exists(conn: AsyncConnection, table: str) -> bool:
+        row = (await conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+            {"name": table},
+        )).fetchone()
+        return row is not None
+
+    async def _segment_stats(self, conn: AsyncConnection, table: str) -> Optional[Dict[str, Any]]:
+        row = (await conn.execute(
+            text(f"SELECT block FROM {table}_data WHERE id = :id"),
+            {"id": _FTS5_STRUCTURE_ROWID},
+        )).fetchone()
+        if row is None or row[0] is None:
+            return None
+        try:
+            return parse_fts5_structure(bytes(row[0]))
+        except (IndexError, ValueError) as e:
+            logger.warning(f"Could not parse FTS5 structure record of {table}: {e}")
+            return None
+
+    async def _row_count(self, conn: AsyncConnection, table: str) -> int:
+        return (await conn.execute(text(f"SELECT count(*) FROM {table}_docsize"))).scalar() or 0
+
+    async def _has_prefix_index(self, conn: AsyncConnection, table: str) -> bool:
+        sql = (await conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+            {"name": table},
+        )).scalar() or ""
+        return "prefix=" in sql.replace(" ", "").lower()
+
+    async def _probe_terms(self, conn: AsyncConnection, table: str) -> List[str]:
+        """Pick the most common indexed terms as latency probes."""
+        vocab = f"temp.{table}_vocab_probe"
+        await conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {vocab} USING fts5vocab(main, {table}, row)"
+        ))
+        rows = (await conn.execute(
+            text(f"SELECT term FROM {vocab} WHERE length(term) > 2 ORDER BY doc DESC LIMIT :n"),
+            {"n": self.config.probe_terms},
+        )).fetchall()
+        return [r[0] for r in rows]
+
+    async def _match_latency_ms(self, conn: AsyncConnection, table: str, terms: List[str]) -> Optional[float]:
+        """Median latency of a top-10 ranked MATCH over the probe terms."""
+        if not terms:
+            return None
+        samples: List[float] = []
+        stmt = text(f"SELECT rowid FROM {table} WHERE {table} MATCH :q ORDER BY rank LIMIT 10")
+        for _ in range(self.config.probe_repeats):
+            for term in terms:
+                t0 = time.perf_counter()
+                (await conn.execute(stmt, {"q": f'"{term}"'})).fetchall()
+                samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples)
+
+    # ─────────────────────────────── maintenance
+    async def _total_changes(self, conn: AsyncConnection) -> int:
+        return (await conn.execute(text("SELECT total_changes()"))).scalar() or 0
+
+    async def _merge_within_budget(self, conn: AsyncConnection, table: str, budget: float) -> int:
+        """Run incremental 'merge' steps until no work is left or the budget is spent."""
+        steps = 0
+        deadline = time.monotonic() + budget
+        stmt = text(f"INSERT INTO {table}({table}, rank) VALUES ('merge', :pages)")
+        while time.monotonic() < deadline:
+            before = await self._total_changes(conn)
+            await conn.execute(stmt, {"pages": self.config.merge_pages})
+            await conn.commit()
+            steps += 1
+            # per the FTS5 docs a delta below 2 means the merge did no work
+            if await self._total_changes(conn) - before < 2:
+                break
+            # yield so ingestion can grab the write lock between steps
+            await asyncio.sleep(0)
+        return steps
+
+    async def maintain_table(self, table: str, *, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Run one maintenance pass on ``table``.
+
+        Args:
+            table: FTS5 table name
+            force: Merge even if the segment count is below the threshold
+
+        Returns:
+            Report dictionary, or None if the table does not exist
+        """
+        cfg = self.config
+        async with self.engine.connect() as conn:
+            if not await self._table_exists(conn, table):
+                return None
+
+            before = await self._segment_stats(conn, table)
+            segments = before["segments"] if before else 0
+            terms = await self._probe_terms(conn, table)
+            latency_before = await self._match_latency_ms(conn, table, terms)
+
+            action = "none"
+            steps = 0
+            t0 = time.perf_counter()
+            if force or segments > cfg.segment_threshold:
+                rows = await self._row_count(conn, table)
+                if rows <= cfg.optimize_max_rows:
+                    await conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('optimize')"))
+                    await conn.commit()
+                    action = "optimize"
+                    self._stats["optimizes"] += 1
+                else:
+                    steps = await self._merge_within_budget(conn, table, cfg.time_budget_seconds)
+                    action = "merge"
+                    self._stats["merge_steps"] += steps
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+
+            after = await self._segment_stats(conn, table) if action != "none" else before
+            latency_after = (
+                await self._match_latency_ms(conn, table, terms)
+                if action != "none" else latency_before
+            )
+
+        report = {
+            "table": table,
+            "action": action,
+            "merge_steps": steps,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "segments_before": before["segments"] if before else None,
+            "segments_after": after["segments"] if after else None,
+            "levels_after": after["levels"] if after else None,
+            "match_latency_ms_before": round(latency_before, 3) if latency_before is not None else None,
+            "match_latency_ms_after": round(latency_after, 3) if latency_after is not None else None,
+        }
+        if action != "none":
+            logger.info(
+                f"FTS maintenance on {table}: {action} "
+                f"segments {report['segments_before']} → {report['segments_after']}, "
+                f"MATCH {report['match_latency_ms_before']}ms → {report['match_latency_ms_after']}ms"
+            )
+        return report
+
+    async def run_once(self, *, force: bool = False) -> List[Dict[str, Any]]:
+        """Run one maintenance pass over every table.
+
+        Args:
+            force: Merge regardless of segment thresholds
+
+        Returns:
+            List of per-table reports
+        """
+        async with self._run_lock:
+            reports = []
+            for table in self.tables:
+                report = await self.maintain_table(table, force=force)
+                if report is not None:
+                    reports.append(report)
+
+            self._stats["runs"] += 1
+            self._stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+            self._stats["last_report"] = reports
+            return reports
+
+    async def rebuild_with_prefix(self, table: str) -> bool:
+        """Recreate an older FTS table so it carries ``prefix='{FTS_PREFIX}'``.
+
+        Tables created before prefix indexes were introduced still answer
+        ``term*`` queries, but by scanning the full term range. Rebuilding
+        re-reads the external content table, so it is unbounded and should
+        be triggered explicitly rather than from the idle loop.
+
+        Returns:
+            True if the table was rebuilt, False if it already had prefixes
+        """
+        async with self._run_lock:
+            async with self.engine.connect() as conn:
+                if not await self._table_exists(conn, table):
+                    return False
+                if await self._has_prefix_index(conn, table):
+                    return False
+
+                sql = (await conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+                    {"name": table},
+                )).scalar()
+                new_sql = sql.replace("tokenize=", f"prefix='{FTS_PREFIX}', tokenize=", 1)
+
+                await conn.execute(text(f"DROP TABLE {table}"))
+                await conn.execute(text(new_sql))
+                if table == "observations_fts":
+                    # observation content may be stored compressed
+                    await conn.execute(text(OBSERVATIONS_FTS_BACKFILL))
+                else:
+                    await conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+                await conn.commit()
+
+        await self.configure()
+        logger.info(f"Rebuilt {table} with prefix indexes ({FTS_PREFIX})")
+        return True
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics and current segment counts."""
+        tables = {}
+        async with self.engine.connect() as conn:
+            for table in self.tables:
+                if not await self._table_exists(conn, table):
+                    continue
+                structure = await self._segment_stats(conn, table)
+                tables[table] = {
+                    "rows": await self._row_count(conn, table),
+                    "prefix_index": await self._has_prefix_index(conn, table),
+                    **(structure or {}),
+                }
+
+        return {
+            **self._stats,
+            "running": self._task is not None and not self._task.done(),
+            "idle_seconds": round(self.idle_for, 1),
+            "tables": tables,
+        }
@@ -34,6 +34,7 @@ from ..suggestion_models import (
     ContextualProposition, ContextRetrievalResult,
     SSEEvent, SSEEventType
 )
+from .db_writer import run_write
 from .rate_limiter import get_rate_limiter
 
 # Import unified AI client
@@ -828,27 +829,27 @@ class GumboEngine:
         try:
             from ..models import Suggestion
             
-            suggestion_ids = []
-            
-            for suggestion_data in batch.suggestions:
-                # Create database record
-                db_suggestion = Suggestion(
-                    title=suggestion_data.title,
-                    description=suggestion_data.description,
-                    category=suggestion_data.category,
-                    rationale=suggestion_data.rationale,
-                    expected_utility=suggestion_data.expected_utility or 0.0,
-                    probability_useful=suggestion_data.probability_useful or 0.0,
-                    trigger_proposition_id=batch.trigger_proposition_id,
-                    batch_id=batch.batch_id,
-                    delivered=False  # Will be marked True when delivered via SSE
-                )
-                
-                session.add(db_suggestion)
-                await session.flush()  # Get the ID
-                suggestion_ids.append(db_suggestion.id)
+            async def _save(write_session: AsyncSession) -> List[int]:
+                db_suggestions = [
+                    Suggestion(
+                        title=suggestion_data.title,
+                        description=suggestion_data.description,
+                        category=suggestion_data.category,
+                        rationale=suggestion_data.rationale,
+                        expected_utility=suggestion_data.expected_utility or 0.0,
+                        probability_useful=suggestion_data.probability_useful or 0.0,
+                        trigger_proposition_id=batch.trigger_proposition_id,
+                        batch_id=batch.batch_id,
+                        delivered=False  # Will be marked True when delivered via SSE
+                    )
+                    for suggestion_data in batch.suggestions
+                ]
+                write_session.add_all(db_suggestions)
+                await write_session.flush()  # Get the IDs
+                return [s.id for s in db_suggestions]
             
-            await session.commit()
+            # Group-committed by the database writer when one owns this database
+            suggestion_ids = await run_write(session, _save, label="gumbo.save_suggestions")
             
             logger.info(f"Saved {len(suggestion_ids)} suggestions to database")
             return suggestion_ids
@@ -874,8 +875,11 @@ class GumboEngine:
                 .values(delivered=True)
             )
             
-            await session.execute(stmt)
-            await session.commit()
+            await run_write(
+                session,
+                lambda write_session: write_session.execute(stmt),
+                label="gumbo.mark_delivered"
+            )
             
             logger.info(f"Marked {len(suggestion_ids)} suggestions as delivered")
             
@@ -1628,13 +1632,13 @@ async def trigger_gumbo_suggestions(proposition_id: int, session: Optional[Async
         
         # Create own session if none provided
         if session is None:
-            from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+            from sqlalchemy.ext.asyncio import AsyncSession
             from sqlalchemy.orm import sessionmaker
+            from ..storage import get_backend, resolve_database_url
             
-            # Create database connection - use the same path as GUM instance
-            import os
-            db_path = os.path.expanduser('~/.cache/gum/gum.db')
-            db_engine = create_async_engine(f'sqlite+aiosqlite:///{db_path}')
+            # Create database connection - use the same database as the GUM instance
+            db_url = resolve_database_url('gum.db', '~/.cache/gum')
+            db_engine = get_backend(db_url).create_engine(db_url)
             async_session = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
             
             async with async_session() as new_session:
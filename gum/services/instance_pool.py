@@ -0,0 +1,335 @@
+"""
+Per-User GUM Instance Pool
+
+The API serves several users from one process. Rebuilding a single global
+``gum`` (and reconnecting its database) every time the ``user_name`` changes
+makes two alternating users pay a full reconnect on every request.
+
+:class:`GumInstancePool` keeps a bounded LRU of connected ``gum`` instances
+instead, one per user and each with its own database (see
+:func:`user_database_name`), keyed by the collision-free :func:`user_key`.
+Instances are created and connected lazily on a user's first request,
+evicted when the pool is full or they have been idle too long (closing
+their writer, background tasks and engines), and every user gets a
+semaphore bounding how many requests use their instance at once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from ..gum import gum
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InstancePoolConfig:
+    """Configuration settings for the per-user instance pool."""
+
+    max_instances: int = 8                  # connected instances kept at most
+    idle_timeout_seconds: float = 900.0     # evict instances unused for this long
+    max_concurrent_per_user: int = 8        # requests using one instance at once
+    sweep_interval_seconds: float = 60.0    # how often idle instances are looked for
+
+    @classmethod
+    def from_environment(cls) -> 'InstancePoolConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            max_instances=int(os.getenv('GUM_POOL_MAX_INSTANCES', 8)),
+            idle_timeout_seconds=float(os.getenv('GUM_POOL_IDLE_TIMEOUT_SECONDS', 900)),
+            max_concurrent_per_user=int(os.getenv('GUM_POOL_MAX_CONCURRENT_PER_USER', 8)),
+            sweep_interval_seconds=float(os.getenv('GUM_POOL_SWEEP_INTERVAL_SECONDS', 60)),
+        )
+
+
+def user_slug(user_name: str) -> str:
+    """Filesystem- and SQL-identifier-safe form of a user name."""
+    slug = re.sub(r"[^a-z0-9]+", "_", user_name.lower()).strip("_")
+    return slug or "user"
+
+
+def user_key(user_name: str) -> str:
+    """Collision-free identifier for *user_name*: its slug plus a hash of the exact name.
+
+    The slug alone is lossy (``Alice`` and ``alice``, or any two non-ASCII
+    names, share one), so every per-user resource is named after this key.
+    """
+    digest = hashlib.sha256(user_name.encode("utf-8")).hexdigest()[:10]
+    return f"{user_slug(user_name)[:40]}_{digest}"
+
+
+def user_database_name(user_name: str, default_user: Optional[str] = None) -> str:
+    """SQLite file name for *user_name*.
+
+    The default user keeps ``gum.db`` so existing single-user installs find
+    their data; everyone else gets ``gum_<user key>.db`` next to it.
+    """
+    if default_user is not None and user_name == default_user:
+        return "gum.db"
+    return f"gum_{user_key(user_name)}.db"
+
+
+@dataclass
+class _PoolEntry:
+    user_name: str
+    instance: gum
+    semaphore: asyncio.Semaphore
+    connect_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    connected: bool = False
+    in_flight: int = 0
+    waiting: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    requests: int = 0
+
+
+class GumInstancePool:
+    """
+    Bounded LRU of per-user ``gum`` instances.
+
+    Usage::
+
+        pool = GumInstancePool(lambda user: gum(user, "gpt-4o", db_name=...))
+        await pool.start()
+
+        async with pool.lease("alice") as gum_inst:
+            ...  # at most max_concurrent_per_user leases per user at once
+
+        gum_inst = await pool.get("alice")   # no concurrency accounting
+    """
+
+    def __init__(self, factory: Callable[[str], gum], config: Optional[InstancePoolConfig] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds an unconnected ``gum`` for a user name
+            config: Pool configuration (defaults to environment)
+        """
+        self.factory = factory
+        self.config = config or InstancePoolConfig.from_environment()
+
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._stats: Dict[str, Any] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions_lru": 0,
+            "evictions_idle": 0,
+            "connect_ms_last": None,
+        }
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Start the idle-eviction sweeper."""
+        if self._task is None or self._task.done():
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._sweeper())
+            logger.info(
+                f"GUM instance pool started (max {self.config.max_instances} instances, "
+                f"idle timeout {self.config.idle_timeout_seconds:.0f}s)"
+            )
+
+    async def stop(self):
+        """Stop the sweeper and close every pooled instance."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+        async with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            await self._close(entry)
+        logger.info("GUM instance pool stopped")
+
+    async def _sweeper(self):
+        while not self._shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.config.sweep_interval_seconds,
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Idle instance sweep failed: {e}")
+
+    # ─────────────────────────────── access
+    async def get(self, user_name: str) -> gum:
+        """Return the connected instance for *user_name*, creating it on first use."""
+        entry = await self._entry(user_name)
+        try:
+            await self._connect(entry)
+        finally:
+            entry.waiting -= 1
+        entry.last_used = time.monotonic()
+        return entry.instance
+
+    @asynccontextmanager
+    async def lease(self, user_name: str) -> AsyncIterator[gum]:
+        """Use *user_name*'s instance, waiting while the user is at their concurrency limit.
+
+        A leased instance is never evicted until the lease is released.
+        """
+        entry = await self._entry(user_name)
+        try:
+            await entry.semaphore.acquire()
+        finally:
+            entry.waiting -= 1
+        entry.in_flight += 1
+        try:
+            await self._connect(entry)
+            entry.requests += 1
+            yield entry.instance
+        finally:
+            entry.in_flight -= 1
+            entry.last_used = time.monotonic()
+            entry.semaphore.release()
+
+    async def _connect(self, entry: _PoolEntry):
+        if entry.connected:
+            return
+        async with entry.connect_lock:
+            if not entry.connected:
+                start = time.perf_counter()
+                await entry.instance.connect_db()
+                entry.connected = True
+                self._stats["connect_ms_last"] = round((time.perf_counter() - start) * 1000, 2)
+                logger.info(f"Connected GUM instance for user: {entry.user_name}")
+
+    async def _entry(self, user_name: str) -> _PoolEntry:
+        """Find or create the pool entry for *user_name*, mark it most recently used and pin it.
+
+        The entry is returned with ``waiting`` already counted, so nothing
+        can evict it while this call closes other instances; the caller
+        decrements ``waiting`` once it holds the entry some other way.
+        """
+        key = user_key(user_name)
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._stats["hits"] += 1
+                self._entries.move_to_end(key)
+                entry.waiting += 1
+                return entry
+
+            self._stats["misses"] += 1
+            logger.info(f"Creating GUM instance for user: {user_name}")
+            entry = _PoolEntry(
+                user_name=user_name,
+                instance=self.factory(user_name),
+                semaphore=asyncio.Semaphore(self.config.max_concurrent_per_user),
+            )
+            entry.waiting += 1
+            self._entries[key] = entry
+            evicted = self._pop_lru_locked()
+        for old in evicted:
+            self._stats["evictions_lru"] += 1
+            await self._close(old)
+        return entry
+
+    # ─────────────────────────────── eviction
+    def _evictable(self, entry: _PoolEntry) -> bool:
+        return entry.in_flight == 0 and entry.waiting == 0 and not entry.connect_lock.locked()
+
+    def _pop_lru_locked(self):
+        """Remove least recently used idle entries beyond capacity (caller holds the lock).
+
+        Entries in use are skipped, so the pool can briefly exceed
+        ``max_instances`` while every instance is busy.
+        """
+        evicted = []
+        excess = len(self._entries) - self.config.max_instances
+        for key in list(self._entries)[:-1]:  # never the entry just used
+            if excess <= 0:
+                break
+            if self._evictable(self._entries[key]):
+                evicted.append(self._entries.pop(key))
+                excess -= 1
+        return evicted
+
+    async def evict_idle(self) -> int:
+        """Close instances unused for longer than the idle timeout.
+
+        Returns:
+            Number of instances evicted
+        """
+        cutoff = time.monotonic() - self.config.idle_timeout_seconds
+        async with self._lock:
+            evicted = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry.last_used < cutoff and self._evictable(entry)
+            ]
+            for key, _ in evicted:
+                del self._entries[key]
+        for _, entry in evicted:
+            self._stats["evictions_idle"] += 1
+            await self._close(entry)
+        return len(evicted)
+
+    async def evict(self, user_name: str) -> bool:
+        """Close and drop *user_name*'s instance if it is not in use."""
+        key = user_key(user_name)
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._evictable(entry):
+                return False
+            del self._entries[key]
+        await self._close(entry)
+        return True
+
+    async def _close(self, entry: _PoolEntry):
+        if not entry.connected:
+            return
+        try:
+            await entry.instance.__aexit__(None, None, None)
+            logger.info(f"Closed GUM instance for user: {entry.user_name}")
+        except Exception as e:
+            logger.warning(f"Error closing GUM instance for {entry.user_name}: {e}")
+
+    # ─────────────────────────────── stats
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool occupancy, hit rate, evictions and per-user load."""
+        now = time.monotonic()
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "instances": len(self._entries),
+            "max_instances": self.config.max_instances,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else None,
+            **self._stats,
+            "users": {
+                entry.user_name: {
+                    "connected": entry.connected,
+                    "in_flight": entry.in_flight,
+                    "waiting": entry.waiting,
+                    "requests": entry.requests,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                    "age_seconds": round(now - entry.created_at, 1),
+                }
+                for entry in reversed(self._entries.values())
+            },
+            "config": {
+                "idle_timeout_seconds": self.config.idle_timeout_seconds,
+                "max_concurrent_per_user": self.config.max_concurrent_per_user,
+            },
+        }
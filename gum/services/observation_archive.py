@@ -0,0 +1,461 @@
+"""
+Observation Archive (cold storage tier)
+
+Moves observations past a configurable age out of the primary WAL database
+into compressed monthly archive databases (``observations-YYYY-MM.db``).
+The hot database keeps only recent screen transcriptions, so its working
+set, FTS index and backups stay small enough to live in the page cache.
+
+Each archive file holds:
+
+- ``observations``: the archived rows with zlib-compressed content
+- ``observation_proposition``: the proposition links the rows had when archived
+- ``observations_fts``: a contentless FTS5 index over the uncompressed text
+
+Archives are ATTACHed on demand, both when archiving and when answering a
+federated search that spans the hot database and every relevant month.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..compression import dictionary_registry, register_sqlite_functions, sql_content
+from ..db_utils import build_fts_query
+from ..models import FTS_TOKENIZER
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "observations-"
+_ARCHIVE_SCHEMA = "arc"
+_MAX_ATTACHED = 8          # stay below SQLITE_MAX_ATTACHED (10)
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class ArchiveConfig:
+    """Configuration settings for the observation archive tier."""
+
+    min_age_days: int = 30             # observations older than this are archived
+    batch_size: int = 1000             # rows moved per write transaction
+    compression_level: int = 6
+    run_interval_hours: float = 24.0
+    vacuum_after_run: bool = False     # VACUUM the hot database after archiving
+
+    @classmethod
+    def from_environment(cls) -> 'ArchiveConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            min_age_days=int(os.getenv('GUM_ARCHIVE_MIN_AGE_DAYS', 30)),
+            batch_size=int(os.getenv('GUM_ARCHIVE_BATCH_SIZE', 1000)),
+            compression_level=int(os.getenv('GUM_ARCHIVE_COMPRESSION_LEVEL', 6)),
+            run_interval_hours=float(os.getenv('GUM_ARCHIVE_INTERVAL_HOURS', 24.0)),
+            vacuum_after_run=os.getenv('GUM_ARCHIVE_VACUUM', 'false').lower() == 'true',
+        )
+
+
+def _create_archive_schema(con: sqlite3.Connection, schema: str) -> None:
+    """Create the archive tables inside the attached database *schema*."""
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.observations (
+            id            INTEGER PRIMARY KEY,
+            observer_name VARCHAR(100) NOT NULL,
+            content       BLOB NOT NULL,
+            content_type  VARCHAR(50) NOT NULL,
+            created_at    DATETIME NOT NULL,
+            updated_at    DATETIME NOT NULL,
+            archived_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.observation_proposition (
+            observation_id INTEGER NOT NULL,
+            proposition_id INTEGER NOT NULL,
+            PRIMARY KEY (observation_id, proposition_id)
+        )
+    """)
+    con.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.observations_fts
+        USING fts5(content, content='', tokenize='{FTS_TOKENIZER}')
+    """)
+
+
+class ObservationArchiver:
+    """
+    Hot/cold partitioning for the ``observations`` table.
+
+    All SQLite work runs on short-lived ``sqlite3`` connections inside
+    ``asyncio.to_thread`` so ATTACH/DETACH never touches the pooled
+    connections used by the ORM.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        archive_dir: Optional[str] = None,
+        config: Optional[ArchiveConfig] = None,
+    ):
+        """
+        Initialize the archiver.
+
+        Args:
+            db_path: Path of the hot GUM database
+            archive_dir: Directory for monthly archives (defaults to
+                ``<db dir>/archive/<db stem>``, so databases sharing a
+                directory never share archives)
+            config: Archive configuration (defaults to environment)
+        """
+        self.db_path = os.path.abspath(os.path.expanduser(db_path))
+        self.archive_dir = os.path.abspath(os.path.expanduser(
+            archive_dir or os.path.join(
+                os.path.dirname(self.db_path), "archive",
+                os.path.splitext(os.path.basename(self.db_path))[0],
+            )
+        ))
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self.config = config or ArchiveConfig.from_environment()
+
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._last_report: Optional[Dict[str, Any]] = None
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Start the periodic archiving worker."""
+        if self._task is None or self._task.done():
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._worker())
+            logger.info(f"Observation archive worker started (archive dir: {self.archive_dir})")
+
+    async def stop(self):
+        """Stop the periodic archiving worker."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            logger.info("Observation archive worker stopped")
+
+    async def _worker(self):
+        """Archive old observations once per ``run_interval_hours``."""
+        while not self._shutdown_event.is_set():
+            try:
+                await self.archive()
+            except Exception as e:
+                logger.error(f"Observation archiving failed: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.config.run_interval_hours * 3600,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    # ─────────────────────────────── helpers
+    def archive_path(self, month: str) -> str:
+        """Path of the archive database for ``YYYY-MM`` *month*."""
+        return os.path.join(self.archive_dir, f"{ARCHIVE_PREFIX}{month}.db")
+
+    def list_archives(self) -> List[Tuple[str, str]]:
+        """List ``(month, path)`` for every archive file, oldest first."""
+        archives = []
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, f"{ARCHIVE_PREFIX}*.db"))):
+            month = os.path.basename(path)[len(ARCHIVE_PREFIX):-3]
+            archives.append((month, path))
+        return archives
+
+    def _connect_hot(self, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            con = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30,
+                                  isolation_level=None)
+        else:
+            con = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        con.execute("PRAGMA busy_timeout=30000")
+        register_sqlite_functions(con, dictionary_registry(self.db_path))  # the FTS triggers decompress content
+        return con
+
+    @staticmethod
+    def _decompress(blob: bytes) -> str:
+        return zlib.decompress(blob).decode("utf-8")
+
+    # ─────────────────────────────── archiving
+    async def archive(self, older_than_days: Optional[int] = None) -> Dict[str, Any]:
+        """Move observations older than *older_than_days* into monthly archives.
+
+        Args:
+            older_than_days: Age threshold (defaults to ``config.min_age_days``)
+
+        Returns:
+            Report with rows moved per month, byte counts and hot DB size change
+        """
+        days = self.config.min_age_days if older_than_days is None else older_than_days
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime(_TIMESTAMP_FORMAT)
+        async with self._run_lock:
+            report = await asyncio.to_thread(self._archive_sync, cutoff)
+        self._last_report = report
+        if report["rows_archived"]:
+            logger.info(
+                f"Archived {report['rows_archived']} observations older than {cutoff} "
+                f"({report['raw_bytes']} → {report['compressed_bytes']} bytes)"
+            )
+        return report
+
+    def _archive_sync(self, cutoff: str) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        hot_size_before = self._hot_size()
+        con = self._connect_hot()
+        per_month: Dict[str, int] = {}
+        raw_bytes = compressed_bytes = 0
+        try:
+            months = [r[0] for r in con.execute(
+                "SELECT DISTINCT substr(created_at, 1, 7) FROM observations "
+                "WHERE created_at < ? ORDER BY 1",
+                (cutoff,),
+            )]
+            for month in months:
+                con.execute(f"ATTACH DATABASE ? AS {_ARCHIVE_SCHEMA}", (self.archive_path(month),))
+                try:
+                    _create_archive_schema(con, _ARCHIVE_SCHEMA)
+                    while True:
+                        moved, raw, packed = self._move_batch(con, month, cutoff)
+                        if not moved:
+                            break
+                        per_month[month] = per_month.get(month, 0) + moved
+                        raw_bytes += raw
+                        compressed_bytes += packed
+                finally:
+                    con.execute(f"DETACH DATABASE {_ARCHIVE_SCHEMA}")
+
+            if per_month:
+                con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                if self.config.vacuum_after_run:
+                    con.execute("VACUUM")
+        finally:
+            con.close()
+
+        return {
+            "cutoff": cutoff,
+            "rows_archived": sum(per_month.values()),
+            "months": per_month,
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": compressed_bytes,
+            "hot_db_bytes_before": hot_size_before,
+            "hot_db_bytes_after": self._hot_size(),
+            "elapsed_seconds": round(time.perf_counter() - t0, 3),
+        }
+
+    def _move_batch(self, con: sqlite3.Connection, month: str, cutoff: str) -> Tuple[int, int, int]:
+        """Move one batch of *month* rows into the attached archive."""
+        arc = _ARCHIVE_SCHEMA
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            rows = con.execute(
+                f"SELECT id, observer_name, {sql_content()}, content_type, created_at, updated_at "
+                "FROM main.observations "
+                "WHERE created_at < ? AND substr(created_at, 1, 7) = ? "
+                "ORDER BY id LIMIT ?",
+                (cutoff, month, self.config.batch_size),
+            ).fetchall()
+            if not rows:
+                con.execute("COMMIT")
+                return 0, 0, 0
+
+            raw = packed = 0
+            archived = []
+            for obs_id, observer, content, ctype, created, updated in rows:
+                text = content if isinstance(content, str) else bytes(content).decode("utf-8", "replace")
+                blob = zlib.compress(text.encode("utf-8"), self.config.compression_level)
+                raw += len(text.encode("utf-8"))
+                packed += len(blob)
+                archived.append((obs_id, observer, blob, ctype, created, updated, text))
+
+            con.executemany(
+                f"INSERT OR REPLACE INTO {arc}.observations"
+                "(id, observer_name, content, content_type, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [a[:6] for a in archived],
+            )
+            con.executemany(
+                f"INSERT INTO {arc}.observations_fts(rowid, content) VALUES (?, ?)",
+                [(a[0], a[6]) for a in archived],
+            )
+
+            ids = [a[0] for a in archived]
+            placeholders = ",".join("?" * len(ids))
+            con.execute(
+                f"INSERT OR IGNORE INTO {arc}.observation_proposition(observation_id, proposition_id) "
+                f"SELECT observation_id, proposition_id FROM main.observation_proposition "
+                f"WHERE observation_id IN ({placeholders})",
+                ids,
+            )
+            # foreign keys are not enforced, so remove the link rows explicitly
+            con.execute(
+                f"DELETE FROM main.observation_proposition WHERE observation_id IN ({placeholders})",
+                ids,
+            )
+            # the observations_ad trigger keeps the hot FTS index in sync
+            con.execute(f"DELETE FROM main.observations WHERE id IN ({placeholders})", ids)
+            con.execute("COMMIT")
+            return len(ids), raw, packed
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+    # ─────────────────────────────── federated search
+    async def search(
+        self,
+        user_query: str,
+        *,
+        limit: int = 10,
+        mode: str = "OR",
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        include_hot: bool = True,
+        include_archives: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Full-text search across the hot database and all relevant archives.
+
+        Archives whose month falls outside ``[start_time, end_time]`` are not
+        attached at all.
+
+        Returns:
+            Observation dictionaries ordered by BM25 relevance, each tagged
+            with the ``tier`` it came from (``"hot"`` or ``"YYYY-MM"``)
+        """
+        q = build_fts_query(user_query, mode)
+        if not q:
+            return []
+        start = start_time.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT) if start_time else None
+        end = end_time.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT) if end_time else None
+        return await asyncio.to_thread(
+            self._search_sync, q, limit, start, end, include_hot, include_archives
+        )
+
+    @staticmethod
+    def _time_clause(alias: str, start: Optional[str], end: Optional[str]) -> Tuple[str, list]:
+        clause, params = "", []
+        if start:
+            clause += f" AND {alias}.created_at >= ?"
+            params.append(start)
+        if end:
+            clause += f" AND {alias}.created_at <= ?"
+            params.append(end)
+        return clause, params
+
+    def _search_sync(
+        self,
+        q: str,
+        limit: int,
+        start: Optional[str],
+        end: Optional[str],
+        include_hot: bool,
+        include_archives: bool,
+    ) -> List[Dict[str, Any]]:
+        hits: List[Dict[str, Any]] = []
+        time_sql, time_params = self._time_clause("o", start, end)
+        con = self._connect_hot(read_only=True)
+        try:
+            if include_hot:
+                rows = con.execute(
+                    f"SELECT o.id, o.observer_name, {sql_content('o.content', 'o.content_codec')}, "
+                    "o.content_type, o.created_at, bm25(observations_fts) AS score "
+                    "FROM main.observations_fts JOIN main.observations o "
+                    "ON o.id = main.observations_fts.rowid "
+                    f"WHERE observations_fts MATCH ?{time_sql} ORDER BY score LIMIT ?",
+                    [q, *time_params, limit],
+                ).fetchall()
+                hits.extend(self._as_hit("hot", r, compressed=False) for r in rows)
+
+            months = [
+                (month, path) for month, path in self.list_archives()
+                if (not start or month >= start[:7]) and (not end or month <= end[:7])
+            ] if include_archives else []
+            for i in range(0, len(months), _MAX_ATTACHED):
+                chunk = months[i:i + _MAX_ATTACHED]
+                aliases = []
+                try:
+                    for n, (month, path) in enumerate(chunk):
+                        alias = f"{_ARCHIVE_SCHEMA}{n}"
+                        con.execute(f"ATTACH DATABASE ? AS {alias}", (f"file:{path}?mode=ro",))
+                        aliases.append((month, alias))
+                    for month, alias in aliases:
+                        rows = con.execute(
+                            "SELECT o.id, o.observer_name, o.content, o.content_type, o.created_at, "
+                            "f.score FROM ("
+                            f"  SELECT rowid AS id, bm25(observations_fts) AS score "
+                            f"  FROM {alias}.observations_fts WHERE observations_fts MATCH ?"
+                            f") f JOIN {alias}.observations o ON o.id = f.id "
+                            f"WHERE 1=1{time_sql} ORDER BY f.score LIMIT ?",
+                            [q, *time_params, limit],
+                        ).fetchall()
+                        hits.extend(self._as_hit(month, r, compressed=True) for r in rows)
+                finally:
+                    for _, alias in aliases:
+                        con.execute(f"DETACH DATABASE {alias}")
+        finally:
+            con.close()
+
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits[:limit]
+
+    def _as_hit(self, tier: str, row: tuple, *, compressed: bool) -> Dict[str, Any]:
+        obs_id, observer, content, ctype, created, bm25 = row
+        return {
+            "id": obs_id,
+            "tier": tier,
+            "observer_name": observer,
+            "content": self._decompress(content) if compressed else content,
+            "content_type": ctype,
+            "created_at": created,
+            "score": -bm25,
+        }
+
+    # ─────────────────────────────── stats
+    def _hot_size(self) -> int:
+        return sum(
+            os.path.getsize(p) for p in (self.db_path, f"{self.db_path}-wal")
+            if os.path.exists(p)
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get sizes and row counts of the hot database and every archive."""
+        def _stats():
+            archives = []
+            for month, path in self.list_archives():
+                con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+                try:
+                    rows = con.execute("SELECT count(*) FROM observations").fetchone()[0]
+                finally:
+                    con.close()
+                archives.append({"month": month, "rows": rows, "bytes": os.path.getsize(path)})
+
+            con = self._connect_hot(read_only=True)
+            try:
+                hot_rows = con.execute("SELECT count(*) FROM observations").fetchone()[0]
+            finally:
+                con.close()
+            return {
+                "hot": {"rows": hot_rows, "bytes": self._hot_size()},
+                "archives": archives,
+                "archived_rows": sum(a["rows"] for a in archives),
+                "archive_bytes": sum(a["bytes"] for a in archives),
+            }
+
+        stats = await asyncio.to_thread(_stats)
+        stats["min_age_days"] = self.config.min_age_days
+        stats["last_run"] = self._last_report
+        stats["running"] = self._task is not None and not self._task.done()
+        return stats
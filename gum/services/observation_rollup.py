@@ -0,0 +1,511 @@
+"""
+Observation Rollup & Retention Compaction
+
+Old screen transcriptions mostly matter through the propositions they
+support, yet ``get_related_observations`` and Gumbo's context builder still
+load every one of them. This job compacts each proposition's old
+observations into a single *rollup* observation:
+
+1. For every proposition with at least ``min_cluster_size`` observations
+   older than ``min_age_days``, the cluster is summarised (extractively by
+   default, or by a caller-supplied async summariser).
+2. The rollup is inserted as a new observation (``observer_name="rollup"``)
+   stamped with the newest ``created_at`` of its cluster, and linked to the
+   proposition in place of the originals.
+3. Originals left without any proposition link are deleted, together with
+   the database's own screenshots past the retention window (only when a
+   ``screenshots_dir`` is given).
+
+Each run reports the bytes reclaimed and the related-observation query time
+before and after compaction for a sample of the touched propositions.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import re
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ..compression import compress_content, dictionary_registry, register_sqlite_functions, sql_content
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_OBSERVER = "rollup"
+ROLLUP_CONTENT_TYPE = "rollup_text"
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (observation_id, content, created_at)
+ObservationRow = Tuple[int, str, str]
+Summarizer = Callable[[List[str]], Awaitable[str]]
+
+
+@dataclass
+class RollupConfig:
+    """Configuration settings for observation rollup and retention."""
+
+    min_age_days: int = 14             # only observations older than this are rolled up
+    min_cluster_size: int = 3          # smaller clusters are left alone
+    summary_sentences: int = 12        # sentences kept by the extractive summariser
+    max_rollup_chars: int = 4000
+    batch_propositions: int = 100      # propositions compacted per write transaction
+    drop_unlinked: bool = True         # delete old observations no proposition uses
+    screenshot_retention_days: Optional[int] = None  # defaults to min_age_days
+    run_interval_hours: float = 24.0
+    vacuum_after_run: bool = False
+    probe_propositions: int = 20       # propositions sampled for query timing
+
+    @classmethod
+    def from_environment(cls) -> 'RollupConfig':
+        """Create configuration from environment variables."""
+        retention = os.getenv('GUM_ROLLUP_SCREENSHOT_RETENTION_DAYS')
+        return cls(
+            min_age_days=int(os.getenv('GUM_ROLLUP_MIN_AGE_DAYS', 14)),
+            min_cluster_size=int(os.getenv('GUM_ROLLUP_MIN_CLUSTER_SIZE', 3)),
+            summary_sentences=int(os.getenv('GUM_ROLLUP_SUMMARY_SENTENCES', 12)),
+            max_rollup_chars=int(os.getenv('GUM_ROLLUP_MAX_CHARS', 4000)),
+            batch_propositions=int(os.getenv('GUM_ROLLUP_BATCH_PROPOSITIONS', 100)),
+            drop_unlinked=os.getenv('GUM_ROLLUP_DROP_UNLINKED', 'true').lower() == 'true',
+            screenshot_retention_days=int(retention) if retention else None,
+            run_interval_hours=float(os.getenv('GUM_ROLLUP_INTERVAL_HOURS', 24.0)),
+            vacuum_after_run=os.getenv('GUM_ROLLUP_VACUUM', 'false').lower() == 'true',
+        )
+
+
+def summarize_extractive(texts: List[str], max_sentences: int, max_chars: int) -> str:
+    """Pick the most representative sentences of a cluster of observations.
+
+    Sentences are de-duplicated, ranked by TF-IDF similarity to the cluster
+    centroid and returned in their original order.
+
+    Args:
+        texts: Observation contents, oldest first
+        max_sentences: Number of sentences to keep
+        max_chars: Hard cap on the summary length
+
+    Returns:
+        The summary text
+    """
+    sentences: List[str] = []
+    seen = set()
+    for t in texts:
+        for s in re.split(r"(?<=[.!?])\s+|\n+", t):
+            s = s.strip(" \t-*#>")
+            key = re.sub(r"\W+", " ", s.lower()).strip()
+            if len(key) < 12 or key in seen:
+                continue
+            seen.add(key)
+            sentences.append(s)
+
+    if len(sentences) > max_sentences:
+        try:
+            vecs = TfidfVectorizer(stop_words="english").fit_transform(sentences)
+            centroid = vecs.mean(axis=0).A
+            scores = cosine_similarity(vecs, centroid).ravel()
+            keep = sorted(sorted(range(len(sentences)), key=lambda i: -scores[i])[:max_sentences])
+            sentences = [sentences[i] for i in keep]
+        except ValueError:  # empty vocabulary
+            sentences = sentences[:max_sentences]
+
+    summary = "\n".join(f"- {s}" for s in sentences)
+    return summary[:max_chars]
+
+
+class ObservationRollup:
+    """
+    Per-proposition rollup of old observations.
+
+    Like :class:`~gum.services.observation_archive.ObservationArchiver`, all
+    SQLite work runs on short-lived ``sqlite3`` connections in a worker thread;
+    the FTS triggers on ``observations`` keep the search index in sync.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        screenshots_dir: Optional[str] = None,
+        config: Optional[RollupConfig] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Initialize the rollup job.
+
+        Args:
+            db_path: Path of the GUM database
+            screenshots_dir: Screenshot directory of this database's Screen observer, whose
+                old screenshots are deleted (None to keep screenshots). Only pass a
+                directory no other GUM database writes to.
+            config: Rollup configuration (defaults to environment)
+            summarizer: Optional async callable turning a cluster's texts into a summary;
+                the extractive summariser is used when omitted
+        """
+        self.db_path = os.path.abspath(os.path.expanduser(db_path))
+        self.screenshots_dir = (
+            os.path.abspath(os.path.expanduser(screenshots_dir)) if screenshots_dir else None
+        )
+        self.config = config or RollupConfig.from_environment()
+        self.summarizer = summarizer
+
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._last_report: Optional[Dict[str, Any]] = None
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Start the periodic compaction worker."""
+        if self._task is None or self._task.done():
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._worker())
+            logger.info("Observation rollup worker started")
+
+    async def stop(self):
+        """Stop the periodic compaction worker."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            logger.info("Observation rollup worker stopped")
+
+    async def _worker(self):
+        """Compact old observations once per ``run_interval_hours``."""
+        while not self._shutdown_event.is_set():
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Observation rollup failed: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.config.run_interval_hours * 3600,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    # ─────────────────────────────── helpers
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        con.execute("PRAGMA busy_timeout=30000")
+        con.execute("PRAGMA foreign_keys=ON")
+        register_sqlite_functions(con, dictionary_registry(self.db_path))  # the FTS triggers decompress content
+        return con
+
+    def _db_size(self, con: sqlite3.Connection) -> Dict[str, int]:
+        page_size = con.execute("PRAGMA page_size").fetchone()[0]
+        pages = con.execute("PRAGMA page_count").fetchone()[0]
+        free = con.execute("PRAGMA freelist_count").fetchone()[0]
+        return {"file_bytes": pages * page_size, "used_bytes": (pages - free) * page_size}
+
+    def _probe_query_time(self, con: sqlite3.Connection, prop_ids: List[int]) -> Dict[str, Any]:
+        """Time loading every related observation of *prop_ids*, as Gumbo does."""
+        if not prop_ids:
+            return {"median_ms": None, "rows": 0}
+        timings, rows = [], 0
+        for pid in prop_ids:
+            t0 = time.perf_counter()
+            rows += len(con.execute(
+                f"SELECT o.id, {sql_content('o.content', 'o.content_codec')}, o.created_at "
+                "FROM observations o "
+                "JOIN observation_proposition op ON op.observation_id = o.id "
+                "WHERE op.proposition_id = ? ORDER BY o.created_at DESC",
+                (pid,),
+            ).fetchall())
+            timings.append((time.perf_counter() - t0) * 1000)
+        return {"median_ms": round(statistics.median(timings), 3), "rows": rows}
+
+    # ─────────────────────────────── compaction
+    async def run(self, older_than_days: Optional[int] = None) -> Dict[str, Any]:
+        """Roll up observations older than *older_than_days*.
+
+        Args:
+            older_than_days: Age threshold (defaults to ``config.min_age_days``)
+
+        Returns:
+            Report with rollups created, observations and screenshots deleted,
+            bytes reclaimed and related-observation query time before/after
+        """
+        days = self.config.min_age_days if older_than_days is None else older_than_days
+        cutoff_dt = datetime.now(timezone.utc) - timedelta(days=days)
+        cutoff = cutoff_dt.strftime(_TIMESTAMP_FORMAT)
+
+        async with self._run_lock:
+            start = time.perf_counter()
+            before = await asyncio.to_thread(self._snapshot, cutoff)
+            probe_ids = before.pop("probe_ids")
+
+            rollups = linked = deleted = content_bytes = 0
+            after_id = 0
+            while True:
+                clusters, after_id = await asyncio.to_thread(self._collect_clusters, cutoff, after_id)
+                if not clusters:
+                    break
+                summaries = {pid: await self._summarize(rows) for pid, rows in clusters.items()}
+                stats = await asyncio.to_thread(self._apply_rollups, clusters, summaries, cutoff)
+                rollups += stats["rollups"]
+                linked += stats["links_repointed"]
+                deleted += stats["observations_deleted"]
+                content_bytes += stats["content_bytes_deleted"]
+
+            if self.config.drop_unlinked:
+                unlinked, unlinked_bytes = await asyncio.to_thread(self._drop_unlinked, cutoff)
+                deleted += unlinked
+                content_bytes += unlinked_bytes
+
+            retention = self.config.screenshot_retention_days
+            shot_cutoff = (
+                cutoff_dt if retention is None
+                else datetime.now(timezone.utc) - timedelta(days=retention)
+            )
+            shots, shot_bytes = await asyncio.to_thread(self._delete_screenshots, shot_cutoff)
+
+            after = await asyncio.to_thread(self._finish, probe_ids)
+
+            report = {
+                "cutoff": cutoff,
+                "rollups_created": rollups,
+                "links_repointed": linked,
+                "observations_deleted": deleted,
+                "content_bytes_deleted": content_bytes,
+                "screenshots_deleted": shots,
+                "screenshot_bytes_deleted": shot_bytes,
+                "db_bytes_before": before["size"],
+                "db_bytes_after": after["size"],
+                "bytes_reclaimed": (
+                    before["size"]["used_bytes"] - after["size"]["used_bytes"] + shot_bytes
+                ),
+                "query_time_before": before["probe"],
+                "query_time_after": after["probe"],
+                "elapsed_seconds": round(time.perf_counter() - start, 2),
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._last_report = report
+
+        logger.info(
+            f"Observation rollup: {rollups} rollups, {deleted} observations and "
+            f"{shots} screenshots deleted, {report['bytes_reclaimed']} bytes reclaimed"
+        )
+        return report
+
+    def _snapshot(self, cutoff: str) -> Dict[str, Any]:
+        """Size and query-time baseline, probing the largest old clusters."""
+        con = self._connect()
+        try:
+            probe_ids = [r[0] for r in con.execute(
+                "SELECT op.proposition_id FROM observation_proposition op "
+                "JOIN observations o ON o.id = op.observation_id "
+                "WHERE o.created_at < ? AND o.observer_name != ? "
+                "GROUP BY op.proposition_id HAVING count(*) >= ? "
+                "ORDER BY count(*) DESC LIMIT ?",
+                (cutoff, ROLLUP_OBSERVER, self.config.min_cluster_size,
+                 self.config.probe_propositions),
+            ).fetchall()]
+            return {
+                "size": self._db_size(con),
+                "probe": self._probe_query_time(con, probe_ids),
+                "probe_ids": probe_ids,
+            }
+        finally:
+            con.close()
+
+    def _collect_clusters(self, cutoff: str, after_id: int) -> Tuple[Dict[int, List[ObservationRow]], int]:
+        """Load the next batch of rollup-eligible clusters, keyed by proposition id."""
+        con = self._connect()
+        try:
+            prop_ids = [r[0] for r in con.execute(
+                "SELECT op.proposition_id FROM observation_proposition op "
+                "JOIN observations o ON o.id = op.observation_id "
+                "WHERE op.proposition_id > ? AND o.created_at < ? AND o.observer_name != ? "
+                "GROUP BY op.proposition_id HAVING count(*) >= ? "
+                "ORDER BY op.proposition_id LIMIT ?",
+                (after_id, cutoff, ROLLUP_OBSERVER, self.config.min_cluster_size,
+                 self.config.batch_propositions),
+            ).fetchall()]
+            clusters: Dict[int, List[ObservationRow]] = {}
+            for pid in prop_ids:
+                clusters[pid] = con.execute(
+                    f"SELECT o.id, {sql_content('o.content', 'o.content_codec')}, o.created_at "
+                    "FROM observations o "
+                    "JOIN observation_proposition op ON op.observation_id = o.id "
+                    "WHERE op.proposition_id = ? AND o.created_at < ? AND o.observer_name != ? "
+                    "ORDER BY o.created_at, o.id",
+                    (pid, cutoff, ROLLUP_OBSERVER),
+                ).fetchall()
+            return clusters, (prop_ids[-1] if prop_ids else after_id)
+        finally:
+            con.close()
+
+    async def _summarize(self, rows: List[ObservationRow]) -> str:
+        texts = [content for _, content, _ in rows]
+        body = None
+        if self.summarizer is not None:
+            try:
+                body = (await self.summarizer(texts))[:self.config.max_rollup_chars]
+            except Exception as e:
+                logger.warning(f"Rollup summariser failed, falling back to extractive: {e}")
+        if not body:
+            body = await asyncio.to_thread(
+                summarize_extractive, texts,
+                self.config.summary_sentences, self.config.max_rollup_chars,
+            )
+        header = f"Rollup of {len(rows)} observations from {rows[0][2]} to {rows[-1][2]}:"
+        return f"{header}\n{body}"
+
+    def _apply_rollups(
+        self,
+        clusters: Dict[int, List[ObservationRow]],
+        summaries: Dict[int, str],
+        cutoff: str,
+    ) -> Dict[str, int]:
+        """Insert rollups, re-point links and delete orphaned originals in one transaction."""
+        con = self._connect()
+        stats = {"rollups": 0, "links_repointed": 0,
+                 "observations_deleted": 0, "content_bytes_deleted": 0}
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            touched = set()
+            dictionaries = dictionary_registry(self.db_path)
+            for pid, rows in clusters.items():
+                newest = rows[-1][2]
+                content, codec = compress_content(summaries[pid], dictionaries=dictionaries)
+                rollup_id = con.execute(
+                    "INSERT INTO observations "
+                    "(observer_name, content, content_codec, content_type, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                    (ROLLUP_OBSERVER, content, codec, ROLLUP_CONTENT_TYPE, newest),
+                ).lastrowid
+                con.execute(
+                    "INSERT INTO observation_proposition (observation_id, proposition_id) VALUES (?, ?)",
+                    (rollup_id, pid),
+                )
+                obs_ids = [obs_id for obs_id, _, _ in rows]
+                con.executemany(
+                    "DELETE FROM observation_proposition WHERE observation_id = ? AND proposition_id = ?",
+                    [(obs_id, pid) for obs_id in obs_ids],
+                )
+                touched.update(obs_ids)
+                stats["rollups"] += 1
+                stats["links_repointed"] += len(obs_ids)
+
+            # originals still supporting a not-yet-rolled-up proposition are kept
+            ids = sorted(touched)
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                orphan_filter = (
+                    f"id IN ({placeholders}) AND created_at < ? AND NOT EXISTS ("
+                    "SELECT 1 FROM observation_proposition op WHERE op.observation_id = observations.id)"
+                )
+                stats["content_bytes_deleted"] += con.execute(
+                    f"SELECT coalesce(sum(length(content)), 0) FROM observations WHERE {orphan_filter}",
+                    [*chunk, cutoff],
+                ).fetchone()[0]
+                stats["observations_deleted"] += con.execute(
+                    f"DELETE FROM observations WHERE {orphan_filter}", [*chunk, cutoff]
+                ).rowcount
+            con.execute("COMMIT")
+            return stats
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        finally:
+            con.close()
+
+    def _drop_unlinked(self, cutoff: str) -> Tuple[int, int]:
+        """Delete old observations that support no proposition at all."""
+        con = self._connect()
+        deleted = content_bytes = 0
+        try:
+            while True:
+                con.execute("BEGIN IMMEDIATE")
+                try:
+                    ids = [r[0] for r in con.execute(
+                        "SELECT id FROM observations o WHERE created_at < ? AND observer_name != ? "
+                        "AND NOT EXISTS (SELECT 1 FROM observation_proposition op "
+                        "WHERE op.observation_id = o.id) LIMIT 1000",
+                        (cutoff, ROLLUP_OBSERVER),
+                    ).fetchall()]
+                    if ids:
+                        placeholders = ",".join("?" * len(ids))
+                        content_bytes += con.execute(
+                            f"SELECT coalesce(sum(length(content)), 0) FROM observations "
+                            f"WHERE id IN ({placeholders})", ids,
+                        ).fetchone()[0]
+                        deleted += con.execute(
+                            f"DELETE FROM observations WHERE id IN ({placeholders})", ids
+                        ).rowcount
+                    con.execute("COMMIT")
+                except Exception:
+                    con.execute("ROLLBACK")
+                    raise
+                if not ids:
+                    return deleted, content_bytes
+        finally:
+            con.close()
+
+    def _delete_screenshots(self, cutoff: datetime) -> Tuple[int, int]:
+        """Delete ``<epoch>_<tag>.jpg`` screenshots captured before *cutoff*."""
+        if not self.screenshots_dir or not os.path.isdir(self.screenshots_dir):
+            return 0, 0
+        limit = cutoff.timestamp()
+        count = size = 0
+        for path in glob.glob(os.path.join(self.screenshots_dir, "*.jpg")):
+            try:
+                ts = float(os.path.basename(path).split("_", 1)[0])
+            except ValueError:
+                continue
+            if ts < limit:
+                try:
+                    size += os.path.getsize(path)
+                    os.remove(path)
+                    count += 1
+                except OSError as e:
+                    logger.warning(f"Could not delete screenshot {path}: {e}")
+        return count, size
+
+    def _finish(self, probe_ids: List[int]) -> Dict[str, Any]:
+        """Checkpoint (and optionally VACUUM), then re-measure size and query time."""
+        con = self._connect()
+        try:
+            con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if self.config.vacuum_after_run:
+                con.execute("VACUUM")
+            return {"size": self._db_size(con), "probe": self._probe_query_time(con, probe_ids)}
+        finally:
+            con.close()
+
+    # ─────────────────────────────── stats
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get rollup counts and the last run report."""
+        def _stats():
+            con = self._connect()
+            try:
+                return con.execute(
+                    "SELECT count(*), coalesce(sum(length(content)), 0) FROM observations "
+                    "WHERE observer_name = ?",
+                    (ROLLUP_OBSERVER,),
+                ).fetchone()
+            finally:
+                con.close()
+
+        count, size = await asyncio.to_thread(_stats)
+        return {
+            "rollup_observations": count,
+            "rollup_content_bytes": size,
+            "min_age_days": self.config.min_age_days,
+            "last_run": self._last_report,
+            "running": self._task is not None and not self._task.done(),
+        }
@@ -0,0 +1,459 @@
+"""
+Proposition Garbage Collection
+
+Every revision GUM makes leaves a new leaf proposition behind, and nothing
+ever removes the ones that stopped mattering: low-confidence guesses the user
+never confirmed, fast-decaying facts about a task finished months ago. They
+all stay in the candidate pool ``search_propositions_bm25`` ranks on every
+query.
+
+:class:`PropositionGC` sweeps the leaves incrementally, ``batch_size`` ids
+per run, and scores each one by its decayed confidence and support::
+
+    score = c * exp(-d * age_days / decay_days) * (1 + support_weight * ln(1 + support))
+
+with ``c`` and ``d`` the proposition's confidence and decay scaled to 0..1
+(unknown values count as 0.5) and ``support`` its number of linked
+observations. Leaves older than ``min_age_days`` scoring below ``threshold``
+are moved into ``propositions_cold`` together with any ancestors left without
+a live child, so a superseded revision cannot resurface in their place.
+Retrieval only reads ``propositions``, so archived propositions are skipped
+by default; :meth:`PropositionGC.restore` brings them back.
+
+Each run reports the candidate pool size and median search latency before
+and after.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import noload
+
+from ..db_utils import _has_child_subquery, search_propositions_bm25
+from ..models import (
+    ColdProposition,
+    Observation,
+    Proposition,
+    observation_proposition,
+    proposition_parent,
+)
+from .db_writer import DatabaseWriter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PropositionGCConfig:
+    """Configuration settings for proposition garbage collection."""
+
+    threshold: float = 0.15            # archive leaves scoring below this
+    min_age_days: float = 7.0          # never archive propositions touched more recently
+    decay_days: float = 30.0           # age at which a decay-10 proposition has lost 1/e
+    support_weight: float = 0.5        # boost per log-observation of support
+    batch_size: int = 200              # leaves scored per run
+    run_interval_hours: float = 6.0
+    probe_queries: int = 20            # proposition texts replayed as search probes
+
+    @classmethod
+    def from_environment(cls) -> 'PropositionGCConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            threshold=float(os.getenv('GUM_PROP_GC_THRESHOLD', 0.15)),
+            min_age_days=float(os.getenv('GUM_PROP_GC_MIN_AGE_DAYS', 7)),
+            decay_days=float(os.getenv('GUM_PROP_GC_DECAY_DAYS', 30)),
+            support_weight=float(os.getenv('GUM_PROP_GC_SUPPORT_WEIGHT', 0.5)),
+            batch_size=int(os.getenv('GUM_PROP_GC_BATCH_SIZE', 200)),
+            run_interval_hours=float(os.getenv('GUM_PROP_GC_INTERVAL_HOURS', 6.0)),
+            probe_queries=int(os.getenv('GUM_PROP_GC_PROBE_QUERIES', 20)),
+        )
+
+
+def _age_days(ts: Optional[datetime], now: datetime) -> float:
+    if ts is None:
+        return 0.0
+    if ts.tzinfo is None:  # SQLite hands back naive UTC timestamps
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max((now - ts).total_seconds() / 86400, 0.0)
+
+
+def gc_score(
+    confidence: Optional[int],
+    decay: Optional[int],
+    age_days: float,
+    support_count: int,
+    config: PropositionGCConfig,
+) -> float:
+    """Decayed confidence of a proposition, boosted by its observation support."""
+    c = 0.5 if confidence is None else min(max(confidence, 0), 10) / 10
+    d = 0.5 if decay is None else min(max(decay, 0), 10) / 10
+    decayed = c * math.exp(-d * age_days / config.decay_days)
+    return decayed * (1 + config.support_weight * math.log1p(support_count))
+
+
+class PropositionGC:
+    """
+    Incremental confidence/decay sweeper for leaf propositions.
+
+    Reads go through the instance's session factory and every change through
+    its :class:`~gum.services.db_writer.DatabaseWriter`, so the collector
+    works on any storage backend.
+    """
+
+    def __init__(
+        self,
+        Session: async_sessionmaker[AsyncSession],
+        writer: DatabaseWriter,
+        config: Optional[PropositionGCConfig] = None,
+    ):
+        """
+        Initialize the collector.
+
+        Args:
+            Session: Session factory of the GUM database
+            writer: The database's writer
+            config: Collector configuration (defaults to environment)
+        """
+        self.Session = Session
+        self.writer = writer
+        self.config = config or PropositionGCConfig.from_environment()
+
+        self._cursor = 0  # last proposition id scored; wraps to 0 at the end
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._totals = {"runs": 0, "scanned": 0, "archived": 0, "restored": 0}
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Start the periodic sweep worker."""
+        if self._task is None or self._task.done():
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._worker())
+            logger.info("Proposition GC worker started")
+
+    async def stop(self):
+        """Stop the periodic sweep worker."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            logger.info("Proposition GC worker stopped")
+
+    async def _worker(self):
+        """Sweep one batch once per ``run_interval_hours``."""
+        while not self._shutdown_event.is_set():
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Proposition GC failed: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.config.run_interval_hours * 3600,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    # ─────────────────────────────── measurement
+    async def _candidate_pool(self, session: AsyncSession) -> int:
+        """Number of leaf propositions search ranks over."""
+        return (await session.execute(
+            select(func.count()).select_from(Proposition).where(~_has_child_subquery())
+        )).scalar_one()
+
+    async def _probe_texts(self, session: AsyncSession) -> List[str]:
+        """Short queries taken from the newest propositions."""
+        rows = (await session.execute(
+            select(Proposition.text)
+            .order_by(Proposition.id.desc())
+            .limit(self.config.probe_queries)
+        )).scalars().all()
+        return [" ".join(t.split()[:4]) for t in rows if t.strip()]
+
+    async def _probe_latency(self, session: AsyncSession, queries: List[str]) -> Optional[float]:
+        """Median ``search_propositions_bm25`` latency over *queries*, in ms."""
+        if not queries:
+            return None
+        timings = []
+        for q in queries:
+            t0 = time.perf_counter()
+            await search_propositions_bm25(session, q, limit=10)
+            timings.append((time.perf_counter() - t0) * 1000)
+        return round(statistics.median(timings), 3)
+
+    # ─────────────────────────────── sweep
+    async def _next_batch(self, session: AsyncSession, limit: int) -> List[Any]:
+        """Load the next *limit* leaves after the cursor with their support counts."""
+        support = (
+            select(func.count())
+            .select_from(observation_proposition)
+            .where(observation_proposition.c.proposition_id == Proposition.id)
+            .scalar_subquery()
+        )
+        return (await session.execute(
+            select(
+                Proposition.id,
+                Proposition.confidence,
+                Proposition.decay,
+                Proposition.updated_at,
+                support.label("support"),
+            )
+            .where(Proposition.id > self._cursor, ~_has_child_subquery())
+            .order_by(Proposition.id)
+            .limit(limit)
+        )).all()
+
+    async def run(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Score the next batch of leaves and archive those below the threshold.
+
+        Args:
+            batch_size: Leaves to score this run (defaults to ``config.batch_size``)
+
+        Returns:
+            Report with leaves scanned and archived, and the candidate pool
+            size and median search latency before/after
+        """
+        async with self._run_lock:
+            limit = self.config.batch_size if batch_size is None else batch_size
+            start = time.perf_counter()
+            now = datetime.now(timezone.utc)
+
+            async with self.Session() as session:
+                pool_before = await self._candidate_pool(session)
+                probes = await self._probe_texts(session)
+                latency_before = await self._probe_latency(session, probes)
+                rows = await self._next_batch(session, limit)
+
+            scores: Dict[int, float] = {}
+            for pid, confidence, decay, updated_at, support in rows:
+                age = _age_days(updated_at, now)
+                if age < self.config.min_age_days:
+                    continue
+                score = gc_score(confidence, decay, age, support, self.config)
+                if score < self.config.threshold:
+                    scores[pid] = score
+
+            wrapped = len(rows) < limit
+            self._cursor = 0 if wrapped else rows[-1][0]
+
+            archived: List[int] = []
+            if scores:
+                archived = await self.writer.submit(
+                    lambda s: self._archive(s, scores), label="proposition_gc"
+                )
+
+            async with self.Session() as session:
+                pool_after = await self._candidate_pool(session)
+                latency_after = await self._probe_latency(session, probes)
+
+            self._totals["runs"] += 1
+            self._totals["scanned"] += len(rows)
+            self._totals["archived"] += len(archived)
+            report = {
+                "scanned": len(rows),
+                "archived_leaves": len(scores),
+                "archived_ancestors": len(archived) - len(scores),
+                "archived_ids": archived,
+                "cursor": self._cursor,
+                "wrapped": wrapped,
+                "candidate_pool_before": pool_before,
+                "candidate_pool_after": pool_after,
+                "candidate_pool_saved": pool_before - pool_after,
+                "search_median_ms_before": latency_before,
+                "search_median_ms_after": latency_after,
+                "search_ms_saved": (
+                    round(latency_before - latency_after, 3)
+                    if latency_before is not None and latency_after is not None else None
+                ),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "finished_at": now.isoformat(),
+            }
+            self._last_report = report
+            if archived:
+                logger.info(
+                    f"Proposition GC archived {len(archived)} propositions "
+                    f"(candidate pool {pool_before} -> {pool_after})"
+                )
+            return report
+
+    async def _archive(self, session: AsyncSession, scores: Dict[int, float]) -> List[int]:
+        """Move the scored leaves and their orphaned ancestors to the cold table."""
+        victims: Dict[int, float] = dict(scores)
+        frontier: Set[int] = set(scores)
+        while frontier:
+            parents = set((await session.execute(
+                select(proposition_parent.c.parent_id)
+                .where(proposition_parent.c.child_id.in_(frontier))
+            )).scalars().all()) - victims.keys()
+            if not parents:
+                break
+            live = set((await session.execute(
+                select(proposition_parent.c.parent_id)
+                .where(
+                    proposition_parent.c.parent_id.in_(parents),
+                    proposition_parent.c.child_id.not_in(victims.keys()),
+                )
+            )).scalars().all())
+            frontier = parents - live
+            for pid in frontier:
+                # ancestors carry the score of the revision that superseded them
+                victims[pid] = min(
+                    victims[c] for c in (await session.execute(
+                        select(proposition_parent.c.child_id)
+                        .where(proposition_parent.c.parent_id == pid)
+                    )).scalars().all()
+                )
+
+        ids = list(victims)
+        obs_links: Dict[int, List[int]] = {pid: [] for pid in ids}
+        for oid, pid in (await session.execute(
+            select(observation_proposition.c.observation_id, observation_proposition.c.proposition_id)
+            .where(observation_proposition.c.proposition_id.in_(ids))
+        )).all():
+            obs_links[pid].append(oid)
+        parent_links: Dict[int, List[int]] = {pid: [] for pid in ids}
+        for child_id, parent_id in (await session.execute(
+            select(proposition_parent.c.child_id, proposition_parent.c.parent_id)
+            .where(proposition_parent.c.child_id.in_(ids))
+        )).all():
+            parent_links[child_id].append(parent_id)
+
+        props = (await session.execute(
+            select(Proposition).where(Proposition.id.in_(ids)).options(noload("*"))
+        )).scalars().all()
+        for p in props:
+            session.add(ColdProposition(
+                id=p.id,
+                text=p.text,
+                reasoning=p.reasoning,
+                confidence=p.confidence,
+                decay=p.decay,
+                created_at=p.created_at,
+                updated_at=p.updated_at,
+                revision_group=p.revision_group,
+                version=p.version,
+                observation_ids=json.dumps(sorted(obs_links[p.id])),
+                parent_ids=json.dumps(sorted(parent_links[p.id])),
+                support_count=len(obs_links[p.id]),
+                gc_score=victims[p.id],
+            ))
+
+        # foreign key cascades are not enforced on SQLite; drop links explicitly
+        await session.execute(
+            delete(observation_proposition).where(observation_proposition.c.proposition_id.in_(ids))
+        )
+        await session.execute(
+            delete(proposition_parent).where(
+                proposition_parent.c.child_id.in_(ids) | proposition_parent.c.parent_id.in_(ids)
+            )
+        )
+        for p in props:
+            session.expunge(p)
+        await session.execute(delete(Proposition).where(Proposition.id.in_(ids)))
+        return sorted(ids)
+
+    # ─────────────────────────────── restore
+    async def restore(self, proposition_ids: Iterable[int]) -> Dict[str, Any]:
+        """Move archived propositions back into the live table.
+
+        Links to observations and parents that still exist are recreated;
+        restoring a proposition together with its archived ancestors restores
+        the whole chain.
+
+        Returns:
+            Ids restored and ids that were not in the cold table
+        """
+        wanted = sorted(set(proposition_ids))
+
+        async def _restore(session: AsyncSession) -> List[int]:
+            cold = (await session.execute(
+                select(ColdProposition).where(ColdProposition.id.in_(wanted))
+                .order_by(ColdProposition.id)
+            )).scalars().all()
+            if not cold:
+                return []
+            await session.execute(insert(Proposition), [
+                {
+                    "id": c.id,
+                    "text": c.text,
+                    "reasoning": c.reasoning,
+                    "confidence": c.confidence,
+                    "decay": c.decay,
+                    "created_at": c.created_at,
+                    "updated_at": c.updated_at,
+                    "revision_group": c.revision_group,
+                    "version": c.version,
+                }
+                for c in cold
+            ])
+
+            live_props = set((await session.execute(
+                select(Proposition.id).where(
+                    Proposition.id.in_({pid for c in cold for pid in json.loads(c.parent_ids)})
+                )
+            )).scalars().all())
+            parent_links = [
+                {"child_id": c.id, "parent_id": pid}
+                for c in cold for pid in json.loads(c.parent_ids) if pid in live_props
+            ]
+            if parent_links:
+                await session.execute(insert(proposition_parent), parent_links)
+
+            obs_wanted = {oid for c in cold for oid in json.loads(c.observation_ids)}
+            live_obs = set((await session.execute(
+                select(Observation.id).where(Observation.id.in_(obs_wanted))
+            )).scalars().all()) if obs_wanted else set()
+            obs_links = [
+                {"observation_id": oid, "proposition_id": c.id}
+                for c in cold for oid in json.loads(c.observation_ids) if oid in live_obs
+            ]
+            if obs_links:
+                await session.execute(insert(observation_proposition), obs_links)
+
+            restored = [c.id for c in cold]
+            await session.execute(delete(ColdProposition).where(ColdProposition.id.in_(restored)))
+            return restored
+
+        restored = await self.writer.submit(_restore, label="proposition_gc_restore") if wanted else []
+        self._totals["restored"] += len(restored)
+        return {"restored": restored, "missing": sorted(set(wanted) - set(restored))}
+
+    # ─────────────────────────────── stats
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cold table size, cumulative totals and the last run report."""
+        async with self.Session() as session:
+            cold = (await session.execute(
+                select(func.count()).select_from(ColdProposition)
+            )).scalar_one()
+            pool = await self._candidate_pool(session)
+        return {
+            "cold_propositions": cold,
+            "candidate_pool": pool,
+            "cursor": self._cursor,
+            **self._totals,
+            "config": {
+                "threshold": self.config.threshold,
+                "min_age_days": self.config.min_age_days,
+                "decay_days": self.config.decay_days,
+                "batch_size": self.config.batch_size,
+            },
+            "last_run": self._last_report,
+            "running": self._task is not None and not self._task.done(),
+        }
@@ -0,0 +1,140 @@
+"""
+Background WAL Checkpointer
+
+With ``wal_autocheckpoint`` left on, the commit that pushes the WAL past the
+threshold runs the checkpoint inline and pays for it in latency. The
+``balanced`` and ``throughput`` storage profiles turn auto-checkpointing off
+and rely on this task instead. It runs a ``PASSIVE`` checkpoint on an
+interval, which never waits on readers or writers. When the WAL file has
+grown past the profile's limit it runs a ``TRUNCATE`` checkpoint to reclaim
+the space.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config.storage_config import StorageProfile
+
+logger = logging.getLogger(__name__)
+
+
+class WALCheckpointer:
+    """Periodic ``wal_checkpoint`` driven by a :class:`StorageProfile`."""
+
+    def __init__(self, engine: AsyncEngine, db_path: str, profile: StorageProfile):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            engine: Async engine of the GUM database
+            db_path: Path of the database file (its ``-wal`` file is monitored)
+            profile: Storage profile supplying interval and truncate threshold
+        """
+        self.engine = engine
+        self.wal_path = f"{os.path.abspath(os.path.expanduser(db_path))}-wal"
+        self.profile = profile
+
+        self._task: Optional[asyncio.Task] = None
+        self._shutdown_event = asyncio.Event()
+        self._stats: Dict[str, Any] = {
+            "passive_checkpoints": 0,
+            "truncate_checkpoints": 0,
+            "pages_checkpointed": 0,
+            "busy": 0,
+            "last_duration_ms": None,
+            "last_run_at": None,
+        }
+
+    # ─────────────────────────────── lifecycle
+    async def start(self):
+        """Start the checkpoint worker (no-op for profiles without an interval)."""
+        if self.profile.checkpoint_interval_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._shutdown_event.clear()
+            self._task = asyncio.create_task(self._worker())
+            logger.info(
+                f"WAL checkpointer started ({self.profile.name} profile, "
+                f"every {self.profile.checkpoint_interval_seconds:.0f}s)"
+            )
+
+    async def stop(self):
+        """Stop the worker and leave the WAL truncated."""
+        if self._task and not self._task.done():
+            self._shutdown_event.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            try:
+                await self.checkpoint("TRUNCATE")
+            except Exception as e:
+                logger.warning(f"Final WAL checkpoint failed: {e}")
+            logger.info("WAL checkpointer stopped")
+
+    async def _worker(self):
+        while not self._shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=self.profile.checkpoint_interval_seconds,
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+            try:
+                truncate = (
+                    self.profile.checkpoint_truncate_bytes > 0
+                    and self.wal_size() > self.profile.checkpoint_truncate_bytes
+                )
+                await self.checkpoint("TRUNCATE" if truncate else "PASSIVE")
+            except Exception as e:
+                logger.error(f"WAL checkpoint failed: {e}")
+
+    # ─────────────────────────────── checkpointing
+    def wal_size(self) -> int:
+        """Current size of the ``-wal`` file in bytes."""
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> Dict[str, int]:
+        """Run one ``wal_checkpoint(mode)``.
+
+        Returns:
+            ``busy``, ``wal_pages`` and ``checkpointed_pages`` as reported by SQLite
+        """
+        start = time.perf_counter()
+        async with self.engine.connect() as conn:
+            busy, wal_pages, done = (
+                await conn.execute(text(f"PRAGMA wal_checkpoint({mode})"))
+            ).fetchone()
+        key = "truncate_checkpoints" if mode == "TRUNCATE" else "passive_checkpoints"
+        self._stats[key] += 1
+        self._stats["pages_checkpointed"] += max(done, 0)
+        self._stats["busy"] += busy
+        self._stats["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        return {"busy": busy, "wal_pages": wal_pages, "checkpointed_pages": done}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkpoint counters and the current WAL size."""
+        return {
+            "profile": self.profile.name,
+            "interval_seconds": self.profile.checkpoint_interval_seconds,
+            "wal_bytes": self.wal_size(),
+            "running": self._task is not None and not self._task.done(),
+            **self._stats,
+        }
@@ -0,0 +1,112 @@
+"""
+Storage Backend Interface
+
+Everything GUM does that is specific to one database engine — engine and
+pool creation, schema and full-text index setup, ranked text search, upserts
+and write-transaction start — goes through a :class:`StorageBackend`. The
+rest of the code base builds portable SQLAlchemy statements and asks the
+backend for the pieces that differ.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from sqlalchemy import Insert, Select, Table
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ..config.storage_config import StorageProfile
+
+SEARCH_MODES = ("OR", "AND", "PHRASE")
+
+
+def query_terms(raw: str) -> List[str]:
+    """Lower-cased word tokens of a free-text query (punctuation dropped)."""
+    return re.findall(r"\w+", raw.lower())
+
+
+class StorageBackend(ABC):
+    """Database-specific operations used by GUM.
+
+    Search score selects return ``(pid, score)`` rows where a *lower* score is
+    a better match, matching SQLite's ``bm25()`` convention, so ranking code
+    can stay backend-agnostic.
+    """
+
+    #: SQLAlchemy dialect name this backend serves
+    name: str = ""
+    #: Single-file embedded database. File-level services (WAL checkpoints,
+    #: FTS5 maintenance, cold archives, rollups) only run on these.
+    embedded: bool = False
+    #: Column definition for an auto-incrementing integer key in raw DDL
+    autoincrement_pk: str = "INTEGER PRIMARY KEY"
+
+    # ─────────────────────────────── engines & schema
+    @abstractmethod
+    def create_engine(
+        self,
+        url: str,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> AsyncEngine:
+        """Create the primary (read-write) engine for *url*.
+
+        *schema* namespaces GUM's tables inside a shared database on backends
+        that support it; file-based backends ignore it.
+        """
+
+    def create_read_engine(
+        self,
+        url: str,
+        pool_size: int,
+        storage_profile: Optional[StorageProfile] = None,
+    ) -> Optional[AsyncEngine]:
+        """Create a separate read-only pool, or None to read through the primary engine."""
+        return None
+
+    @abstractmethod
+    async def init_schema(
+        self,
+        engine: AsyncEngine,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> None:
+        """Create ORM tables, missing indexes and the full-text index (idempotent)."""
+
+    # ─────────────────────────────── search
+    @abstractmethod
+    def build_search_query(self, raw: str, mode: str = "OR") -> str:
+        """Translate free text into this backend's full-text query syntax.
+
+        Returns an empty string when *raw* has no searchable terms.
+        """
+
+    @abstractmethod
+    def proposition_scores(self) -> Select:
+        """Select ``(pid, score)`` for propositions matching the ``:q`` bind parameter."""
+
+    @abstractmethod
+    def observation_scores(self) -> Select:
+        """Select ``(pid, score)`` for propositions linked to observations matching ``:q``."""
+
+    # ─────────────────────────────── writes
+    @abstractmethod
+    def insert_ignore(self, table: Table) -> Insert:
+        """INSERT into *table* that silently skips rows violating a unique key."""
+
+    async def begin_write(self, session: AsyncSession) -> None:
+        """Start the write transaction of a group commit on *session*.
+
+        The default relies on SQLAlchemy's autobegin.
+        """
+
+    async def clear_search_index(self, session: AsyncSession) -> None:
+        """Empty the full-text index after its source tables were emptied.
+
+        No-op for backends whose index lives on the table rows themselves.
+        """
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}>"
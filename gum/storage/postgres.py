@@ -0,0 +1,162 @@
+"""
+PostgreSQL Storage Backend
+
+For deployments that outgrow a single SQLite file (several GUM processes,
+a shared server, larger histories). Full-text search uses a generated,
+stored ``tsvector`` column per searchable table with a GIN index, ranked
+with ``ts_rank_cd``:
+
+- ``propositions.search_vector``: ``text`` weighted A, ``reasoning`` B
+- ``observations.search_vector``: ``content``
+
+The columns are maintained by PostgreSQL itself, so no triggers or shadow
+tables are needed and emptying a table empties its index. Requires
+PostgreSQL 12+ and the ``asyncpg`` driver.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from sqlalchemy import Float, Insert, Select, Table, bindparam, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..config.storage_config import StorageProfile
+from ..models import (
+    Base,
+    Observation,
+    Proposition,
+    create_missing_columns,
+    create_missing_indexes,
+    observation_proposition,
+)
+from .base import StorageBackend, query_terms
+
+# Arbitrary key for the advisory lock that serializes schema setup between
+# processes starting at the same time
+_SCHEMA_LOCK_KEY = 0x67756D
+
+_TSQUERY_OPERATORS = {"OR": " | ", "AND": " & ", "PHRASE": " <-> "}
+
+
+def _check_identifier(value: str, what: str) -> None:
+    """Reject anything but a plain identifier before it is spliced into SQL."""
+    if not re.fullmatch(r"[A-Za-z_]\w*", value):
+        raise ValueError(f"Invalid {what}: {value!r}")
+
+
+class PostgresBackend(StorageBackend):
+    """PostgreSQL + ``tsvector``/GIN via ``asyncpg``."""
+
+    name = "postgresql"
+    embedded = False
+    autoincrement_pk = "SERIAL PRIMARY KEY"
+
+    def __init__(self, text_search_config: str = "english", pool_size: int = 10):
+        """
+        Initialize the backend.
+
+        Args:
+            text_search_config: PostgreSQL text search configuration used for
+                stemming and stop words (e.g. ``english``, ``simple``)
+            pool_size: Connections kept open in the engine's pool
+        """
+        _check_identifier(text_search_config, "text search configuration")
+        self.text_search_config = text_search_config
+        self.pool_size = pool_size
+
+    # ─────────────────────────────── engines & schema
+    def create_engine(
+        self,
+        url: str,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> AsyncEngine:
+        # SQLite tuning profiles have no PostgreSQL equivalent and are ignored
+        parsed = make_url(url)
+        if parsed.drivername == "postgresql":
+            parsed = parsed.set(drivername="postgresql+asyncpg")
+        connect_args = {}
+        if schema:
+            _check_identifier(schema, "schema name")
+            # unqualified table names resolve to the schema, extensions stay reachable
+            connect_args["server_settings"] = {"search_path": f"{schema},public"}
+        return create_async_engine(
+            parsed,
+            future=True,
+            pool_size=self.pool_size,
+            max_overflow=self.pool_size,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+        )
+
+    async def init_schema(
+        self,
+        engine: AsyncEngine,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> None:
+        cfg = self.text_search_config
+        search_columns = {
+            "propositions": (
+                f"setweight(to_tsvector('{cfg}', coalesce(text, '')), 'A') || "
+                f"setweight(to_tsvector('{cfg}', coalesce(reasoning, '')), 'B')"
+            ),
+            "observations": f"to_tsvector('{cfg}', coalesce(content, ''))",
+        }
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SELECT pg_advisory_xact_lock({_SCHEMA_LOCK_KEY})"))
+            if schema:
+                _check_identifier(schema, "schema name")
+                await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_columns)
+            await conn.run_sync(create_missing_indexes)
+            for table, expression in search_columns.items():
+                await conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                    f"GENERATED ALWAYS AS ({expression}) STORED"
+                ))
+                await conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                    f"ON {table} USING GIN (search_vector)"
+                ))
+
+    # ─────────────────────────────── search
+    def build_search_query(self, raw: str, mode: str = "OR") -> str:
+        tokens = query_terms(raw)
+        if not tokens:
+            return ""
+        return _TSQUERY_OPERATORS.get(mode, _TSQUERY_OPERATORS["AND"]).join(tokens)
+
+    def _match(self, table: str):
+        """``(score, condition)`` ranking *table*'s search vector against ``:q``."""
+        vector = literal_column(f"{table}.search_vector")
+        query = func.to_tsquery(
+            literal_column(f"'{self.text_search_config}'::regconfig"), bindparam("q")
+        )
+        return -func.ts_rank_cd(vector, query, type_=Float), vector.op("@@")(query)
+
+    def proposition_scores(self) -> Select:
+        score, matches = self._match("propositions")
+        return select(Proposition.id.label("pid"), score.label("score")).where(matches)
+
+    def observation_scores(self) -> Select:
+        score, matches = self._match("observations")
+        return (
+            select(observation_proposition.c.proposition_id.label("pid"), score.label("score"))
+            .select_from(
+                Observation.__table__.join(
+                    observation_proposition,
+                    observation_proposition.c.observation_id == Observation.id,
+                )
+            )
+            .where(matches)
+        )
+
+    # ─────────────────────────────── writes
+    def insert_ignore(self, table: Table) -> Insert:
+        return pg_insert(table).on_conflict_do_nothing()
@@ -0,0 +1,160 @@
+"""
+SQLite Storage Backend
+
+The default backend: one WAL-mode database file, FTS5 external-content
+indexes kept in sync by triggers, ``bm25()`` ranking, and an optional pool of
+read-only connections next to the single writer.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Insert, MetaData, Select, Table, literal_column, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from ..config.storage_config import StorageProfile
+from ..models import (
+    Base,
+    Observation,
+    Proposition,
+    apply_storage_profile,
+    create_fts_table,
+    create_missing_columns,
+    create_missing_indexes,
+    create_observations_fts,
+    create_read_engine,
+    enable_proposition_autoincrement,
+    load_content_dictionaries,
+    observation_proposition,
+    register_content_functions,
+)
+from .base import StorageBackend, query_terms
+
+
+def build_fts_query(raw: str, mode: str = "OR") -> str:
+    """Build an FTS5 ``MATCH`` expression from free text."""
+    tokens = query_terms(raw)
+    if not tokens:
+        return ""
+    if mode == "PHRASE":
+        return f'"{" ".join(tokens)}"'
+    elif mode == "OR":
+        return " OR ".join(tokens)
+    else:  # implicit AND
+        return " ".join(tokens)
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite + FTS5 via ``aiosqlite``."""
+
+    name = "sqlite"
+    embedded = True
+    autoincrement_pk = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def create_engine(
+        self,
+        url: str,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> AsyncEngine:
+        engine: AsyncEngine = create_async_engine(
+            url,
+            future=True,
+            connect_args={
+                "timeout": 30,
+                "isolation_level": None,
+            },
+            poolclass=None,
+        )
+        register_content_functions(engine)
+        if storage_profile is not None:
+            apply_storage_profile(engine, storage_profile)
+        return engine
+
+    def create_read_engine(
+        self,
+        url: str,
+        pool_size: int,
+        storage_profile: Optional[StorageProfile] = None,
+    ) -> Optional[AsyncEngine]:
+        database = make_url(url).database
+        if pool_size <= 0 or not database or database == ":memory:":
+            return None
+        return create_read_engine(database, pool_size, storage_profile)
+
+    async def init_schema(
+        self,
+        engine: AsyncEngine,
+        storage_profile: Optional[StorageProfile] = None,
+        schema: Optional[str] = None,
+    ) -> None:
+        async with engine.begin() as conn:
+            # page_size must be set before the first table exists
+            if storage_profile is not None and (
+                await conn.execute(text("PRAGMA page_count"))
+            ).scalar() == 0:
+                await conn.execute(text(f"PRAGMA page_size={storage_profile.page_size}"))
+            await conn.execute(text("PRAGMA journal_mode=WAL"))
+            await conn.execute(text("PRAGMA busy_timeout=30000"))
+
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_columns)
+            await conn.run_sync(enable_proposition_autoincrement)
+            await conn.run_sync(create_missing_indexes)
+            await conn.run_sync(create_fts_table)
+            await conn.run_sync(create_observations_fts)
+            await conn.run_sync(load_content_dictionaries)
+
+    def build_search_query(self, raw: str, mode: str = "OR") -> str:
+        return build_fts_query(raw, mode)
+
+    def proposition_scores(self) -> Select:
+        fts_prop = Table("propositions_fts", MetaData())
+        return (
+            select(
+                Proposition.id.label("pid"),
+                literal_column("bm25(propositions_fts)").label("score"),
+            )
+            .select_from(
+                fts_prop.join(
+                    Proposition,
+                    literal_column("propositions_fts.rowid") == Proposition.id,
+                )
+            )
+            .where(text("propositions_fts MATCH :q"))
+        )
+
+    def observation_scores(self) -> Select:
+        fts_obs = Table("observations_fts", MetaData())
+        return (
+            select(
+                observation_proposition.c.proposition_id.label("pid"),
+                literal_column("bm25(observations_fts)").label("score"),
+            )
+            .select_from(
+                fts_obs
+                .join(
+                    Observation,
+                    literal_column("observations_fts.rowid") == Observation.id,
+                )
+                .join(
+                    observation_proposition,
+                    observation_proposition.c.observation_id == Observation.id,
+                )
+            )
+            .where(text("observations_fts MATCH :q"))
+        )
+
+    def insert_ignore(self, table: Table) -> Insert:
+        return sqlite_insert(table).on_conflict_do_nothing()
+
+    async def begin_write(self, session: AsyncSession) -> None:
+        # take the write lock up front instead of upgrading mid-group
+        await session.execute(text("BEGIN IMMEDIATE"))
+
+    async def clear_search_index(self, session: AsyncSession) -> None:
+        await session.execute(text("DELETE FROM propositions_fts"))
+        await session.execute(text("DELETE FROM observations_fts"))
@@ -9,7 +9,6 @@ setup(
         "pillow",  # For image processing
         "mss",  # For screen capture
         "pynput",  # For mouse/keyboard monitoring
-        "shapely",  # For geometry operations
         "pyobjc-framework-Quartz; sys_platform == 'darwin'",  # For macOS window management
         "openai>=1.0.0",
         "SQLAlchemy>=2.0.0",
@@ -29,6 +28,12 @@ setup(
         # Additional dependencies for data processing
         "numpy",
     ],
+    extras_require={
+        # PostgreSQL storage backend (GUM_DATABASE_URL=postgresql+asyncpg://...)
+        "postgres": ["asyncpg"],
+        # zstd (and zstd dictionary) compression of observation content
+        "compression": ["zstandard"],
+    },
     entry_points={
         'console_scripts': [
             'gum=gum.cli:cli',